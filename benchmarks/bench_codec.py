@@ -0,0 +1,79 @@
+"""
+Compare the json backends on realistic payloads: a 1000 parcels bulk create
+body and a 1000 items parcels page.
+
+    python benchmarks/bench_codec.py --rounds 20
+"""
+import argparse
+import json
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from yalidine.codec import available_codecs, get_codec  # noqa: E402
+from yalidine.entity import Parcel  # noqa: E402
+
+
+def make_parcels(n):
+    return [
+        Parcel(
+            order_id=f"order-{i}",
+            from_wilaya_name="Bouira",
+            firstname="Mohamed",
+            familyname="Benali",
+            contact_phone="0555885588",
+            address="Cité 100 logements, bloc A",
+            to_commune_name="Aïn Bessem",
+            to_wilaya_name="Bouira",
+            product_list="Cafetière, 2 tasses",
+            price=3000 + i,
+            do_insurance=True,
+            declared_value=3500,
+            length=30,
+            width=10,
+            height=10,
+            weight=2,
+            freeshipping=False,
+            is_stopdesk=False,
+            has_exchange=False,
+        )
+        for i in range(n)
+    ]
+
+
+def make_page(n):
+    data = [
+        dict(asdict(p), tracking=f"yal-{i:06d}", last_status="Centre", date_creation="2024-01-01 10:00:00")
+        for i, p in enumerate(make_parcels(n))
+    ]
+    return json.dumps({"has_more": True, "total_data": 200000, "data": data}).encode()
+
+
+def timeit(fn, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def run(rounds):
+    parcels = make_parcels(1000)
+    page = make_page(1000)
+
+    baseline = timeit(lambda: json.dumps([asdict(p) for p in parcels]).encode(), rounds)
+    print(f"{'asdict + json (previous)':<26} encode {baseline:7.2f} ms")
+
+    for name in available_codecs():
+        codec = get_codec(name)
+        encode = timeit(lambda: codec.dumps(parcels), rounds)
+        decode = timeit(lambda: codec.loads(page), rounds)
+        print(f"{name:<26} encode {encode:7.2f} ms   decode {decode:7.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=20)
+    run(parser.parse_args().rounds)
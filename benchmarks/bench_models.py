@@ -0,0 +1,69 @@
+"""
+Compare the memory held by parcel rows kept as decoded dicts and as
+`ParcelRecord` objects.
+
+    python benchmarks/bench_models.py --rows 100000
+"""
+import argparse
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from yalidine.models import ParcelRecord  # noqa: E402
+
+
+STATUSES = ["Centre", "Expédié", "Sorti en livraison", "Livré", "Retourné au vendeur"]
+
+
+def make_page(start, size):
+    data = [
+        {
+            "tracking": f"yal-{i:06d}",
+            "order_id": f"order-{i}",
+            "firstname": "Mohamed",
+            "familyname": "Benali",
+            "contact_phone": "0555885588",
+            "address": "Cité 100 logements, bloc A",
+            "is_stopdesk": 0,
+            "from_wilaya_name": "Bouira",
+            "to_commune_name": "Aïn Bessem",
+            "to_wilaya_name": "Bouira",
+            "product_list": "Cafetière",
+            "price": 3000,
+            "date_creation": "2024-01-01 10:00:00",
+            "last_status": STATUSES[i % len(STATUSES)],
+            "payment_status": "not-ready",
+        }
+        for i in range(start, start + size)
+    ]
+    # rows decoded from json, as the client returns them
+    return json.dumps({"data": data}).encode()
+
+
+def measure(rows, convert):
+    tracemalloc.start()
+    kept = []
+    for start in range(0, rows, 1000):
+        page = json.loads(make_page(start, 1000))
+        kept.extend(convert(row) for row in page["data"])
+        del page
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, kept
+
+
+def run(rows):
+    dicts, _ = measure(rows, lambda row: row)
+    records, _ = measure(rows, ParcelRecord.from_dict)
+    print(f"dict          : {dicts / 2**20:8.1f} MiB ({dicts / rows:6.0f} B/row)")
+    print(f"ParcelRecord  : {records / 2**20:8.1f} MiB ({records / rows:6.0f} B/row)")
+    print(f"saving        : {1 - records / dicts:8.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    run(parser.parse_args().rows)
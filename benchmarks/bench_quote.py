@@ -0,0 +1,49 @@
+"""
+Measure the local delivery fee quotes per second.
+
+    python benchmarks/bench_quote.py --carts 100000
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from yalidine.entity import Parcel  # noqa: E402
+from yalidine.quote import FeeQuoter  # noqa: E402
+
+
+def run(carts):
+    fees = [
+        {"wilaya_id": i, "wilaya_name": f"Wilaya {i}", "home_fee": 400 + 10 * i, "desk_fee": 300 + 5 * i}
+        for i in range(1, 59)
+    ]
+    quoter = FeeQuoter(fees)
+
+    rng = random.Random(0)
+    parcels = [
+        Parcel(
+            to_wilaya_name=f"Wilaya {rng.randint(1, 58)}",
+            is_stopdesk=rng.random() < 0.3,
+            weight=rng.randint(0, 10),
+            length=rng.randint(10, 60),
+            width=rng.randint(10, 40),
+            height=rng.randint(5, 30),
+            do_insurance=rng.random() < 0.5,
+            declared_value=rng.randint(0, 150000),
+        )
+        for _ in range(carts)
+    ]
+
+    start = time.perf_counter()
+    quoter.quote_many(parcels)
+    elapsed = time.perf_counter() - start
+    print(f"{carts} quotes in {elapsed:.3f}s : {carts / elapsed:,.0f} quotes/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--carts", type=int, default=100000)
+    run(parser.parse_args().carts)
@@ -0,0 +1,67 @@
+"""
+Compare the pooled session transport of `YalidineClient` with the previous
+behaviour (one `requests.get` per call, so one new connection per call).
+
+    python benchmarks/bench_transport.py --calls 500
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from yalidine import YalidineClient  # noqa: E402
+
+
+BODY = json.dumps({"has_more": False, "total_data": 0, "data": [], "links": {}}).encode()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def run(calls):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/v1/"
+
+    try:
+        start = time.perf_counter()
+        for _ in range(calls):
+            requests.get(url + "wilayas/1", headers={"X-API-ID": "id"}).json()
+        per_call = time.perf_counter() - start
+
+        with YalidineClient("id", "token", url=url) as client:
+            start = time.perf_counter()
+            for _ in range(calls):
+                client.get_wilaya("1")
+            pooled = time.perf_counter() - start
+    finally:
+        server.shutdown()
+
+    print(f"per-call requests.get : {calls / per_call:8.1f} req/s")
+    print(f"pooled session        : {calls / pooled:8.1f} req/s")
+    print(f"speedup               : {per_call / pooled:8.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=500)
+    run(parser.parse_args().calls)
@@ -0,0 +1,256 @@
+"""
+Benchmark suite of the client, against the local api simulator.
+
+Measures the per-call overhead of `YalidineClient`, the throughput of full
+listing scans, bulk creation at several chunk sizes and concurrency levels,
+and the memory held per 100k records. the results are written as json,
+compare two runs to catch regressions between releases:
+
+    python benchmarks/run.py --output benchmarks/results/0.0.2.json
+    python benchmarks/run.py --quick --compare benchmarks/results/0.0.2.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from yalidine import YalidineClient  # noqa: E402
+from yalidine.entity import Parcel, ParcelFilter  # noqa: E402
+from yalidine.models import ParcelRecord  # noqa: E402
+from yalidine.simulator import Simulator  # noqa: E402
+
+
+# metric suffix -> whether a larger value is better
+DIRECTIONS = {"_per_s": True, "_us": False, "_bytes": False}
+# reported but not compared: the session alone, and the difference of two noisy medians (can be negative)
+INFORMATIONAL = {"raw_p50_us", "overhead_p50_us"}
+
+
+def _timed(fns, repeat):
+    """Per call durations of each of `fns` in microseconds, the calls are interleaved so they share the same noise."""
+    durations = [[] for _ in fns]
+    for _ in range(repeat):
+        for fn, samples in zip(fns, durations):
+            start = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - start) * 1e6)
+    return durations
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+# ===============================
+# MARK: Benchmarks
+# ===============================
+def bench_call_overhead(calls):
+    """Time spent in the client on top of the http round trip of the same session."""
+    with Simulator(quotas=None) as simulator, YalidineClient("id", "token", url=simulator.url) as client:
+        url = simulator.url + "wilayas/10"
+        for _ in range(50):
+            client.get_wilaya(10)
+
+        raw, full = _timed((lambda: client.session.get(url).content, lambda: client.get_wilaya(10)), calls)
+
+    return {
+        "calls": calls,
+        "raw_p50_us": statistics.median(raw),
+        "client_p50_us": statistics.median(full),
+        "client_p95_us": _percentile(full, 0.95),
+        "overhead_p50_us": statistics.median(full) - statistics.median(raw),
+        "calls_per_s": calls / (sum(full) / 1e6),
+    }
+
+
+def bench_pagination(parcels, latency, page_size=100):
+    """
+    Pages and records per second of a full parcels listing.
+
+    The simulator builds the pages in the same process, large pages make it
+    the bottleneck and every scan runs at its speed. small pages and a
+    latency of a few tens of milliseconds keep the round trips dominant, as
+    against the real api, so the fan-out of the scans shows.
+    """
+    result = {"parcels": parcels, "latency_s": latency, "page_size": page_size}
+    filter = ParcelFilter(page_size=page_size)
+    with Simulator(parcels=parcels, quotas=None, latency=latency) as simulator:
+        with YalidineClient("id", "token", url=simulator.url) as client:
+            scans = {
+                "iter": lambda: client.iter_parcels(filter, prefetch=False),
+                "iter_prefetch": lambda: client.iter_parcels(filter, prefetch=True),
+                "scan_4": lambda: client.scan_parcels(filter, max_workers=4),
+                "scan_8": lambda: client.scan_parcels(filter, max_workers=8),
+            }
+            for name, scan in scans.items():
+                requests = simulator.requests
+                start = time.perf_counter()
+                count = sum(1 for _ in scan())
+                elapsed = time.perf_counter() - start
+                assert count == parcels, (name, count)
+                result[f"{name}_pages_per_s"] = (simulator.requests - requests) / elapsed
+                result[f"{name}_records_per_s"] = count / elapsed
+    return result
+
+
+def bench_bulk_create(parcels, latency, chunk_sizes, workers):
+    """Parcels created per second by `create_parcels_bulk`."""
+    commune = ("Bouira", "Bouira 2")
+    items = [
+        Parcel(
+            order_id=str(i),
+            from_wilaya_name="Alger",
+            firstname="firstname",
+            familyname="familyname",
+            contact_phone="0555885588",
+            address="address",
+            to_wilaya_name=commune[0],
+            to_commune_name=commune[1],
+            product_list="product",
+            price=3000,
+        )
+        for i in range(parcels)
+    ]
+
+    result = {"parcels": parcels, "latency_s": latency}
+    with Simulator(quotas=None, latency=latency) as simulator:
+        with YalidineClient("id", "token", url=simulator.url, pool_maxsize=max(workers)) as client:
+            for chunk_size in chunk_sizes:
+                for max_workers in workers:
+                    start = time.perf_counter()
+                    results = client.create_parcels_bulk(items, chunk_size=chunk_size, max_workers=max_workers)
+                    elapsed = time.perf_counter() - start
+                    assert all(r.success for r in results.values())
+                    result[f"chunk_{chunk_size}_workers_{max_workers}_parcels_per_s"] = parcels / elapsed
+    return result
+
+
+def bench_memory(rows):
+    """Memory held by `rows` decoded parcel rows, as dicts and as `ParcelRecord`."""
+    simulator = Simulator(parcels=rows, quotas=None)
+    # round trip through json so the rows are fresh objects, as decoded by the client
+    payload = json.dumps({"data": list(simulator.parcels.values())}).encode()
+    del simulator
+
+    def held(build):
+        tracemalloc.start()
+        data = build()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del data
+        return size
+
+    as_dicts = held(lambda: json.loads(payload)["data"])
+    as_records = held(lambda: [ParcelRecord.from_dict(row) for row in json.loads(payload)["data"]])
+    scale = 100000 / rows
+    return {
+        "rows": rows,
+        "dicts_per_100k_bytes": int(as_dicts * scale),
+        "records_per_100k_bytes": int(as_records * scale),
+    }
+
+
+# ===============================
+# MARK: Results
+# ===============================
+def metadata():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True
+        ).stdout.strip()
+    except OSError:
+        commit = None
+    version = None
+    for line in (ROOT / "pyproject.toml").read_text().splitlines():
+        if line.startswith("version"):
+            version = line.split("=")[1].strip().strip('"')
+            break
+    return {
+        "version": version,
+        "commit": commit or None,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+
+def _direction(metric):
+    if metric in INFORMATIONAL:
+        return None
+    for suffix, higher in DIRECTIONS.items():
+        if metric.endswith(suffix):
+            return higher
+    return None
+
+
+def compare(previous, current, threshold):
+    """Print the change of every metric, return the regressions larger than `threshold`."""
+    regressions = []
+    for name, metrics in current["benchmarks"].items():
+        before = previous["benchmarks"].get(name, {})
+        for metric, value in metrics.items():
+            higher = _direction(metric)
+            old = before.get(metric)
+            if higher is None or old is None or old <= 0:
+                continue
+            change = (value - old) / old
+            worse = -change if higher else change
+            flag = "  REGRESSION" if worse > threshold else ""
+            print(f"{name}.{metric:45} {old:14.1f} -> {value:14.1f} {change:+7.1%}{flag}")
+            if flag:
+                regressions.append(f"{name}.{metric}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default=None, help="the json file of the results")
+    parser.add_argument("--compare", default=None, help="a previous results file")
+    parser.add_argument("--threshold", type=float, default=0.1, help="the tolerated slowdown, 0.1 is 10%%")
+    parser.add_argument("--quick", action="store_true", help="smaller sizes, for a smoke run")
+    parser.add_argument("--latency", type=float, default=0.002, help="the simulated server latency in seconds")
+    parser.add_argument("--scan-latency", type=float, default=0.02, help="the simulated server latency of the pagination benchmark")
+    parser.add_argument("--only", nargs="*", help="the benchmarks to run")
+    args = parser.parse_args()
+
+    scale = 0.1 if args.quick else 1
+    suite = {
+        "call_overhead": lambda: bench_call_overhead(int(2000 * scale)),
+        "pagination": lambda: bench_pagination(int(10000 * scale), args.scan_latency),
+        "bulk_create": lambda: bench_bulk_create(int(2000 * scale), args.latency, (10, 50, 100), (1, 4, 8)),
+        "memory": lambda: bench_memory(int(100000 * scale)),
+    }
+
+    results = {"meta": metadata(), "benchmarks": {}}
+    for name, bench in suite.items():
+        if args.only and name not in args.only:
+            continue
+        print(f"running {name}...", file=sys.stderr)
+        results["benchmarks"][name] = bench()
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(output)
+    else:
+        print(output)
+
+    if args.compare:
+        previous = json.loads(Path(args.compare).read_text())
+        regressions = compare(previous, results, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {args.threshold:.0%}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,2 @@
-from .api import YalidineClient
\ No newline at end of file
+from .api import YalidineClient
+from .aio import AsyncYalidineClient
@@ -0,0 +1,393 @@
+# core
+import asyncio
+from functools import wraps
+
+# lib
+import requests
+from requests.compat import urljoin
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+# files
+from .settings import (
+    YALIDINE_URL,
+    YALIDINE_TIMEOUT,
+    YALIDINE_POOL_MAXSIZE,
+)
+from .codec import get_codec
+from .ratelimit import QuotaScheduler, QuotaState
+from .result import ApiResult, record_result, last_result, reset_result
+from .retry import RetryPolicy, CircuitBreaker
+from .instrumentation import start_request, finish_request
+from .coalesce import AsyncRequestCoalescer
+from .pagination import aiter_records, ascan_records
+from .api import asdict_true_value, filter_to_query_string
+from .entity import (
+    Parcel,
+    ParcelFilter,
+    HistoryFilter,
+    CenterFilter,
+    CommunesFilter,
+    WilayasFilter,
+    DeliveryFeesFilter,
+)
+
+
+def async_response_or_exception(fn):
+    """
+    Async counterpart of `response_or_exception`, errors are raised as
+    `requests.exceptions.HTTPError` so both clients are handled the same way.
+    """
+
+    @wraps(fn)
+    async def wrapper(self, *args, **kwargs):
+        response = await fn(self, *args, **kwargs)
+        if response.status_code == 422:
+            raise requests.exceptions.HTTPError(response, response=response)
+        if response.is_error:
+            raise requests.exceptions.HTTPError(
+                f"{response.status_code} Error: {response.reason_phrase} for url: {response.url}",
+                response=response,
+            )
+        data = self.codec.loads(response.content)
+        record_result(self, data, response)
+        return data
+
+    return wrapper
+
+
+def _httpx_timeout(timeout):
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+# ===============================
+# MARK: AsyncYalidineClient
+# ===============================
+class AsyncYalidineClient:
+    """
+    Asyncio Yalidine api client, requires `httpx` (`pip install yalidine[async]`).
+
+    It exposes the same endpoints as `YalidineClient` as coroutines.
+
+    ...
+
+    Attributes
+    ----------
+        url : str
+            The base url of the api.
+        timeout : float | tuple
+            The (connect, read) timeout applied to every request.
+        max_connections : int
+            The maximum number of open connections.
+        max_keepalive_connections : int
+            The maximum number of idle connections kept alive.
+        max_concurrency : int
+            The maximum number of requests in flight at once, extra calls
+            wait for a free slot.
+        http2 : bool
+            Negotiate HTTP/2 (requires `httpx[http2]`).
+        client : httpx.AsyncClient
+            Use an existing client instead of creating one. the client does
+            not close an `httpx.AsyncClient` it did not create nor set its
+            headers, the credentials are sent with each request.
+        rate_limiter : QuotaScheduler
+            Pace the requests under the api quotas, it can be shared with
+            threaded clients using the same api key.
+        retry : RetryPolicy
+            Retry the transient failures (connection errors, 429, 5xx).
+        circuit_breaker : CircuitBreaker
+            Fail fast with `CircuitOpenError` while the api is down.
+        codec : str | codec
+            The json backend (`"orjson"`, `"msgspec"`, `"json"` or a codec
+            object), defaults to the fastest one installed.
+        instruments : list
+            `Instrument` objects notified before and after every request.
+        coalescer : AsyncRequestCoalescer
+            Share one request between the identical GETs made at the same time.
+    """
+
+    def __init__(
+        self,
+        api_id,
+        api_token,
+        url=YALIDINE_URL,
+        timeout=YALIDINE_TIMEOUT,
+        max_connections: int = 100,
+        max_keepalive_connections: int = YALIDINE_POOL_MAXSIZE,
+        max_concurrency: int = 100,
+        http2: bool = False,
+        client: "httpx.AsyncClient" = None,
+        rate_limiter: QuotaScheduler = None,
+        retry: RetryPolicy = None,
+        circuit_breaker: CircuitBreaker = None,
+        codec=None,
+        instruments: list = None,
+        coalescer: AsyncRequestCoalescer = None,
+    ):
+        if httpx is None:
+            raise ImportError(
+                "AsyncYalidineClient requires httpx, install it with `pip install yalidine[async]`"
+            )
+
+        self.url = url
+        self.api_id = api_id
+        self.api_token = api_token
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.retry = retry
+        self.circuit_breaker = circuit_breaker
+        self.codec = codec if hasattr(codec, "loads") else get_codec(codec)
+        self.instruments = list(instruments or ())
+        self.coalescer = coalescer
+        self.quota = QuotaState()
+        self.headers = {
+            "X-API-ID": self.api_id,
+            "X-API-TOKEN": self.api_token,
+            "Content-Type": "application/json",
+        }
+
+        self._owns_client = client is None
+        if client is None:
+            client = httpx.AsyncClient(
+                timeout=_httpx_timeout(timeout),
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive_connections,
+                ),
+                http2=http2,
+            )
+            client.headers.update(self.headers)
+        self.http = client
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    # ===============================
+    # MARK: Lifecycle
+    # ===============================
+    async def aclose(self):
+        """Release the pooled connections."""
+        if self._owns_client:
+            await self.http.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    # ===============================
+    # MARK: Results
+    # ===============================
+    @property
+    def last_result(self) -> ApiResult:
+        """The `ApiResult` of the last call made by the current task, None before."""
+        return last_result(self)
+
+    @property
+    def last_response_headers(self):
+        """The headers of the last response received by the current task."""
+        result = last_result(self)
+        return None if result is None else result.headers
+
+    async def call(self, method, *args, **kwargs) -> ApiResult:
+        """Await an endpoint method and return its `ApiResult`, see `YalidineClient.call`."""
+        reset_result()
+        data = await method(*args, **kwargs)
+        result = last_result(self)
+        if result is None or result.data is not data:
+            return ApiResult(data)
+        return result
+
+    async def _send(self, method: str, url: str, **kwargs) -> "httpx.Response":
+        # the slot is released even if the caller is cancelled, and httpx
+        # drops the half-used connection instead of returning it to the pool.
+        async with self._semaphore:
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.before_request()
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async()
+
+            event = None
+            if self.instruments:
+                event = start_request(self.instruments, method, url, url[len(self.url):], kwargs.get("content"))
+
+            try:
+                response = await self.http.request(method, url, headers=self.headers, **kwargs)
+            except BaseException as e:
+                # only the network errors count as failures, a cancelled call
+                # still frees the half-open probe
+                if self.circuit_breaker is not None:
+                    if isinstance(e, httpx.TransportError):
+                        self.circuit_breaker.record(None)
+                    else:
+                        self.circuit_breaker.release()
+                if event is not None:
+                    finish_request(self.instruments, event, error=e)
+                raise
+
+        if event is not None:
+            finish_request(self.instruments, event, response)
+
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record(response.status_code)
+        self.quota.update(response.headers)
+        if self.rate_limiter is not None:
+            self.rate_limiter.update(response.headers)
+        return response
+
+    async def _request(self, method: str, path: str, **kwargs) -> "httpx.Response":
+        url = urljoin(self.url, path)
+        if self.coalescer is not None and method == "GET":
+            return await self.coalescer.request(url, lambda: self._retrying(method, url, **kwargs), self.api_id)
+        return await self._retrying(method, url, **kwargs)
+
+    async def _retrying(self, method: str, url: str, **kwargs) -> "httpx.Response":
+        attempt = 0
+        while True:
+            try:
+                response = await self._send(method, url, **kwargs)
+            except httpx.TransportError:
+                delay = None if self.retry is None else self.retry.retry_after(method, attempt)
+                if delay is None:
+                    raise
+            else:
+                delay = None if self.retry is None else self.retry.retry_after(method, attempt, response)
+                if delay is None:
+                    return response
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    # ===============================
+    # MARK: Parcels
+    # ===============================
+    @async_response_or_exception
+    async def get_parcel(self, parcel_id):
+        return await self._request("GET", f"parcels/{parcel_id}")
+
+    @async_response_or_exception
+    async def get_parcels(self, filter: ParcelFilter = None):
+        query = filter_to_query_string(filter)
+        return await self._request("GET", f"parcels/?{query}")
+
+    @async_response_or_exception
+    async def create_parcel(self, parcel_list: list[Parcel]):
+        assert isinstance(parcel_list, list)
+
+        return await self._request("POST", "parcels", content=self.codec.dumps(parcel_list))
+
+    @async_response_or_exception
+    async def update_parcel(self, parcel_id: str, data: Parcel):
+        return await self._request(
+            "PATCH", f"parcels/{parcel_id}", content=self.codec.dumps(asdict_true_value(data))
+        )
+
+    @async_response_or_exception
+    async def delete_parcel(self, parcel_id: str):
+        return await self._request("DELETE", f"parcels/{parcel_id}")
+
+    @async_response_or_exception
+    async def delete_parcels(self, parcel_ids: list[str]):
+        return await self._request(
+            "DELETE", f"parcels/?tracking={','.join(parcel_ids)}"
+        )
+
+    # ===============================
+    # MARK: Histories
+    # ===============================
+    @async_response_or_exception
+    async def get_histories(self, filter: HistoryFilter = None):
+        query = filter_to_query_string(filter)
+        return await self._request("GET", f"histories/?{query}")
+
+    @async_response_or_exception
+    async def get_parcel_history(self, traking_id: str):
+        return await self._request("GET", f"histories/{traking_id}")
+
+    # ===============================
+    # MARK: Centers
+    # ===============================
+    @async_response_or_exception
+    async def get_centers(self, filter: CenterFilter = None):
+        query = filter_to_query_string(filter)
+        return await self._request("GET", f"centers/?{query}")
+
+    @async_response_or_exception
+    async def get_center(self, center_id: str):
+        return await self._request("GET", f"centers/{center_id}")
+
+    # ===============================
+    # MARK: Communes
+    # ===============================
+    @async_response_or_exception
+    async def get_communes(self, filter: CommunesFilter = None):
+        query = filter_to_query_string(filter)
+        return await self._request("GET", f"communes/?{query}")
+
+    @async_response_or_exception
+    async def get_commune(self, commune_id: str):
+        return await self._request("GET", f"communes/{commune_id}")
+
+    # ===============================
+    # MARK: Wilayas
+    # ===============================
+    @async_response_or_exception
+    async def get_wilayas(self, filter: WilayasFilter = None):
+        query = filter_to_query_string(filter)
+        return await self._request("GET", f"wilayas/?{query}")
+
+    @async_response_or_exception
+    async def get_wilaya(self, wilaya_id: str):
+        return await self._request("GET", f"wilayas/{wilaya_id}")
+
+    # ===============================
+    # MARK: Delivery Fees
+    # ===============================
+    @async_response_or_exception
+    async def get_delivery_fees(self, filter: DeliveryFeesFilter = None):
+        query = filter_to_query_string(filter)
+        return await self._request("GET", f"deliveryfees/?{query}")
+
+    @async_response_or_exception
+    async def get_wilaya_delivery_fee(self, wilaya_id: str):
+        return await self._request("GET", f"deliveryfees/{wilaya_id}")
+
+    # ===============================
+    # MARK: Iterators
+    # ===============================
+    def iter_parcels(self, filter: ParcelFilter = None, prefetch: bool = True, model=None):
+        """Yield every parcel matching `filter`, page by page (async generator)."""
+        return aiter_records(self.get_parcels, filter or ParcelFilter(), prefetch, model)
+
+    def iter_histories(self, filter: HistoryFilter = None, prefetch: bool = True, model=None):
+        """Yield every history matching `filter`, page by page (async generator)."""
+        return aiter_records(self.get_histories, filter or HistoryFilter(), prefetch, model)
+
+    def iter_centers(self, filter: CenterFilter = None, prefetch: bool = True, model=None):
+        """Yield every center matching `filter`, page by page (async generator)."""
+        return aiter_records(self.get_centers, filter or CenterFilter(), prefetch, model)
+
+    def iter_communes(self, filter: CommunesFilter = None, prefetch: bool = True, model=None):
+        """Yield every commune matching `filter`, page by page (async generator)."""
+        return aiter_records(self.get_communes, filter or CommunesFilter(), prefetch, model)
+
+    def iter_wilayas(self, filter: WilayasFilter = None, prefetch: bool = True, model=None):
+        """Yield every wilaya matching `filter`, page by page (async generator)."""
+        return aiter_records(self.get_wilayas, filter or WilayasFilter(), prefetch, model)
+
+    def iter_delivery_fees(self, filter: DeliveryFeesFilter = None, prefetch: bool = True, model=None):
+        """Yield every delivery fee matching `filter`, page by page (async generator)."""
+        return aiter_records(self.get_delivery_fees, filter or DeliveryFeesFilter(), prefetch, model)
+
+    def scan_parcels(self, filter: ParcelFilter = None, max_workers: int = 4, ordered: bool = True, model=None):
+        """Yield every parcel matching `filter`, the pages are fetched concurrently (async generator)."""
+        return ascan_records(self.get_parcels, filter or ParcelFilter(), max_workers, ordered, model)
+
+    def scan_histories(self, filter: HistoryFilter = None, max_workers: int = 4, ordered: bool = True, model=None):
+        """Yield every history matching `filter`, the pages are fetched concurrently (async generator)."""
+        return ascan_records(self.get_histories, filter or HistoryFilter(), max_workers, ordered, model)
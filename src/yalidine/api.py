@@ -1,13 +1,35 @@
 # core
 import json
+import time
 from dataclasses import asdict
 
 # lib
 import requests
+from requests.adapters import HTTPAdapter, BaseAdapter
 from requests.compat import urljoin
 
 # files
-from .settings import YALIDINE_URL
+from .settings import (
+    YALIDINE_URL,
+    YALIDINE_TIMEOUT,
+    YALIDINE_POOL_CONNECTIONS,
+    YALIDINE_POOL_MAXSIZE,
+    YALIDINE_CREATE_CHUNK_SIZE,
+)
+from .codec import get_codec
+from .ratelimit import QuotaScheduler, QuotaState
+from .result import ApiResult, record_result, last_result, reset_result
+from .retry import RetryPolicy, CircuitBreaker, CircuitOpenError
+from .cache import TTLCache, cached
+from .instrumentation import start_request, finish_request
+from .coalesce import RequestCoalescer
+from .bulk import (
+    bulk_create_parcels,
+    delete_parcels_bulk,
+    get_parcels_by_tracking,
+    get_histories_by_tracking,
+)
+from .pagination import iter_records, scan_records
 from .entity import (
     Parcel,
     ParcelFilter,
@@ -25,6 +47,8 @@ asdict_true_value = lambda x: asdict(x, dict_factory=exclude_none_value)
 
 dict_to_query_string = lambda x: "&".join([f"{k}={v}" for k, v in x.items()])
 
+filter_to_query_string = lambda x: dict_to_query_string(asdict_true_value(x)) if x else ""
+
 
 def response_or_exception(fn):
     from functools import wraps
@@ -35,8 +59,9 @@ def response_or_exception(fn):
         if response.status_code == 422:
             raise requests.exceptions.HTTPError(response, response=response)
         response.raise_for_status()
-        self.last_response_headers = response.headers
-        return response.json()
+        data = self.codec.loads(response.content)
+        record_result(self, data, response)
+        return data
 
     return wrapper
 
@@ -45,137 +70,346 @@ def response_or_exception(fn):
 # MARK: YalidineClient
 # ===============================
 class YalidineClient:
-    def __init__(self, api_id, api_token, url=YALIDINE_URL):
+    """
+    Yalidine api client
+
+    All endpoint methods share one pooled `requests.Session`, so connections
+    (TCP + TLS) are kept alive and reused between calls.
+
+    ...
+
+    Attributes
+    ----------
+        url : str
+            The base url of the api.
+        timeout : float | tuple
+            The (connect, read) timeout applied to every request.
+        pool_connections : int
+            The number of host pools to cache.
+        pool_maxsize : int
+            The maximum number of connections kept alive per host,
+            set it to the number of threads sharing the client.
+        keep_alive : bool
+            Reuse connections between requests. if `False`, every request
+            asks the server to close the connection.
+        adapter : requests.adapters.BaseAdapter
+            A custom transport mounted on the session (eg: an HTTP/2 adapter).
+            Defaults to a pooled `HTTPAdapter`.
+        session : requests.Session
+            Use an existing session instead of creating one. the client does
+            not close a session it did not create nor set its headers, the
+            credentials are sent with each request.
+        rate_limiter : QuotaScheduler
+            Pace the requests under the api quotas, it can be shared between
+            clients using the same api key.
+        cache : TTLCache
+            Cache the reference data (wilayas, communes, centers and
+            delivery fees), the cached responses are shared between callers
+            and must not be mutated.
+        retry : RetryPolicy
+            Retry the transient failures (connection errors, 429, 5xx).
+        circuit_breaker : CircuitBreaker
+            Fail fast with `CircuitOpenError` while the api is down.
+        codec : str | codec
+            The json backend (`"orjson"`, `"msgspec"`, `"json"` or a codec
+            object), defaults to the fastest one installed.
+        instruments : list
+            `Instrument` objects notified before and after every request
+            (eg: `Metrics`, `OpenTelemetry`, `Hooks`).
+        coalescer : RequestCoalescer
+            Share one request between the identical GETs made at the same
+            time (eg: many users refreshing the same tracking page).
+    """
+
+    def __init__(
+        self,
+        api_id,
+        api_token,
+        url=YALIDINE_URL,
+        timeout=YALIDINE_TIMEOUT,
+        pool_connections: int = YALIDINE_POOL_CONNECTIONS,
+        pool_maxsize: int = YALIDINE_POOL_MAXSIZE,
+        keep_alive: bool = True,
+        adapter: BaseAdapter = None,
+        session: requests.Session = None,
+        rate_limiter: QuotaScheduler = None,
+        cache: TTLCache = None,
+        retry: RetryPolicy = None,
+        circuit_breaker: CircuitBreaker = None,
+        codec=None,
+        instruments: list = None,
+        coalescer: RequestCoalescer = None,
+    ):
         self.url = url
         self.api_id = api_id
         self.api_token = api_token
-        self.last_response_headers = None
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.retry = retry
+        self.circuit_breaker = circuit_breaker
+        self.codec = codec if hasattr(codec, "loads") else get_codec(codec)
+        self.instruments = list(instruments or ())
+        self.coalescer = coalescer
+        self.quota = QuotaState()
         self.headers = {
             "X-API-ID": self.api_id,
             "X-API-TOKEN": self.api_token,
             "Content-Type": "application/json",
         }
+        if not keep_alive:
+            self.headers["Connection"] = "close"
+
+        self._owns_session = session is None
+        self.session = session if session is not None else requests.Session()
+        # the credentials go with every request, a shared session may serve other accounts
+        if self._owns_session:
+            self.session.headers.update(self.headers)
+
+        if adapter is None and self._owns_session:
+            adapter = HTTPAdapter(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+            )
+        if adapter is not None:
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+
+    # ===============================
+    # MARK: Lifecycle
+    # ===============================
+    def close(self):
+        """Release the pooled connections."""
+        if self._owns_session:
+            self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ===============================
+    # MARK: Results
+    # ===============================
+    @property
+    def last_result(self) -> ApiResult:
+        """The `ApiResult` of the last call made by the current thread, None before."""
+        return last_result(self)
+
+    @property
+    def last_response_headers(self):
+        """The headers of the last response received by the current thread."""
+        result = last_result(self)
+        return None if result is None else result.headers
+
+    def call(self, method, *args, **kwargs) -> ApiResult:
+        """
+        Call an endpoint method and return its `ApiResult`, with the headers,
+        quota and timing of this call only:
+
+            result = client.call(client.get_parcels, ParcelFilter(page_size=10))
+            result.data, result.quota, result.elapsed
+        """
+        reset_result()
+        data = method(*args, **kwargs)
+        result = last_result(self)
+        if result is None or result.data is not data:
+            # not an endpoint (eg: a bulk helper), no metadata of its own
+            return ApiResult(data)
+        return result
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.before_request()
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+        event = None
+        if self.instruments:
+            event = start_request(self.instruments, method, url, url[len(self.url):], kwargs.get("data"))
+
+        try:
+            response = self.session.request(method, url, headers=self.headers, **kwargs)
+        except BaseException as e:
+            # only the network errors count as failures, an interrupted call
+            # still frees the half-open probe
+            if self.circuit_breaker is not None:
+                if isinstance(e, requests.exceptions.RequestException):
+                    self.circuit_breaker.record(None)
+                else:
+                    self.circuit_breaker.release()
+            if event is not None:
+                finish_request(self.instruments, event, error=e)
+            raise
+
+        if event is not None:
+            finish_request(self.instruments, event, response)
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record(response.status_code)
+        self.quota.update(response.headers)
+        if self.rate_limiter is not None:
+            self.rate_limiter.update(response.headers)
+        return response
+
+    def _request(self, method: str, path: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        url = urljoin(self.url, path)
+        if self.coalescer is not None and method == "GET":
+            return self.coalescer.request(url, lambda: self._retrying(method, url, **kwargs), self.api_id)
+        return self._retrying(method, url, **kwargs)
+
+    def _retrying(self, method: str, url: str, **kwargs) -> requests.Response:
+        attempt = 0
+        while True:
+            try:
+                response = self._send(method, url, **kwargs)
+            except CircuitOpenError:
+                raise
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                delay = None if self.retry is None else self.retry.retry_after(method, attempt)
+                if delay is None:
+                    raise
+            else:
+                delay = None if self.retry is None else self.retry.retry_after(method, attempt, response)
+                if delay is None:
+                    return response
+
+            time.sleep(delay)
+            attempt += 1
 
     # ===============================
     # MARK: Parcels
     # ===============================
     @response_or_exception
     def get_parcel(self, parcel_id):
-        response = requests.get(
-            urljoin(self.url, f"parcels/{parcel_id}"),
-            headers=self.headers,
+        response = self._request(
+            "GET",
+            f"parcels/{parcel_id}",
         )
 
         return response
 
     @response_or_exception
     def get_parcels(self, filter: ParcelFilter = None):
-        query = ""
+        query = filter_to_query_string(filter)
 
-        if filter:
-            f = asdict_true_value(filter)
-            query = dict_to_query_string(f)
-
-        response = requests.get(
-            urljoin(self.url, f"parcels/?{query}"),
-            headers=self.headers,
+        response = self._request(
+            "GET",
+            f"parcels/?{query}",
         )
-        print(response.url)
         return response
 
     @response_or_exception
     def create_parcel(self, parcel_list: list[Parcel]):
         assert isinstance(parcel_list, list)
-        
-        body = [asdict(parcel) for parcel in parcel_list]
 
-        response = requests.post(
-            urljoin(self.url, "parcels"),
-            headers=self.headers,
-            json=body,
+        response = self._request(
+            "POST",
+            "parcels",
+            data=self.codec.dumps(parcel_list),
         )
 
         return response
 
+    def create_parcels_bulk(
+        self,
+        parcel_list: list[Parcel],
+        chunk_size: int = YALIDINE_CREATE_CHUNK_SIZE,
+        max_workers: int = 4,
+        retries: int = 2,
+    ) -> dict:
+        """Create many parcels in parallel chunks, see `bulk.bulk_create_parcels`."""
+        return bulk_create_parcels(self, parcel_list, chunk_size, max_workers, retries)
+
     @response_or_exception
     def update_parcel(self, parcel_id: str, data: Parcel):
-        response = requests.patch(
-            urljoin(self.url, f"parcels/{parcel_id}"),
-            headers=self.headers,
-            json=asdict_true_value(data),
+        response = self._request(
+            "PATCH",
+            f"parcels/{parcel_id}",
+            data=self.codec.dumps(asdict_true_value(data)),
         )
 
         return response
 
     @response_or_exception
     def delete_parcel(self, parcel_id: str):
-        response = requests.delete(
-            urljoin(self.url, f"parcels/{parcel_id}"),
-            headers=self.headers,
+        response = self._request(
+            "DELETE",
+            f"parcels/{parcel_id}",
         )
 
         return response
 
     @response_or_exception
     def delete_parcels(self, parcel_ids: list[str]):
-        response = requests.delete(
-            urljoin(self.url, f"parcels/?tracking={','.join(parcel_ids)}"),
-            headers=self.headers,
+        response = self._request(
+            "DELETE",
+            f"parcels/?tracking={','.join(parcel_ids)}",
         )
         return response
 
+    def delete_parcels_bulk(self, parcel_ids: list[str], max_workers: int = 4) -> dict:
+        """Delete many parcels in url safe chunks, see `bulk.delete_parcels_bulk`."""
+        return delete_parcels_bulk(self, parcel_ids, max_workers=max_workers)
+
+    def get_parcels_by_tracking(
+        self, trackings: list[str], filter: ParcelFilter = None, max_workers: int = 4
+    ) -> dict:
+        """Fetch many parcels in url safe chunks, see `bulk.get_parcels_by_tracking`."""
+        return get_parcels_by_tracking(self, trackings, filter, max_workers=max_workers)
+
     # ===============================
     # MARK: Histories
     # ===============================
 
     @response_or_exception
     def get_histories(self, filter: HistoryFilter = None):
-        query = ""
+        query = filter_to_query_string(filter)
 
-        if filter:
-            f = asdict_true_value(filter)
-            query = dict_to_query_string(f)
-
-        response = requests.get(
-            urljoin(self.url, f"histories/?{query}"),
-            headers=self.headers,
+        response = self._request(
+            "GET",
+            f"histories/?{query}",
         )
-        print(response.url)
 
         return response
 
     @response_or_exception
     def get_parcel_history(self, traking_id: str):
-        response = requests.get(
-            urljoin(self.url, f"histories/{traking_id}"),
-            headers=self.headers,
+        response = self._request(
+            "GET",
+            f"histories/{traking_id}",
         )
 
         return response
 
+    def get_histories_by_tracking(
+        self, trackings: list[str], filter: HistoryFilter = None, max_workers: int = 4
+    ) -> dict:
+        """Fetch the histories of many parcels in url safe chunks, see `bulk.get_histories_by_tracking`."""
+        return get_histories_by_tracking(self, trackings, filter, max_workers=max_workers)
+
     # ===============================
     # MARK: Centers
     # ===============================
+    @cached("centers")
     @response_or_exception
     def get_centers(self, filter: CenterFilter = None):
-        query = ""
+        query = filter_to_query_string(filter)
 
-        if filter:
-            f = asdict_true_value(filter)
-            query = dict_to_query_string(f)
-
-        response = requests.get(
-            urljoin(self.url, f"centers/?{query}"),
-            headers=self.headers,
+        response = self._request(
+            "GET",
+            f"centers/?{query}",
         )
 
         return response
 
+    @cached("centers")
     @response_or_exception
     def get_center(self, center_id: str):
-        response = requests.get(
-            urljoin(self.url, f"centers/{center_id}"),
-            headers=self.headers,
+        response = self._request(
+            "GET",
+            f"centers/{center_id}",
         )
 
         return response
@@ -183,26 +417,24 @@ class YalidineClient:
     # ===============================
     # MARK: Communes
     # ===============================
+    @cached("communes")
     @response_or_exception
     def get_communes(self, filter: CommunesFilter = None):
-        query = ""
-
-        if filter:
-            f = asdict_true_value(filter)
-            query = dict_to_query_string(f)
+        query = filter_to_query_string(filter)
 
-        response = requests.get(
-            urljoin(self.url, f"communes/?{query}"),
-            headers=self.headers,
+        response = self._request(
+            "GET",
+            f"communes/?{query}",
         )
 
         return response
 
+    @cached("communes")
     @response_or_exception
     def get_commune(self, commune_id: str):
-        response = requests.get(
-            urljoin(self.url, f"communes/{commune_id}"),
-            headers=self.headers,
+        response = self._request(
+            "GET",
+            f"communes/{commune_id}",
         )
 
         return response
@@ -210,26 +442,24 @@ class YalidineClient:
     # ===============================
     # MARK: Wilayas
     # ===============================
+    @cached("wilayas")
     @response_or_exception
     def get_wilayas(self, filter: WilayasFilter = None):
-        query = ""
+        query = filter_to_query_string(filter)
 
-        if filter:
-            f = asdict_true_value(filter)
-            query = dict_to_query_string(f)
-
-        response = requests.get(
-            urljoin(self.url, f"wilayas/?{query}"),
-            headers=self.headers,
+        response = self._request(
+            "GET",
+            f"wilayas/?{query}",
         )
 
         return response
 
+    @cached("wilayas")
     @response_or_exception
     def get_wilaya(self, wilaya_id: str):
-        response = requests.get(
-            urljoin(self.url, f"wilayas/{wilaya_id}"),
-            headers=self.headers,
+        response = self._request(
+            "GET",
+            f"wilayas/{wilaya_id}",
         )
 
         return response
@@ -237,26 +467,59 @@ class YalidineClient:
     # ===============================
     # MARK: Delivery Fees
     # ===============================
+    @cached("deliveryfees")
     @response_or_exception
     def get_delivery_fees(self, filter: DeliveryFeesFilter = None):
-        query = ""
-
-        if filter:
-            f = asdict_true_value(filter)
-            query = dict_to_query_string(f)
+        query = filter_to_query_string(filter)
 
-        response = requests.get(
-            urljoin(self.url, f"deliveryfees/?{query}"),
-            headers=self.headers,
+        response = self._request(
+            "GET",
+            f"deliveryfees/?{query}",
         )
 
         return response
 
+    @cached("deliveryfees")
     @response_or_exception
     def get_wilaya_delivery_fee(self, wilaya_id: str):
-        response = requests.get(
-            urljoin(self.url, f"deliveryfees/{wilaya_id}"),
-            headers=self.headers,
+        response = self._request(
+            "GET",
+            f"deliveryfees/{wilaya_id}",
         )
 
         return response
+
+    # ===============================
+    # MARK: Iterators
+    # ===============================
+    def iter_parcels(self, filter: ParcelFilter = None, prefetch: bool = True, model=None):
+        """Yield every parcel matching `filter`, page by page."""
+        return iter_records(self.get_parcels, filter or ParcelFilter(), prefetch, model)
+
+    def iter_histories(self, filter: HistoryFilter = None, prefetch: bool = True, model=None):
+        """Yield every history matching `filter`, page by page."""
+        return iter_records(self.get_histories, filter or HistoryFilter(), prefetch, model)
+
+    def iter_centers(self, filter: CenterFilter = None, prefetch: bool = True, model=None):
+        """Yield every center matching `filter`, page by page."""
+        return iter_records(self.get_centers, filter or CenterFilter(), prefetch, model)
+
+    def iter_communes(self, filter: CommunesFilter = None, prefetch: bool = True, model=None):
+        """Yield every commune matching `filter`, page by page."""
+        return iter_records(self.get_communes, filter or CommunesFilter(), prefetch, model)
+
+    def iter_wilayas(self, filter: WilayasFilter = None, prefetch: bool = True, model=None):
+        """Yield every wilaya matching `filter`, page by page."""
+        return iter_records(self.get_wilayas, filter or WilayasFilter(), prefetch, model)
+
+    def iter_delivery_fees(self, filter: DeliveryFeesFilter = None, prefetch: bool = True, model=None):
+        """Yield every delivery fee matching `filter`, page by page."""
+        return iter_records(self.get_delivery_fees, filter or DeliveryFeesFilter(), prefetch, model)
+
+    def scan_parcels(self, filter: ParcelFilter = None, max_workers: int = 4, ordered: bool = True, model=None):
+        """Yield every parcel matching `filter`, the pages are fetched in parallel."""
+        return scan_records(self.get_parcels, filter or ParcelFilter(), max_workers, ordered, model)
+
+    def scan_histories(self, filter: HistoryFilter = None, max_workers: int = 4, ordered: bool = True, model=None):
+        """Yield every history matching `filter`, the pages are fetched in parallel."""
+        return scan_records(self.get_histories, filter or HistoryFilter(), max_workers, ordered, model)
@@ -0,0 +1,313 @@
+# core
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Optional
+
+# lib
+import requests
+from urllib3.exceptions import NewConnectionError
+
+# files
+from .settings import YALIDINE_CREATE_CHUNK_SIZE, YALIDINE_MAX_IDS_LENGTH
+from .entity import Parcel, ParcelFilter, HistoryFilter
+from .retry import CircuitOpenError
+
+
+# statuses answered before the parcels are processed, nothing was created
+NOT_PROCESSED_STATUSES = frozenset({401, 403, 429})
+
+
+def chunks(items: list, size: int):
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def chunk_ids(ids: list, max_length: int = YALIDINE_MAX_IDS_LENGTH):
+    """Split ids in lists whose comma separated form fits in `max_length` characters."""
+    chunk, length = [], 0
+    for id in ids:
+        id = str(id)
+        extra = len(id) + (1 if chunk else 0)
+        if chunk and length + extra > max_length:
+            yield chunk
+            chunk, length = [], 0
+            extra = len(id)
+        chunk.append(id)
+        length += extra
+    if chunk:
+        yield chunk
+
+
+def _not_sent(error: Exception) -> bool:
+    """Whether the request provably never reached the server, so sending it again can not duplicate it."""
+    if isinstance(error, (requests.exceptions.ConnectTimeout, CircuitOpenError)):
+        return True
+    if isinstance(error, requests.exceptions.ConnectionError) and error.args:
+        # connection refused, unknown host...
+        return isinstance(getattr(error.args[0], "reason", None), NewConnectionError)
+    return False
+
+
+def _error_message(error: Exception) -> str:
+    response = getattr(error, "response", None)
+    if response is not None:
+        try:
+            return str(response.json())
+        except ValueError:
+            return f"{response.status_code} {response.text}"
+    return str(error) or type(error).__name__
+
+
+# ===============================
+# MARK: BulkResult
+# ===============================
+@dataclass
+class BulkResult:
+    """
+    BulkResult object
+
+    ...
+
+    Attributes
+    ----------
+        order_id : str
+            The order id of the parcel.
+        success : bool
+            Whether or not the parcel was created.
+        tracking : str
+            The tracking of the created parcel.
+        label : str
+            The url of the parcel's label.
+        error : str
+            The reason of the failure.
+        rejected : bool
+            Whether the api answered and refused the parcel. when `False`
+            on a failure, the outcome is unknown (eg: lost response) and the
+            parcel may have been created, unless `retryable`.
+        retryable : bool
+            The parcel was not created and can be sent again as is
+            (eg: 429, connection refused).
+    """
+
+    order_id: str
+    success: bool
+    tracking: Optional[str] = None
+    label: Optional[str] = None
+    error: Optional[str] = None
+    rejected: bool = False
+    retryable: bool = False
+
+
+# ===============================
+# MARK: Bulk create
+# ===============================
+def check_order_ids(parcels: list):
+    """The results are keyed by `order_id`, raise a `ValueError` when one is missing or repeated."""
+    order_ids = [p.order_id for p in parcels]
+    if None in order_ids or len(set(order_ids)) != len(order_ids):
+        raise ValueError("every parcel needs a unique order_id")
+
+
+def _create_chunk(client, chunk: list, retries: int, backoff: float) -> list:
+    attempt = 0
+    while True:
+        try:
+            response = client.create_parcel(chunk)
+            break
+        except requests.exceptions.HTTPError as e:
+            status = e.response.status_code if e.response is not None else None
+            if status == 422 and len(chunk) > 1:
+                # isolate the invalid rows by halving the chunk
+                middle = len(chunk) // 2
+                return _create_chunk(client, chunk[:middle], retries, backoff) + _create_chunk(
+                    client, chunk[middle:], retries, backoff
+                )
+            # a 429 is answered before the parcels are processed, after a 5xx
+            # the parcels may have been created and are not sent again
+            if status != 429 or attempt >= retries:
+                retryable = status in NOT_PROCESSED_STATUSES
+                rejected = status is not None and status < 500 and not retryable
+                return [
+                    BulkResult(p.order_id, False, error=_error_message(e), rejected=rejected, retryable=retryable)
+                    for p in chunk
+                ]
+        except requests.exceptions.RequestException as e:
+            # a lost response (read timeout, broken connection) is an unknown outcome
+            not_sent = _not_sent(e)
+            if not not_sent or attempt >= retries:
+                return [BulkResult(p.order_id, False, error=_error_message(e), retryable=not_sent) for p in chunk]
+
+        attempt += 1
+        time.sleep(backoff * 2 ** (attempt - 1))
+
+    results = []
+    for parcel in chunk:
+        item = response.get(parcel.order_id) if isinstance(response, dict) else None
+        if item is None:
+            results.append(BulkResult(parcel.order_id, False, error="missing from the response"))
+        elif item.get("success"):
+            results.append(
+                BulkResult(
+                    parcel.order_id,
+                    True,
+                    tracking=item.get("tracking"),
+                    label=item.get("label"),
+                )
+            )
+        else:
+            results.append(
+                BulkResult(parcel.order_id, False, error=item.get("message"), rejected=True)
+            )
+    return results
+
+
+def bulk_create_parcels(
+    client,
+    parcels: list[Parcel],
+    chunk_size: int = YALIDINE_CREATE_CHUNK_SIZE,
+    max_workers: int = 4,
+    retries: int = 2,
+    backoff: float = 1.0,
+) -> dict:
+    """
+    Create many parcels in parallel chunks, return a `BulkResult` per `order_id`.
+
+    Only the chunks which provably did not reach the api (connection refused,
+    connect timeout, 429) are retried, `retries` times with an exponential
+    `backoff`. after a lost response or a 5xx the parcels may have been
+    created, they are reported as failed with `rejected=False` (unknown
+    outcome) instead of being sent again, see `IdempotentCreator` to
+    reconcile them. a chunk rejected with a 422 is split in halves until the
+    invalid parcels are isolated, so one bad row only fails itself. pass a
+    client with a `rate_limiter` to stay under the quotas.
+    """
+    parcels = list(parcels)
+    check_order_ids(parcels)
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(_create_chunk, client, chunk, retries, backoff)
+            for chunk in chunks(parcels, chunk_size)
+        ]
+        for future in futures:
+            for result in future.result():
+                results[result.order_id] = result
+    return results
+
+
+# ===============================
+# MARK: Bulk by tracking
+# ===============================
+class ChunkedResult(dict):
+    """
+    The outcome of each tracking of a chunked call, a failed chunk does not
+    fail the others: its trackings map to None (unknown outcome) and their
+    error is kept in `errors`.
+
+    ...
+
+    Attributes
+    ----------
+        errors : dict
+            The error of each tracking of a failed chunk.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.errors = {}
+
+    def fail(self, errors: dict):
+        self.errors.update(errors)
+        self.update(dict.fromkeys(errors))
+
+
+def _map_chunks(fn, ids: list, max_workers: int, max_length: int) -> tuple:
+    """Call `fn` on the url safe chunks of `ids`, return the responses, the error of each id of a failed chunk and the ids."""
+    ids = list(dict.fromkeys(str(id) for id in ids))
+
+    def call(chunk):
+        try:
+            return chunk, fn(chunk), None
+        except Exception as e:
+            return chunk, None, e
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        outcomes = list(executor.map(call, chunk_ids(ids, max_length)))
+
+    responses = [response for _, response, error in outcomes if error is None]
+    errors = {id: error for chunk, _, error in outcomes if error is not None for id in chunk}
+    return responses, errors, ids
+
+
+def delete_parcels_bulk(
+    client,
+    trackings: list[str],
+    max_workers: int = 4,
+    max_length: int = YALIDINE_MAX_IDS_LENGTH,
+) -> dict:
+    """
+    Delete many parcels in url safe chunks, return whether each tracking was
+    deleted as a `ChunkedResult` (None when its chunk failed).
+    """
+    responses, errors, trackings = _map_chunks(client.delete_parcels, trackings, max_workers, max_length)
+
+    result = ChunkedResult.fromkeys(trackings, False)
+    for response in responses:
+        for item in response:
+            result[item["tracking"]] = bool(item.get("deleted"))
+    result.fail(errors)
+    return result
+
+
+def get_parcels_by_tracking(
+    client,
+    trackings: list[str],
+    filter: ParcelFilter = None,
+    max_workers: int = 4,
+    max_length: int = YALIDINE_MAX_IDS_LENGTH,
+) -> dict:
+    """
+    Fetch many parcels in url safe chunks, return the parcel of each tracking
+    as a `ChunkedResult` (None when missing or when its chunk failed).
+    """
+    filter = filter or ParcelFilter()
+
+    def fetch(chunk):
+        return list(client.iter_parcels(replace(filter, tracking=",".join(chunk)), prefetch=False))
+
+    responses, errors, trackings = _map_chunks(fetch, trackings, max_workers, max_length)
+
+    result = ChunkedResult.fromkeys(trackings)
+    for parcels in responses:
+        for parcel in parcels:
+            result[parcel["tracking"]] = parcel
+    result.fail(errors)
+    return result
+
+
+def get_histories_by_tracking(
+    client,
+    trackings: list[str],
+    filter: HistoryFilter = None,
+    max_workers: int = 4,
+    max_length: int = YALIDINE_MAX_IDS_LENGTH,
+) -> dict:
+    """
+    Fetch the histories of many parcels in url safe chunks, return the events
+    of each tracking as a `ChunkedResult` (None when its chunk failed).
+    """
+    filter = filter or HistoryFilter()
+
+    def fetch(chunk):
+        return list(client.iter_histories(replace(filter, tracking=",".join(chunk)), prefetch=False))
+
+    responses, errors, trackings = _map_chunks(fetch, trackings, max_workers, max_length)
+
+    result = ChunkedResult((tracking, []) for tracking in trackings)
+    for histories in responses:
+        for history in histories:
+            result.setdefault(history["tracking"], []).append(history)
+    result.fail(errors)
+    return result
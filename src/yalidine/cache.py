@@ -0,0 +1,167 @@
+# core
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import fields, is_dataclass
+from functools import wraps
+
+# files
+from .result import record_result, last_result, reset_result
+
+
+# resource -> time to live in seconds
+DEFAULT_TTLS = {
+    "wilayas": 24 * 3600,
+    "communes": 24 * 3600,
+    "centers": 6 * 3600,
+    "deliveryfees": 6 * 3600,
+}
+
+
+def make_key(name, args, kwargs) -> tuple:
+    """Hashable cache key of a client call, filters are keyed by their non None fields."""
+
+    def freeze(value):
+        if is_dataclass(value):
+            return (type(value).__name__,) + tuple(
+                (f.name, getattr(value, f.name))
+                for f in fields(value)
+                if getattr(value, f.name) is not None
+            )
+        return value
+
+    return (
+        name,
+        tuple(freeze(arg) for arg in args),
+        tuple(sorted((k, freeze(v)) for k, v in kwargs.items())),
+    )
+
+
+class _Flight:
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+# ===============================
+# MARK: TTLCache
+# ===============================
+class TTLCache:
+    """
+    Thread safe LRU cache with a time to live per resource.
+
+    Concurrent misses on the same key are de-duplicated, only the first
+    caller runs the loader and the others wait for its result.
+
+    ...
+
+    Attributes
+    ----------
+        maxsize : int
+            The maximum number of entries, the least recently used entry is
+            evicted first.
+        ttls : dict
+            Time to live in seconds per resource, defaults to `DEFAULT_TTLS`.
+        default_ttl : float
+            Time to live of the resources missing from `ttls`.
+        clock : callable
+            Monotonic clock, in seconds.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttls: dict = None,
+        default_ttl: float = 3600,
+        clock=time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.default_ttl = default_ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def get_or_load(self, resource: str, key, loader):
+        """Return the cached value of `key`, calling `loader()` on a miss."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > self.clock():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+            self.misses += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = loader()
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            self.set(resource, key, flight.value)
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.event.set()
+
+        return flight.value
+
+    def set(self, resource: str, key, value):
+        expires_at = self.clock() + self.ttls.get(resource, self.default_ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, resource: str = None):
+        """Drop every entry, or only the entries of `resource`."""
+        with self._lock:
+            if resource is None:
+                self._data.clear()
+                return
+            for key in [k for k in self._data if k[0] == resource]:
+                del self._data[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
+
+
+def cached(resource: str):
+    """Serve the decorated client method from `self.cache` when the client has one."""
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            if self.cache is None:
+                return fn(self, *args, **kwargs)
+
+            key = (resource,) + make_key(fn.__name__, args, kwargs)
+            reset_result()
+            data = self.cache.get_or_load(resource, key, lambda: fn(self, *args, **kwargs))
+            if last_result(self) is None:
+                # served by the cache (or loaded by a concurrent caller)
+                record_result(self, data)
+            return data
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,169 @@
+# core
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+# files
+from .cache import _Flight
+
+
+def request_key(url: str) -> str:
+    """The url with its query parameters sorted, equal filters give equal keys."""
+    parts = urlsplit(url)
+    if not parts.query:
+        return parts.geturl()
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)), safe=",")
+    return parts._replace(query=query).geturl()
+
+
+class _Window:
+    """The successful responses kept for `window` seconds after they arrived."""
+
+    def __init__(self, window: float, maxsize: int, clock):
+        self.window = window
+        self.maxsize = maxsize
+        self.clock = clock
+        self._data = OrderedDict()
+
+    def get(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= self.clock():
+            del self._data[key]
+            return None
+        return entry[1]
+
+    def set(self, key, response):
+        if self.window <= 0 or response.status_code >= 400:
+            return
+        self._data[key] = (self.clock() + self.window, response)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+# ===============================
+# MARK: RequestCoalescer
+# ===============================
+class RequestCoalescer:
+    """
+    Single-flight of identical GET requests across threads.
+
+    While a request is in flight, the identical requests (same path and
+    filter) wait for it and share its response instead of sending their
+    own, each caller still decodes its own copy of the body. with a
+    `window`, the response is also reused by the requests made up to
+    `window` seconds after it arrived. the requests are keyed by account
+    (`scope`) too, a coalescer can be shared by clients of different api keys.
+
+    ...
+
+    Attributes
+    ----------
+        window : float
+            The micro-cache window in seconds, 0 only shares the in-flight requests.
+        maxsize : int
+            The maximum number of responses kept for the window.
+        clock : callable
+            Monotonic clock, in seconds.
+    """
+
+    def __init__(self, window: float = 0.0, maxsize: int = 1024, clock=time.monotonic):
+        self.requests = 0
+        self.coalesced = 0
+        self._window = _Window(window, maxsize, clock)
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def request(self, url: str, send, scope=None):
+        """
+        Return the response of the GET of `url`, calling `send()` when no
+        identical request of the same `scope` (the api id) is in flight.
+        """
+        key = (scope, request_key(url))
+        with self._lock:
+            self.requests += 1
+            response = self._window.get(key)
+            if response is not None:
+                self.coalesced += 1
+                return response
+
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = send()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                if flight.error is None:
+                    self._window.set(key, flight.value)
+            flight.event.set()
+
+        return flight.value
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"requests": self.requests, "coalesced": self.coalesced, "in_flight": len(self._flights)}
+
+
+# ===============================
+# MARK: AsyncRequestCoalescer
+# ===============================
+class AsyncRequestCoalescer:
+    """
+    Single-flight of identical GET requests across tasks, see `RequestCoalescer`.
+
+    The shared request runs in a task of its own, a caller being cancelled
+    does not cancel it for the others. an instance belongs to one event loop.
+    """
+
+    def __init__(self, window: float = 0.0, maxsize: int = 1024, clock=time.monotonic):
+        self.requests = 0
+        self.coalesced = 0
+        self._window = _Window(window, maxsize, clock)
+        self._flights = {}
+
+    async def request(self, url: str, send, scope=None):
+        """
+        Return the response of the GET of `url`, awaiting `send()` when no
+        identical request of the same `scope` (the api id) is in flight.
+        """
+        key = (scope, request_key(url))
+        self.requests += 1
+        response = self._window.get(key)
+        if response is not None:
+            self.coalesced += 1
+            return response
+
+        task = self._flights.get(key)
+        if task is None:
+            task = self._flights[key] = asyncio.ensure_future(send())
+            task.add_done_callback(lambda task: self._done(key, task))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _done(self, key, task):
+        del self._flights[key]
+        if not task.cancelled() and task.exception() is None:
+            self._window.set(key, task.result())
+
+    def stats(self) -> dict:
+        return {"requests": self.requests, "coalesced": self.coalesced, "in_flight": len(self._flights)}
@@ -0,0 +1,90 @@
+# core
+import json
+from dataclasses import is_dataclass
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None
+
+
+def _default(obj):
+    # the entities are flat dataclasses, their __dict__ is enough and avoids
+    # the deep copy of `dataclasses.asdict`
+    if is_dataclass(obj):
+        return obj.__dict__
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# ===============================
+# MARK: Codecs
+# ===============================
+class JsonCodec:
+    """Standard library json codec, always available."""
+
+    name = "json"
+
+    def dumps(self, obj) -> bytes:
+        return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def loads(self, data: bytes):
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    """orjson codec (`pip install orjson`), encodes dataclasses natively."""
+
+    name = "orjson"
+
+    def dumps(self, obj) -> bytes:
+        return orjson.dumps(obj)
+
+    def loads(self, data: bytes):
+        return orjson.loads(data)
+
+
+class MsgspecCodec:
+    """msgspec codec (`pip install msgspec`), encodes dataclasses natively."""
+
+    name = "msgspec"
+
+    def __init__(self):
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, data: bytes):
+        return self._decoder.decode(data)
+
+
+CODECS = {
+    "json": (JsonCodec, True),
+    "orjson": (OrjsonCodec, orjson is not None),
+    "msgspec": (MsgspecCodec, msgspec is not None),
+}
+
+
+def available_codecs() -> list:
+    return [name for name, (_, available) in CODECS.items() if available]
+
+
+def get_codec(name: str = None):
+    """
+    Return the codec `name`, or the fastest installed one
+    (orjson, then msgspec, then the standard library).
+    """
+    if name is None:
+        for name in ("orjson", "msgspec", "json"):
+            if CODECS[name][1]:
+                break
+    cls, available = CODECS[name]
+    if not available:
+        raise ImportError(f"the {name} codec is not installed, run `pip install {name}`")
+    return cls()
@@ -0,0 +1,155 @@
+# core
+import csv
+import os
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - optional dependency
+    pyarrow = None
+
+# files
+from .entity import ParcelFilter, HistoryFilter
+from .models import ParcelRecord, HistoryEvent
+
+
+INT = "int"
+BOOL = "bool"
+STR = "str"
+
+# column -> type, the order is the order of the columns in the files
+PARCEL_SCHEMA = {name: STR for name in ParcelRecord._fields}
+PARCEL_SCHEMA.update(
+    {
+        "stopdesk_id": INT,
+        "from_wilaya_id": INT,
+        "to_commune_id": INT,
+        "to_wilaya_id": INT,
+        "price": INT,
+        "declared_value": INT,
+        "delivery_fee": INT,
+        "import_id": INT,
+        "length": INT,
+        "width": INT,
+        "height": INT,
+        "weight": INT,
+        "is_stopdesk": BOOL,
+        "do_insurance": BOOL,
+        "freeshipping": BOOL,
+        "has_exchange": BOOL,
+    }
+)
+
+HISTORY_SCHEMA = {name: STR for name in HistoryEvent._fields}
+HISTORY_SCHEMA.update({"center_id": INT, "wilaya_id": INT, "commune_id": INT})
+
+
+def _coerce(kind, value):
+    if value is None or value == "":
+        return None
+    if kind == INT:
+        return int(value)
+    if kind == BOOL:
+        return bool(int(value)) if isinstance(value, str) else bool(value)
+    return str(value)
+
+
+# ===============================
+# MARK: Writers
+# ===============================
+class _CsvWriter:
+    def __init__(self, path, schema):
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(schema)
+
+    def write(self, rows):
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class _ArrowWriter:
+    TYPES = {INT: "int64", BOOL: "bool_", STR: "string"}
+
+    def __init__(self, path, schema, parquet: bool):
+        if pyarrow is None:
+            raise ImportError("parquet and arrow exports require pyarrow, run `pip install pyarrow`")
+        self._schema = schema
+        self._arrow_schema = pyarrow.schema(
+            [(name, getattr(pyarrow, self.TYPES[kind])()) for name, kind in schema.items()]
+        )
+        if parquet:
+            self._writer = pyarrow.parquet.ParquetWriter(path, self._arrow_schema)
+        else:
+            self._sink = pyarrow.OSFile(path, "wb")
+            self._writer = pyarrow.ipc.new_file(self._sink, self._arrow_schema)
+
+    def write(self, rows):
+        kinds = list(self._schema.values())
+        columns = [[_coerce(kind, row[i]) for row in rows] for i, kind in enumerate(kinds)]
+        self._writer.write_batch(pyarrow.record_batch(columns, schema=self._arrow_schema))
+
+    def close(self):
+        self._writer.close()
+        if hasattr(self, "_sink"):
+            self._sink.close()
+
+
+def _writer(path, schema, format):
+    format = format or os.path.splitext(path)[1].lstrip(".").lower()
+    if format == "csv":
+        return _CsvWriter(path, schema)
+    if format == "parquet":
+        return _ArrowWriter(path, schema, parquet=True)
+    if format in ("arrow", "feather"):
+        return _ArrowWriter(path, schema, parquet=False)
+    raise ValueError(f"unknown export format {format!r}, use csv, parquet or arrow")
+
+
+# ===============================
+# MARK: Export
+# ===============================
+def export_records(records, path: str, schema: dict, format: str = None, batch_size: int = 10000) -> int:
+    """
+    Stream `records` (dicts) to `path` in batches of `batch_size` rows,
+    return the number of rows written. only one batch is held in memory.
+
+    ...
+
+    Parameters
+    ----------
+        format : str
+            `csv`, `parquet` or `arrow`, guessed from the extension of `path`
+            by default. parquet and arrow require `pyarrow`.
+    """
+    columns = list(schema)
+    writer = _writer(path, schema, format)
+    count = 0
+    try:
+        batch = []
+        for record in records:
+            batch.append(tuple(record.get(name) for name in columns))
+            if len(batch) >= batch_size:
+                writer.write(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            writer.write(batch)
+            count += len(batch)
+    finally:
+        writer.close()
+    return count
+
+
+def export_parcels(client, path: str, filter: ParcelFilter = None, format: str = None, batch_size: int = 10000) -> int:
+    """Stream every parcel matching `filter` to a csv, parquet or arrow file."""
+    return export_records(client.iter_parcels(filter), path, PARCEL_SCHEMA, format, batch_size)
+
+
+def export_histories(client, path: str, filter: HistoryFilter = None, format: str = None, batch_size: int = 10000) -> int:
+    """Stream every history matching `filter` to a csv, parquet or arrow file."""
+    return export_records(client.iter_histories(filter), path, HISTORY_SCHEMA, format, batch_size)
@@ -0,0 +1,196 @@
+# core
+import sqlite3
+import threading
+import time
+
+# files
+from .settings import YALIDINE_CREATE_CHUNK_SIZE
+from .entity import Parcel, ParcelFilter
+from .bulk import BulkResult, bulk_create_parcels, check_order_ids, chunk_ids, chunks
+
+
+PENDING = "pending"
+CREATED = "created"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ledger (
+    order_id TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    tracking TEXT,
+    label TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+# ===============================
+# MARK: Ledger
+# ===============================
+class Ledger:
+    """
+    SQLite ledger of the parcel creations: `order_id` -> state and tracking.
+
+    An order is `pending` while its creation outcome is unknown, `created`
+    once its tracking is known and `failed` when the api rejected it. an
+    order the api did not process (eg: 429) is dropped from the ledger.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def get(self, order_ids: list) -> dict:
+        """The `(state, tracking, label)` of the known orders."""
+        result = {}
+        with self._lock:
+            for chunk in chunks(list(order_ids), 500):
+                rows = self._db.execute(
+                    f"SELECT order_id, state, tracking, label FROM ledger WHERE order_id IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                result.update((order_id, (state, tracking, label)) for order_id, state, tracking, label in rows)
+        return result
+
+    def mark(self, rows: list):
+        """Upsert `(order_id, state, tracking, label, error)` rows."""
+        now = time.time()
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO ledger VALUES (?, ?, ?, ?, ?, ?)",
+                [row + (now,) for row in rows],
+            )
+
+    def forget(self, order_ids: list):
+        """Drop orders known not to be created, they are sent again as new ones."""
+        with self._lock, self._db:
+            self._db.executemany("DELETE FROM ledger WHERE order_id = ?", [(order_id,) for order_id in order_ids])
+
+    def pending(self) -> list:
+        with self._lock:
+            rows = self._db.execute("SELECT order_id FROM ledger WHERE state = ?", (PENDING,)).fetchall()
+        return [row[0] for row in rows]
+
+
+# ===============================
+# MARK: IdempotentCreator
+# ===============================
+class IdempotentCreator:
+    """
+    Make `create_parcel` retries safe by keying every creation on `order_id`.
+
+    Orders already created are answered from the ledger. orders whose last
+    attempt has an unknown outcome (timeout, lost response) are looked up
+    with batched `order_id` queries, and only the missing ones are sent again.
+
+    ...
+
+    Attributes
+    ----------
+        client : YalidineClient
+            The client used to create and look up the parcels.
+        ledger : Ledger | str
+            The ledger or the path of its SQLite file.
+        chunk_size : int
+            The number of parcels per `create_parcel` request.
+        max_workers : int
+            The number of requests sent at the same time.
+        backoff : float
+            The base delay of the retries of the chunks not processed by the api (429).
+    """
+
+    def __init__(
+        self,
+        client,
+        ledger,
+        chunk_size: int = YALIDINE_CREATE_CHUNK_SIZE,
+        max_workers: int = 4,
+        backoff: float = 1.0,
+    ):
+        self.client = client
+        self.ledger = Ledger(ledger) if isinstance(ledger, str) else ledger
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.backoff = backoff
+
+    def reconcile(self, order_ids: list) -> dict:
+        """Look up orders on the api with batched `order_id` queries, record the found trackings."""
+        found = {}
+        for chunk in chunk_ids(order_ids):
+            for parcel in self.client.iter_parcels(
+                ParcelFilter(order_id=",".join(chunk), fields="tracking,order_id,label"),
+                prefetch=False,
+            ):
+                found[str(parcel["order_id"])] = parcel
+
+        self.ledger.mark(
+            [(order_id, CREATED, p.get("tracking"), p.get("label"), None) for order_id, p in found.items()]
+        )
+        return found
+
+    def create(self, parcels: list[Parcel], retries: int = 2) -> dict:
+        """
+        Create the parcels not created yet, return a `BulkResult` per `order_id`.
+
+        The orders with an unknown outcome are reconciled and the missing
+        ones sent again, up to `retries` times. raise a `ValueError` when an
+        `order_id` is missing or repeated, as `bulk_create_parcels`.
+        """
+        parcels = list(parcels)
+        check_order_ids(parcels)
+        results = self._create(parcels)
+        for _ in range(retries):
+            unknown = [
+                p for p in parcels if not results[p.order_id].success and not results[p.order_id].rejected
+            ]
+            if not unknown:
+                break
+            results.update(self._create(unknown))
+        return results
+
+    def _create(self, parcels: list[Parcel]) -> dict:
+        parcels = {p.order_id: p for p in parcels}
+        known = self.ledger.get(list(parcels))
+        results = {}
+
+        unknown = [order_id for order_id, (state, _, _) in known.items() if state == PENDING]
+        found = self.reconcile(unknown) if unknown else {}
+        for order_id, parcel in found.items():
+            results[order_id] = BulkResult(order_id, True, parcel.get("tracking"), parcel.get("label"))
+
+        for order_id, (state, tracking, label) in known.items():
+            if state == CREATED:
+                results[order_id] = BulkResult(order_id, True, tracking, label)
+
+        to_create = [p for order_id, p in parcels.items() if order_id not in results]
+        if not to_create:
+            return results
+
+        self.ledger.mark([(p.order_id, PENDING, None, None, None) for p in to_create])
+        # bulk_create_parcels only retries the chunks which were not processed
+        created = bulk_create_parcels(
+            self.client, to_create, self.chunk_size, self.max_workers, backoff=self.backoff
+        )
+
+        rows, not_created = [], []
+        for order_id, result in created.items():
+            if result.success:
+                rows.append((order_id, CREATED, result.tracking, result.label, None))
+            elif result.rejected:
+                rows.append((order_id, FAILED, None, None, result.error))
+            elif result.retryable:
+                not_created.append(order_id)
+            # else: outcome unknown, the order stays pending
+        self.ledger.mark(rows)
+        self.ledger.forget(not_created)
+
+        results.update(created)
+        return results
+
@@ -0,0 +1,290 @@
+# core
+import csv
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields
+
+try:
+    import openpyxl
+except ImportError:  # pragma: no cover - optional dependency
+    openpyxl = None
+
+# files
+from .settings import YALIDINE_CREATE_CHUNK_SIZE
+from .entity import Parcel
+from .validation import AddressValidator, validate_parcel
+
+
+PARCEL_FIELDS = {f.name for f in fields(Parcel)}
+INT_FIELDS = {"price", "declared_value", "length", "width", "height", "weight"}
+BOOL_FIELDS = {"do_insurance", "freeshipping", "is_stopdesk", "has_exchange"}
+TRUE_VALUES = {"1", "true", "yes", "oui", "y", "o", "x"}
+FALSE_VALUES = {"0", "false", "no", "non", "n", ""}
+
+_DONE = object()
+
+
+# ===============================
+# MARK: Rows
+# ===============================
+def read_rows(path: str):
+    """Yield the rows of a csv or xlsx file as dicts, the first row holds the column names."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            yield from csv.DictReader(f)
+    elif extension in (".xlsx", ".xlsm"):
+        if openpyxl is None:
+            raise ImportError("xlsx imports require openpyxl, run `pip install openpyxl`")
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [str(c).strip() if c is not None else "" for c in next(rows, ())]
+            for values in rows:
+                if values and any(v is not None for v in values):
+                    yield dict(zip(header, values))
+        finally:
+            workbook.close()
+    else:
+        raise ValueError(f"unknown order file format {extension!r}, use csv or xlsx")
+
+
+def _convert(name, value):
+    if isinstance(value, str):
+        value = value.strip()
+    if value is None or value == "":
+        return None
+    if name in INT_FIELDS:
+        return int(float(value))
+    if name in BOOL_FIELDS:
+        if isinstance(value, (bool, int, float)):
+            return bool(value)
+        text = str(value).lower()
+        if text in TRUE_VALUES:
+            return True
+        if text in FALSE_VALUES:
+            return False
+        raise ValueError(value)
+    return str(value)
+
+
+def row_to_parcel(row: dict, columns: dict = None):
+    """
+    Map a row to a `Parcel`, `columns` maps the file's column names to the
+    parcel fields (the columns named like a field are mapped by default).
+    return `(parcel, errors)`, parcel is None when a value can not be converted.
+    """
+    columns = columns or {}
+    values, errors = {}, []
+    for column, value in row.items():
+        name = columns.get(column, column)
+        if name not in PARCEL_FIELDS:
+            continue
+        try:
+            values[name] = _convert(name, value)
+        except (TypeError, ValueError):
+            errors.append(f"{name}: invalid value {value!r}")
+    if errors:
+        return None, errors
+
+    parcel = Parcel(**values)
+    return parcel, validate_parcel(parcel)
+
+
+def _validate_chunk(args):
+    rows, columns = args
+    return [(line, row, *row_to_parcel(row, columns)) for line, row in rows]
+
+
+# ===============================
+# MARK: Import
+# ===============================
+@dataclass
+class ImportReport:
+    """
+    ImportReport object
+
+    ...
+
+    Attributes
+    ----------
+        total : int
+            The number of rows read.
+        rejected : int
+            The rows failing the local validation.
+        created : int
+            The parcels created.
+        failed : int
+            The parcels not created, refused by the api or not processed
+            (eg: 429), they can be fixed and sent again.
+        unknown : int
+            The parcels of unknown outcome (eg: lost response), they may
+            have been created. they are not written to the rejects, check
+            them (see `results`) before sending them again.
+        results : dict
+            The `BulkResult` of every sent parcel, by `order_id`.
+    """
+
+    total: int = 0
+    rejected: int = 0
+    created: int = 0
+    failed: int = 0
+    unknown: int = 0
+    results: dict = field(default_factory=dict)
+
+
+class _Rejects:
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._writer = None
+
+    def write(self, line, row, errors):
+        if self.path is None:
+            return
+        if self._writer is None:
+            self._file = open(self.path, "w", newline="", encoding="utf-8")
+            self._writer = csv.DictWriter(self._file, ["line", "errors", *row], extrasaction="ignore")
+            self._writer.writeheader()
+        self._writer.writerow({**row, "line": line, "errors": "; ".join(map(str, errors))})
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+def import_orders(
+    client,
+    path: str,
+    columns: dict = None,
+    rejects_path: str = None,
+    batch_size: int = YALIDINE_CREATE_CHUNK_SIZE * 4,
+    max_workers: int = 4,
+    processes: int = 0,
+    queue_size: int = 4,
+    dry_run: bool = False,
+    addresses: AddressValidator = None,
+) -> ImportReport:
+    """
+    Stream an order file (csv or xlsx) into `create_parcels_bulk`.
+
+    The rows are read and validated in a background thread (or a pool of
+    `processes` processes for very large files), the valid parcels go
+    through a bounded queue to batched creation, so memory stays flat.
+    invalid rows and parcels refused (or not processed) by the api are
+    written to `rejects_path`, the parcels of unknown outcome are only counted.
+
+    ...
+
+    Parameters
+    ----------
+        columns : dict
+            Maps the file's column names to the `Parcel` fields.
+        batch_size : int
+            The number of parcels per `create_parcels_bulk` call.
+        max_workers : int
+            The number of `create_parcel` requests sent at the same time.
+        processes : int
+            Validate the rows on a process pool, 0 validates in a thread.
+        queue_size : int
+            The number of validated chunks waiting for creation.
+        dry_run : bool
+            Only validate the file, nothing is sent.
+        addresses : AddressValidator
+            Also check the wilayas, communes and stop-desks, the names are corrected.
+    """
+    report = ImportReport()
+    rejects = _Rejects(rejects_path)
+    pending = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+
+    def chunks():
+        chunk = []
+        for line, row in enumerate(read_rows(path), start=2):
+            chunk.append((line, row))
+            if len(chunk) >= batch_size:
+                yield chunk, columns
+                chunk = []
+        if chunk:
+            yield chunk, columns
+
+    def produce():
+        try:
+            if processes:
+                with ProcessPoolExecutor(max_workers=processes) as executor:
+                    # submit a bounded number of chunks, `executor.map` would read the whole file
+                    futures = deque()
+                    for args in chunks():
+                        futures.append(executor.submit(_validate_chunk, args))
+                        if len(futures) >= processes * 2:
+                            pending.put(futures.popleft().result())
+                        if stop.is_set():
+                            break
+                    while futures and not stop.is_set():
+                        pending.put(futures.popleft().result())
+            else:
+                for chunk in map(_validate_chunk, chunks()):
+                    pending.put(chunk)
+                    if stop.is_set():
+                        break
+        except BaseException as e:
+            pending.put(e)
+        finally:
+            pending.put(_DONE)
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+
+    try:
+        while True:
+            chunk = pending.get()
+            if chunk is _DONE:
+                break
+            if isinstance(chunk, BaseException):
+                raise chunk
+
+            valid = {}
+            for line, row, parcel, errors in chunk:
+                report.total += 1
+                if addresses is not None and not errors:
+                    parcel, errors = addresses.check(parcel)
+                if errors:
+                    report.rejected += 1
+                    rejects.write(line, row, errors)
+                elif parcel.order_id in valid or parcel.order_id in report.results:
+                    report.rejected += 1
+                    rejects.write(line, row, ["duplicated order_id"])
+                else:
+                    valid[parcel.order_id] = (line, row, parcel)
+
+            if dry_run or not valid:
+                continue
+
+            results = client.create_parcels_bulk(
+                [parcel for _, _, parcel in valid.values()], max_workers=max_workers
+            )
+            for order_id, result in results.items():
+                report.results[order_id] = result
+                if result.success:
+                    report.created += 1
+                elif result.rejected or result.retryable:
+                    report.failed += 1
+                    line, row, _ = valid[order_id]
+                    rejects.write(line, row, [result.error or "not created"])
+                else:
+                    # may exist already, sending the rejects again would duplicate it
+                    report.unknown += 1
+    finally:
+        stop.set()
+        # unblock the producer if it waits on a full queue
+        while producer.is_alive():
+            try:
+                pending.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        rejects.close()
+
+    return report
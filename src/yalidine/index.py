@@ -0,0 +1,161 @@
+# core
+import difflib
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from functools import lru_cache
+
+
+_SEPARATORS = re.compile(r"[\s\-_'’`.]+")
+
+
+@lru_cache(maxsize=4096)
+def normalize(name: str) -> str:
+    """Accent, case and separator insensitive form of a name: `"Aïn-Bessem"` -> `"ain bessem"`."""
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(c for c in name if not unicodedata.combining(c))
+    return _SEPARATORS.sub(" ", name.casefold()).strip()
+
+
+# ===============================
+# MARK: LocationIndex
+# ===============================
+class LocationIndex:
+    """
+    In-memory index of the wilayas, communes and stop-desks (centers).
+
+    Lookups by id or normalized name are dict accesses, prefix completion is
+    a binary search on the sorted names, nothing hits the network.
+
+    ...
+
+    Attributes
+    ----------
+        wilayas : iterable
+            The records of the `wilayas` endpoint.
+        communes : iterable
+            The records of the `communes` endpoint.
+        centers : iterable
+            The records of the `centers` endpoint.
+    """
+
+    def __init__(self, wilayas=(), communes=(), centers=()):
+        self.wilayas_by_id = {}
+        self.wilayas_by_name = {}
+        self.communes_by_id = {}
+        self.communes_by_name = defaultdict(list)
+        self.communes_by_wilaya = defaultdict(list)
+        self.centers_by_id = {}
+        self.centers_by_commune = defaultdict(list)
+
+        for wilaya in wilayas:
+            self.wilayas_by_id[str(wilaya["id"])] = wilaya
+            self.wilayas_by_name[normalize(wilaya["name"])] = wilaya
+
+        for commune in communes:
+            self.communes_by_id[str(commune["id"])] = commune
+            self.communes_by_name[normalize(commune["name"])].append(commune)
+            self.communes_by_wilaya[str(commune["wilaya_id"])].append(commune)
+
+        for center in centers:
+            self.centers_by_id[str(center["center_id"])] = center
+            self.centers_by_commune[str(center["commune_id"])].append(center)
+
+        self._commune_names = sorted(self.communes_by_name)
+
+    @classmethod
+    def from_store(cls, store):
+        """Build the index from a `ReferenceStore` snapshot."""
+        return cls(store.all("wilayas"), store.all("communes"), store.all("centers"))
+
+    @classmethod
+    def from_client(cls, client):
+        """Build the index by downloading the reference data once."""
+        return cls(client.iter_wilayas(), client.iter_communes(), client.iter_centers())
+
+    # ===============================
+    # MARK: Wilayas
+    # ===============================
+    def wilaya(self, value) -> dict:
+        """Resolve a wilaya by id or by name."""
+        key = str(value).strip()
+        if key.isdigit():
+            return self.wilayas_by_id.get(str(int(key)))
+        return self.wilayas_by_name.get(normalize(key))
+
+    def _wilaya_id(self, wilaya):
+        if wilaya is None:
+            return None
+        found = self.wilaya(wilaya)
+        return None if found is None else str(found["id"])
+
+    # ===============================
+    # MARK: Communes
+    # ===============================
+    def commune(self, name: str, wilaya=None) -> dict:
+        """
+        Resolve a commune by id or exact normalized name, `wilaya` (id or name)
+        narrows homonyms. return None when missing or ambiguous.
+        """
+        key = str(name).strip()
+        if key.isdigit():
+            return self.communes_by_id.get(key)
+
+        candidates = self._in_wilaya(self.communes_by_name.get(normalize(key), ()), wilaya)
+        return candidates[0] if len(candidates) == 1 else None
+
+    def communes_of(self, wilaya) -> list:
+        """The communes of a wilaya (id or name)."""
+        return self.communes_by_wilaya.get(self._wilaya_id(wilaya), [])
+
+    def complete(self, prefix: str, wilaya=None, limit: int = 10) -> list:
+        """The communes whose name starts with `prefix`."""
+        prefix = normalize(prefix)
+        result = []
+        i = bisect_left(self._commune_names, prefix)
+        while i < len(self._commune_names) and self._commune_names[i].startswith(prefix):
+            result.extend(self._in_wilaya(self.communes_by_name[self._commune_names[i]], wilaya))
+            if len(result) >= limit:
+                break
+            i += 1
+        return result[:limit]
+
+    def suggest(self, name: str, wilaya=None, limit: int = 5, cutoff: float = 0.75) -> list:
+        """The communes whose name is close to `name`, to correct typos."""
+        if wilaya is not None:
+            names = {normalize(c["name"]) for c in self.communes_of(wilaya)}
+        else:
+            names = self._commune_names
+        matches = difflib.get_close_matches(normalize(name), names, n=limit, cutoff=cutoff)
+
+        result = []
+        for match in matches:
+            result.extend(self._in_wilaya(self.communes_by_name[match], wilaya))
+        return result[:limit]
+
+    def _in_wilaya(self, communes, wilaya) -> list:
+        wilaya_id = self._wilaya_id(wilaya)
+        if wilaya is None:
+            return list(communes)
+        return [c for c in communes if str(c["wilaya_id"]) == wilaya_id]
+
+    # ===============================
+    # MARK: Stop desks
+    # ===============================
+    def center(self, center_id) -> dict:
+        return self.centers_by_id.get(str(center_id))
+
+    def stopdesks(self, commune) -> list:
+        """The centers of a commune (id or name)."""
+        found = self.commune(commune)
+        if found is None:
+            return []
+        return self.centers_by_commune.get(str(found["id"]), [])
+
+    def stopdesks_of_wilaya(self, wilaya) -> list:
+        return [
+            center
+            for commune in self.communes_of(wilaya)
+            for center in self.centers_by_commune.get(str(commune["id"]), [])
+        ]
@@ -0,0 +1,280 @@
+# core
+import threading
+import time
+from bisect import bisect_left
+
+try:
+    from opentelemetry import trace
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+except ImportError:  # pragma: no cover - optional dependency
+    trace = None
+
+# files
+from .ratelimit import QuotaState
+
+
+# upper bounds of the histogram buckets, the last bucket is unbounded
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+def endpoint_of(path: str) -> str:
+    """Low cardinality label of a request path: `parcels/yal-123?x=1` -> `parcels/{id}`."""
+    path = path.partition("?")[0]
+    segments = [s for s in path.split("/") if s]
+    if not segments:
+        return "/"
+    return segments[0] if len(segments) == 1 else f"{segments[0]}/{{id}}"
+
+
+# ===============================
+# MARK: RequestEvent
+# ===============================
+class RequestEvent:
+    """
+    One http request as seen by the instruments, an attempt of a retried
+    call is a request of its own.
+
+    ...
+
+    Attributes
+    ----------
+        method : str
+        url : str
+        endpoint : str
+            The label of the route, see `endpoint_of`.
+        request_size : int
+            The bytes of the request body.
+        status : int
+            The status code, None on a network error.
+        size : int
+            The bytes of the response body.
+        headers : Mapping
+            The response headers.
+        error : Exception
+            The error of a request without response (network error, cancellation).
+        elapsed : float
+            The seconds between the request and the response.
+        context : dict
+            Free space for the instruments (eg: the OpenTelemetry span).
+    """
+
+    __slots__ = ("method", "url", "endpoint", "request_size", "start", "status", "size", "headers", "error", "elapsed", "context")
+
+    def __init__(self, method: str, url: str, endpoint: str, body=None):
+        self.method = method
+        self.url = url
+        self.endpoint = endpoint
+        self.request_size = len(body) if body else 0
+        self.status = None
+        self.size = 0
+        self.headers = None
+        self.error = None
+        self.elapsed = None
+        self.context = {}
+        self.start = time.perf_counter()
+
+    def finish(self, status=None, headers=None, size=0, error=None):
+        self.elapsed = time.perf_counter() - self.start
+        self.status = status
+        self.headers = headers
+        self.size = size
+        self.error = error
+
+
+def start_request(instruments, method: str, url: str, path: str, body=None) -> RequestEvent:
+    event = RequestEvent(method, url, endpoint_of(path), body)
+    for instrument in instruments:
+        instrument.before_request(event)
+    return event
+
+
+def finish_request(instruments, event: RequestEvent, response=None, error=None):
+    if response is not None:
+        event.finish(response.status_code, response.headers, len(response.content))
+    else:
+        event.finish(error=error)
+    for instrument in instruments:
+        instrument.after_request(event)
+
+
+# ===============================
+# MARK: Instruments
+# ===============================
+class Instrument:
+    """
+    Base of the client instruments, override the hooks you need.
+
+    `before_request` is called right before the request is sent (after the
+    rate limiter), `after_request` once the response is read or the request
+    failed. both run in the thread (or task) of the request, keep them fast.
+    """
+
+    def before_request(self, event: RequestEvent):
+        pass
+
+    def after_request(self, event: RequestEvent):
+        pass
+
+
+class Hooks(Instrument):
+    """Plain callables as an instrument: `Hooks(after=lambda event: print(event.url, event.elapsed))`."""
+
+    def __init__(self, before=None, after=None):
+        self.before = before
+        self.after = after
+
+    def before_request(self, event):
+        if self.before is not None:
+            self.before(event)
+
+    def after_request(self, event):
+        if self.after is not None:
+            self.after(event)
+
+
+class Histogram:
+    """Fixed buckets histogram, `observe` is a binary search and an increment."""
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float):
+        """The upper bound of the bucket holding the `q` quantile, inf past the last bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": dict(zip([*map(str, self.buckets), "inf"], self.counts)),
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+        }
+
+
+class _EndpointStats:
+    __slots__ = ("latency", "size", "errors")
+
+    def __init__(self, latency_buckets, size_buckets):
+        self.latency = Histogram(latency_buckets)
+        self.size = Histogram(size_buckets)
+        self.errors = {}
+
+
+class Metrics(Instrument):
+    """
+    In-process aggregation of the requests, per `METHOD endpoint`: latency and
+    response size histograms and error counters by status (`network` for the
+    connection errors), plus the quota left, the lowest value reported in the
+    current window (concurrent responses arrive in any order).
+
+    ...
+
+    Attributes
+    ----------
+        latency_buckets : tuple
+            The upper bounds of the latency buckets, in seconds.
+        size_buckets : tuple
+            The upper bounds of the size buckets, in bytes.
+        clock : callable
+            Wall clock of the quota windows, in seconds.
+    """
+
+    def __init__(self, latency_buckets: tuple = LATENCY_BUCKETS, size_buckets: tuple = SIZE_BUCKETS, clock=time.time):
+        self.latency_buckets = latency_buckets
+        self.size_buckets = size_buckets
+        self.quota = QuotaState(clock)
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def after_request(self, event):
+        key = f"{event.method} {event.endpoint}"
+        with self._lock:
+            stats = self._endpoints.get(key)
+            if stats is None:
+                stats = self._endpoints[key] = _EndpointStats(self.latency_buckets, self.size_buckets)
+            stats.latency.observe(event.elapsed)
+            if event.status is None:
+                stats.errors["network"] = stats.errors.get("network", 0) + 1
+                return
+            stats.size.observe(event.size)
+            if event.status >= 400:
+                stats.errors[event.status] = stats.errors.get(event.status, 0) + 1
+        self.quota.update(event.headers)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "endpoints": {
+                    key: {
+                        "latency": stats.latency.to_dict(),
+                        "size": stats.size.to_dict(),
+                        "errors": dict(stats.errors),
+                    }
+                    for key, stats in self._endpoints.items()
+                },
+                "quota": self.quota.remaining(),
+            }
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+        self.quota = QuotaState(self.quota.clock)
+
+
+class OpenTelemetry(Instrument):
+    """
+    A client span per request (`pip install opentelemetry-api`), with the
+    http semantic convention attributes. without an sdk configured the
+    spans are no-ops.
+    """
+
+    def __init__(self, tracer_provider=None):
+        if trace is None:
+            raise ImportError("the OpenTelemetry instrument requires opentelemetry-api, run `pip install opentelemetry-api`")
+        self.tracer = trace.get_tracer("yalidine", tracer_provider=tracer_provider)
+
+    def before_request(self, event):
+        event.context["span"] = self.tracer.start_span(
+            f"{event.method} {event.endpoint}",
+            kind=SpanKind.CLIENT,
+            attributes={
+                "http.request.method": event.method,
+                "url.full": event.url,
+                "http.route": event.endpoint,
+                "http.request.body.size": event.request_size,
+            },
+        )
+
+    def after_request(self, event):
+        span = event.context.pop("span", None)
+        if span is None:
+            return
+        if event.error is not None:
+            span.record_exception(event.error)
+            span.set_status(Status(StatusCode.ERROR, type(event.error).__name__))
+        else:
+            span.set_attribute("http.response.status_code", event.status)
+            span.set_attribute("http.response.body.size", event.size)
+            if event.status >= 400:
+                span.set_status(Status(StatusCode.ERROR))
+        span.end()
@@ -0,0 +1,175 @@
+# core
+import sys
+
+
+# ===============================
+# MARK: Record
+# ===============================
+class Record:
+    """
+    Compact, `__slots__` based form of an api record.
+
+    A record has no per-instance `__dict__`, the repeated strings (statuses,
+    wilaya and commune names) are interned so the rows share them, and the
+    keys unknown to the model are kept in `extra` (None when there is none).
+    """
+
+    __slots__ = ("extra",)
+    _fields = ()
+    _field_set = frozenset()
+    _interned = frozenset()
+
+    def __init__(self, **kwargs):
+        for name in self._fields:
+            setattr(self, name, kwargs.pop(name, None))
+        self.extra = kwargs or None
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        record = cls.__new__(cls)
+        get = data.get
+        interned = cls._interned
+        for name in cls._fields:
+            value = get(name)
+            if name in interned and type(value) is str:
+                value = sys.intern(value)
+            setattr(record, name, value)
+
+        unknown = data.keys() - cls._field_set
+        record.extra = {key: data[key] for key in unknown} if unknown else None
+        return record
+
+    def to_dict(self) -> dict:
+        data = {name: getattr(self, name) for name in self._fields}
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = cls.__slots__
+        cls._field_set = frozenset(cls.__slots__)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields[:3])
+        return f"{type(self).__name__}({fields}, ...)"
+
+
+# ===============================
+# MARK: Models
+# ===============================
+class ParcelRecord(Record):
+    """A row of the `parcels` endpoint."""
+
+    __slots__ = (
+        "tracking",
+        "order_id",
+        "firstname",
+        "familyname",
+        "contact_phone",
+        "address",
+        "is_stopdesk",
+        "stopdesk_id",
+        "stopdesk_name",
+        "from_wilaya_id",
+        "from_wilaya_name",
+        "to_commune_id",
+        "to_commune_name",
+        "to_wilaya_id",
+        "to_wilaya_name",
+        "product_list",
+        "price",
+        "do_insurance",
+        "declared_value",
+        "delivery_fee",
+        "freeshipping",
+        "import_id",
+        "date_creation",
+        "date_expedition",
+        "date_last_status",
+        "last_status",
+        "length",
+        "width",
+        "height",
+        "weight",
+        "payment_status",
+        "payment_id",
+        "has_exchange",
+        "product_to_collect",
+        "label",
+    )
+    _interned = frozenset(
+        {
+            "stopdesk_name",
+            "from_wilaya_name",
+            "to_commune_name",
+            "to_wilaya_name",
+            "last_status",
+            "payment_status",
+        }
+    )
+
+
+class HistoryEvent(Record):
+    """A row of the `histories` endpoint."""
+
+    __slots__ = (
+        "date_status",
+        "tracking",
+        "status",
+        "reason",
+        "center_id",
+        "center_name",
+        "wilaya_id",
+        "wilaya_name",
+        "commune_id",
+        "commune_name",
+    )
+    _interned = frozenset({"status", "reason", "center_name", "wilaya_name", "commune_name"})
+
+
+class Commune(Record):
+    """A row of the `communes` endpoint."""
+
+    __slots__ = (
+        "id",
+        "name",
+        "wilaya_id",
+        "wilaya_name",
+        "has_stop_desk",
+        "is_deliverable",
+        "delivery_time_parcel",
+        "delivery_time_payment",
+    )
+    _interned = frozenset({"wilaya_name"})
+
+
+class Wilaya(Record):
+    """A row of the `wilayas` endpoint."""
+
+    __slots__ = ("id", "name", "zone", "is_deliverable")
+
+
+class Center(Record):
+    """A row of the `centers` endpoint."""
+
+    __slots__ = (
+        "center_id",
+        "name",
+        "address",
+        "gps",
+        "commune_id",
+        "commune_name",
+        "wilaya_id",
+        "wilaya_name",
+    )
+    _interned = frozenset({"commune_name", "wilaya_name"})
+
+
+class DeliveryFee(Record):
+    """A row of the `deliveryfees` endpoint."""
+
+    __slots__ = ("wilaya_id", "wilaya_name", "home_fee", "desk_fee")
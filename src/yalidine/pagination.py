@@ -0,0 +1,252 @@
+# core
+import asyncio
+import math
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import replace
+
+# files
+from .settings import YALIDINE_MAX_PAGE_SIZE
+
+
+def _first_page_filter(filter):
+    page = filter.page or 1
+    page_size = filter.page_size or YALIDINE_MAX_PAGE_SIZE
+    return replace(filter, page=page, page_size=page_size)
+
+
+def _remaining_pages(filter, first_page):
+    """Page numbers left after `first_page`, None when `total_data` is unknown."""
+    total = first_page.get("total_data")
+    if total is None:
+        return None
+    last = math.ceil(total / filter.page_size)
+    return range(filter.page + 1, last + 1)
+
+
+# ===============================
+# MARK: Sync
+# ===============================
+def iter_pages(fetch, filter, prefetch: bool = True):
+    """
+    Yield every page of a listing endpoint, starting from `filter.page`.
+
+    ...
+
+    Parameters
+    ----------
+        fetch : callable
+            The listing method of the client (eg: `client.get_parcels`).
+        filter : dataclass
+            The filter of the listing, `page_size` defaults to the maximum.
+        prefetch : bool
+            Request the next page in the background while the current one is
+            consumed. at most two pages are held in memory.
+    """
+    filter = _first_page_filter(filter)
+
+    if not prefetch:
+        while True:
+            page = fetch(filter)
+            yield page
+            if not page.get("has_more"):
+                return
+            filter = replace(filter, page=filter.page + 1)
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    future = None
+    try:
+        future = executor.submit(fetch, filter)
+        while True:
+            page = future.result()
+            future = None
+            if page.get("has_more"):
+                filter = replace(filter, page=filter.page + 1)
+                future = executor.submit(fetch, filter)
+            yield page
+            if future is None:
+                return
+    finally:
+        if future is not None:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def iter_records(fetch, filter, prefetch: bool = True, model=None):
+    """
+    Yield the records of every page of a listing endpoint, see `iter_pages`.
+    when `model` is given (eg: `models.ParcelRecord`), the rows are converted
+    one by one as they are consumed.
+    """
+    for page in iter_pages(fetch, filter, prefetch):
+        if model is None:
+            yield from page.get("data", [])
+        else:
+            yield from map(model.from_dict, page.get("data", []))
+
+
+def scan_pages(fetch, filter, max_workers: int = 4, ordered: bool = True):
+    """
+    Yield every page of a listing endpoint, fetching them in parallel.
+
+    The first page gives `total_data`, the remaining pages are then requested
+    at once on a pool of `max_workers` threads. pass a client with a
+    `rate_limiter` to keep the fan-out under the api quotas.
+
+    ...
+
+    Parameters
+    ----------
+        fetch : callable
+            The listing method of the client (eg: `client.get_parcels`).
+        filter : dataclass
+            The filter of the listing, `page_size` defaults to the maximum.
+        max_workers : int
+            The number of pages requested at the same time.
+        ordered : bool
+            Yield the pages in page order, if `False` they are yielded as
+            soon as they arrive.
+    """
+    filter = _first_page_filter(filter)
+    first = fetch(filter)
+    yield first
+    if not first.get("has_more"):
+        return
+
+    pages = _remaining_pages(filter, first)
+    if pages is None:
+        yield from iter_pages(fetch, replace(filter, page=filter.page + 1))
+        return
+
+    pages = iter(pages)
+    # bound the pages held in memory to twice the number of workers
+    window = max_workers * 2
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = deque()
+    try:
+        for number in pages:
+            pending.append(executor.submit(fetch, replace(filter, page=number)))
+            if len(pending) >= window:
+                break
+
+        while pending:
+            if ordered:
+                future = pending.popleft()
+                page = future.result()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                future = done.pop()
+                pending.remove(future)
+                page = future.result()
+
+            number = next(pages, None)
+            if number is not None:
+                pending.append(executor.submit(fetch, replace(filter, page=number)))
+            yield page
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def scan_records(fetch, filter, max_workers: int = 4, ordered: bool = True, model=None):
+    """Yield the records of every page fetched in parallel, see `scan_pages` and `iter_records`."""
+    for page in scan_pages(fetch, filter, max_workers, ordered):
+        if model is None:
+            yield from page.get("data", [])
+        else:
+            yield from map(model.from_dict, page.get("data", []))
+
+
+# ===============================
+# MARK: Async
+# ===============================
+async def aiter_pages(fetch, filter, prefetch: bool = True):
+    """Async counterpart of `iter_pages`, `fetch` is a coroutine function."""
+    filter = _first_page_filter(filter)
+
+    if not prefetch:
+        while True:
+            page = await fetch(filter)
+            yield page
+            if not page.get("has_more"):
+                return
+            filter = replace(filter, page=filter.page + 1)
+
+    task = None
+    try:
+        task = asyncio.ensure_future(fetch(filter))
+        while True:
+            page = await task
+            task = None
+            if page.get("has_more"):
+                filter = replace(filter, page=filter.page + 1)
+                task = asyncio.ensure_future(fetch(filter))
+            yield page
+            if task is None:
+                return
+    finally:
+        if task is not None:
+            task.cancel()
+
+
+async def aiter_records(fetch, filter, prefetch: bool = True, model=None):
+    """Async counterpart of `iter_records`."""
+    async for page in aiter_pages(fetch, filter, prefetch):
+        for record in page.get("data", []):
+            yield record if model is None else model.from_dict(record)
+
+
+async def ascan_pages(fetch, filter, max_workers: int = 4, ordered: bool = True):
+    """Async counterpart of `scan_pages`, `fetch` is a coroutine function."""
+    filter = _first_page_filter(filter)
+    first = await fetch(filter)
+    yield first
+    if not first.get("has_more"):
+        return
+
+    pages = _remaining_pages(filter, first)
+    if pages is None:
+        async for page in aiter_pages(fetch, replace(filter, page=filter.page + 1)):
+            yield page
+        return
+
+    # `max_workers` requests in flight, the rest of the window holds the pages fetched ahead
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def fetch_page(number):
+        async with semaphore:
+            return await fetch(replace(filter, page=number))
+
+    pages = iter(pages)
+    window = max_workers * 2
+    pending = deque()
+    try:
+        for number in pages:
+            pending.append(asyncio.ensure_future(fetch_page(number)))
+            if len(pending) >= window:
+                break
+
+        while pending:
+            if ordered:
+                task = pending.popleft()
+            else:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                task = done.pop()
+                pending.remove(task)
+            page = await task
+
+            number = next(pages, None)
+            if number is not None:
+                pending.append(asyncio.ensure_future(fetch_page(number)))
+            yield page
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def ascan_records(fetch, filter, max_workers: int = 4, ordered: bool = True, model=None):
+    """Async counterpart of `scan_records`."""
+    async for page in ascan_pages(fetch, filter, max_workers, ordered):
+        for record in page.get("data", []):
+            yield record if model is None else model.from_dict(record)
@@ -0,0 +1,226 @@
+# core
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+# files
+from .entity import HistoryFilter
+
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+
+# the parcel will not move anymore, stop polling it
+TERMINAL_STATUSES = {
+    "Livré",
+    "Retourné au vendeur",
+    "Echange échoué",
+}
+
+# status -> seconds before the next check
+DEFAULT_INTERVALS = {
+    # with the courier, the status may change any minute
+    "Sorti en livraison": 15 * MINUTE,
+    "En attente du client": 15 * MINUTE,
+    "Tentative échouée": 30 * MINUTE,
+    "En alerte": 30 * MINUTE,
+    "Alerte résolue": 30 * MINUTE,
+    "Retour à retirer": 30 * MINUTE,
+    # not shipped yet
+    "Pas encore expédié": 6 * HOUR,
+    "A vérifier": 6 * HOUR,
+    "En préparation": 6 * HOUR,
+    "Pas encore ramassé": 6 * HOUR,
+    "Prêt à expédier": 6 * HOUR,
+}
+
+# in transit
+DEFAULT_INTERVAL = 2 * HOUR
+
+logger = logging.getLogger(__name__)
+
+
+# ===============================
+# MARK: TrackingPoller
+# ===============================
+class TrackingPoller:
+    """
+    Poll the open parcels at a pace depending on their last status.
+
+    The trackings are kept in a priority queue ordered by their next check
+    time. due trackings are checked together with multi-tracking `histories`
+    requests, and the next check is scheduled from the new status (fast while
+    out for delivery, slow while in transit, never once terminal). a failed
+    check is retried after `retry_delay` seconds, doubled on each failure in
+    a row, whatever the status.
+
+    ...
+
+    Attributes
+    ----------
+        client : YalidineClient
+            The client used to fetch the histories.
+        on_change : callable
+            Called with `(tracking, event, previous_status)` when the last
+            status of a parcel changes.
+        intervals : dict
+            Seconds before the next check per status, defaults to `DEFAULT_INTERVALS`.
+        default_interval : float
+            Seconds before the next check of the statuses missing from `intervals`.
+        batch_size : int
+            The maximum number of trackings checked per poll.
+        retry_delay : float
+            Seconds before the first retry of a failed check.
+        max_retry_delay : float
+            The maximum seconds between the retries of a failed check.
+        clock : callable
+            Clock in seconds.
+    """
+
+    def __init__(
+        self,
+        client,
+        on_change=None,
+        intervals: dict = None,
+        default_interval: float = DEFAULT_INTERVAL,
+        batch_size: int = 500,
+        retry_delay: float = 30,
+        max_retry_delay: float = 15 * MINUTE,
+        clock=time.time,
+    ):
+        self.client = client
+        self.on_change = on_change
+        self.intervals = dict(DEFAULT_INTERVALS, **(intervals or {}))
+        self.default_interval = default_interval
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.clock = clock
+        self.statuses = {}
+        # tracking -> failed checks in a row
+        self._failures = {}
+        self._heap = []
+        # tracking -> sequence of its live heap entry, older entries are skipped
+        self._entries = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def interval(self, status: str) -> float:
+        return self.intervals.get(status, self.default_interval)
+
+    def add(self, tracking: str, status: str = None, due: float = None):
+        """Watch `tracking`, checked at `due` (now by default)."""
+        if status in TERMINAL_STATUSES:
+            return
+        with self._lock:
+            self.statuses[tracking] = status
+            self._schedule(tracking, self.clock() if due is None else due)
+
+    def remove(self, tracking: str):
+        with self._lock:
+            self._entries.pop(tracking, None)
+            self.statuses.pop(tracking, None)
+            self._failures.pop(tracking, None)
+
+    def next_due(self) -> float:
+        """The time of the next check, None when nothing is watched."""
+        with self._lock:
+            self._drop_stale()
+            return self._heap[0][0] if self._heap else None
+
+    def _schedule(self, tracking, due):
+        sequence = next(self._counter)
+        self._entries[tracking] = sequence
+        heapq.heappush(self._heap, (due, sequence, tracking))
+
+    def _drop_stale(self):
+        while self._heap and self._entries.get(self._heap[0][2]) != self._heap[0][1]:
+            heapq.heappop(self._heap)
+
+    def _pop_due(self, now) -> list:
+        due = []
+        with self._lock:
+            while len(due) < self.batch_size:
+                self._drop_stale()
+                if not self._heap or self._heap[0][0] > now:
+                    break
+                _, _, tracking = heapq.heappop(self._heap)
+                del self._entries[tracking]
+                due.append(tracking)
+        return due
+
+    def poll_once(self) -> int:
+        """Check the due trackings, return how many were checked."""
+        now = self.clock()
+        trackings = self._pop_due(now)
+        if not trackings:
+            return 0
+
+        try:
+            histories = self.client.get_histories_by_tracking(
+                trackings, HistoryFilter(fields="tracking,status,date_status,reason")
+            )
+        except Exception:
+            self._retry_later(trackings, now)
+            raise
+
+        # the trackings of a failed chunk are retried later, the others are checked
+        failed = [tracking for tracking in trackings if tracking in histories.errors]
+        if failed:
+            logger.warning("checking %d trackings failed, retrying later: %s", len(failed), histories.errors[failed[0]])
+            self._retry_later(failed, now)
+
+        for tracking in trackings:
+            if tracking in histories.errors:
+                continue
+            events = histories.get(tracking) or []
+            latest = max(events, key=lambda e: e.get("date_status") or "", default=None)
+            previous = self.statuses.get(tracking)
+            status = previous if latest is None else latest.get("status")
+
+            if latest is not None and status != previous and self.on_change is not None:
+                self.on_change(tracking, latest, previous)
+
+            with self._lock:
+                if tracking not in self.statuses:
+                    # removed while being checked
+                    continue
+                self._failures.pop(tracking, None)
+                if status in TERMINAL_STATUSES:
+                    del self.statuses[tracking]
+                    continue
+                self.statuses[tracking] = status
+                self._schedule(tracking, now + self.interval(status))
+
+        return len(trackings) - len(failed)
+
+    def _retry_later(self, trackings, now):
+        with self._lock:
+            for tracking in trackings:
+                if tracking not in self.statuses:
+                    continue
+                failures = self._failures.get(tracking, 0)
+                self._failures[tracking] = failures + 1
+                delay = min(self.retry_delay * 2 ** failures, self.max_retry_delay)
+                self._schedule(tracking, now + delay)
+
+    def run(self, stop: threading.Event = None, max_sleep: float = 60):
+        """Poll until `stop` is set, sleeping until the next tracking is due."""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            try:
+                checked = self.poll_once()
+            except Exception:
+                # the failed batch was rescheduled by poll_once
+                logger.exception("checking the due trackings failed, retrying later")
+                checked = 0
+            if checked:
+                continue
+            next_due = self.next_due()
+            delay = max_sleep if next_due is None else next_due - self.clock()
+            stop.wait(min(max(delay, 0), max_sleep))
@@ -0,0 +1,190 @@
+# core
+import math
+from dataclasses import dataclass
+
+# files
+from .entity import Parcel
+from .index import normalize
+
+
+# ===============================
+# MARK: QuoteRules
+# ===============================
+@dataclass
+class QuoteRules:
+    """
+    QuoteRules object
+
+    The pricing rules applied on top of the delivery fee of the wilaya.
+
+    ...
+
+    Attributes
+    ----------
+        free_weight : float
+            The weight in kg included in the delivery fee.
+        overweight_fee : int
+            The fee per extra kg above `free_weight`.
+        volumetric_divisor : int
+            The volumetric weight is `length * width * height / volumetric_divisor`
+            (cm³ per kg), the billed weight is the largest of both weights.
+        insurance_rate : float
+            The part of `declared_value` charged when `do_insurance` is true.
+    """
+
+    free_weight: float = 5
+    overweight_fee: int = 50
+    volumetric_divisor: int = 5000
+    insurance_rate: float = 0.0
+
+
+@dataclass
+class Quote:
+    """
+    Quote object
+
+    ...
+
+    Attributes
+    ----------
+        delivery_fee : int
+            The home or stop-desk fee of the destination wilaya.
+        overweight_fee : int
+            The fee of the billed weight above the free weight.
+        insurance_fee : int
+            The insurance fee of the declared value.
+        total : int
+            The sum of the fees.
+    """
+
+    delivery_fee: int
+    overweight_fee: int
+    insurance_fee: int
+    total: int
+
+
+# ===============================
+# MARK: FeeQuoter
+# ===============================
+class FeeQuoter:
+    """
+    Compute delivery fees locally from a cached copy of the `deliveryfees` grid.
+
+    Records carrying a `from_wilaya_id` are priced per (origin, destination),
+    the others apply to every origin.
+
+    ...
+
+    Attributes
+    ----------
+        fees : iterable
+            The records of the `deliveryfees` endpoint
+            (`wilaya_id`, `wilaya_name`, `home_fee`, `desk_fee`).
+        rules : QuoteRules
+            The weight and insurance rules.
+        index : LocationIndex
+            Optional, resolves the destination wilaya from the commune when
+            the wilaya is missing.
+    """
+
+    def __init__(self, fees, rules: QuoteRules = None, index=None):
+        self.rules = rules or QuoteRules()
+        self.index = index
+        self._fees = {}
+        self._wilaya_ids = {}
+        for record in fees:
+            wilaya_id = str(record["wilaya_id"])
+            origin = record.get("from_wilaya_id")
+            origin = None if origin is None else str(origin)
+            self._fees[(origin, wilaya_id)] = (int(record["home_fee"]), int(record["desk_fee"]))
+            if record.get("wilaya_name"):
+                self._wilaya_ids[normalize(record["wilaya_name"])] = wilaya_id
+
+    @classmethod
+    def from_store(cls, store, rules: QuoteRules = None, index=None):
+        return cls(store.all("deliveryfees"), rules, index)
+
+    @classmethod
+    def from_client(cls, client, rules: QuoteRules = None, index=None):
+        return cls(client.iter_delivery_fees(), rules, index)
+
+    def _resolve_wilaya(self, wilaya, commune=None):
+        if wilaya is not None:
+            key = str(wilaya).strip()
+            if key.isdigit():
+                return str(int(key))
+            if normalize(key) in self._wilaya_ids:
+                return self._wilaya_ids[normalize(key)]
+        if commune is not None and self.index is not None:
+            found = self.index.commune(commune, wilaya=wilaya)
+            if found is not None:
+                return str(found["wilaya_id"])
+        raise KeyError(f"unknown destination wilaya={wilaya!r} commune={commune!r}")
+
+    def quote(
+        self,
+        to_wilaya=None,
+        to_commune=None,
+        is_stopdesk: bool = False,
+        weight: float = 0,
+        length: float = 0,
+        width: float = 0,
+        height: float = 0,
+        do_insurance: bool = False,
+        declared_value: int = 0,
+        from_wilaya=None,
+    ) -> Quote:
+        """Price one shipment, wilayas are ids or names. raise KeyError on an unknown destination."""
+        to_wilaya_id = self._resolve_wilaya(to_wilaya, to_commune)
+        origin = None
+        if from_wilaya is not None:
+            try:
+                origin = self._resolve_wilaya(from_wilaya)
+            except KeyError:
+                pass
+
+        fees = self._fees.get((origin, to_wilaya_id)) or self._fees.get((None, to_wilaya_id))
+        if fees is None:
+            raise KeyError(f"no delivery fee for wilaya {to_wilaya_id}")
+
+        rules = self.rules
+        delivery_fee = fees[1] if is_stopdesk else fees[0]
+
+        billed = max(weight or 0, (length or 0) * (width or 0) * (height or 0) / rules.volumetric_divisor)
+        extra = math.ceil(billed - rules.free_weight) if billed > rules.free_weight else 0
+        overweight_fee = extra * rules.overweight_fee
+
+        insurance_fee = math.ceil((declared_value or 0) * rules.insurance_rate) if do_insurance else 0
+
+        return Quote(
+            delivery_fee=delivery_fee,
+            overweight_fee=overweight_fee,
+            insurance_fee=insurance_fee,
+            total=delivery_fee + overweight_fee + insurance_fee,
+        )
+
+    def quote_parcel(self, parcel: Parcel) -> Quote:
+        return self.quote(
+            to_wilaya=parcel.to_wilaya_name,
+            to_commune=parcel.to_commune_name,
+            is_stopdesk=bool(parcel.is_stopdesk),
+            weight=parcel.weight,
+            length=parcel.length,
+            width=parcel.width,
+            height=parcel.height,
+            do_insurance=bool(parcel.do_insurance),
+            declared_value=parcel.declared_value,
+            from_wilaya=parcel.from_wilaya_name,
+        )
+
+    def quote_many(self, parcels) -> list:
+        """Price a batch of parcels, unknown destinations give None instead of raising."""
+        quote_parcel = self.quote_parcel
+        result = []
+        append = result.append
+        for parcel in parcels:
+            try:
+                append(quote_parcel(parcel))
+            except KeyError:
+                append(None)
+        return result
@@ -0,0 +1,200 @@
+# core
+import threading
+import time
+
+
+# window name -> (period in seconds, response header holding the quota left)
+QUOTA_WINDOWS = {
+    "second": (1, "x-second-quota-left"),
+    "minute": (60, "x-minute-quota-left"),
+    "hour": (3600, "x-hour-quota-left"),
+    "day": (86400, "x-day-quota-left"),
+}
+
+# default Yalidine api limits
+DEFAULT_QUOTAS = {
+    "second": 5,
+    "minute": 50,
+    "hour": 1000,
+    "day": 10000,
+}
+
+
+class _Bucket:
+    __slots__ = ("limit", "period", "header", "tokens", "remaining", "updated_at")
+
+    def __init__(self, limit, period, header, now):
+        self.limit = limit
+        self.period = period
+        self.header = header
+        self.tokens = float(limit)
+        self.remaining = None
+        self.updated_at = now
+
+    @property
+    def rate(self):
+        return self.limit / self.period
+
+    def refill(self, now):
+        self.tokens = min(self.limit, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+
+# ===============================
+# MARK: QuotaScheduler
+# ===============================
+class QuotaScheduler:
+    """
+    Token bucket pacing requests under every Yalidine quota window at once.
+
+    Each call to `reserve` takes one token from every window and returns how
+    long the caller has to wait before sending, tokens may go negative so
+    concurrent callers queue up behind each other instead of racing.
+    `update` re-syncs the buckets with the quota headers of each response.
+
+    The scheduler is thread safe and never blocks while holding its lock, so
+    one instance can be shared by threaded and async clients.
+
+    ...
+
+    Attributes
+    ----------
+        quotas : dict
+            The number of requests allowed per window
+            (`second`, `minute`, `hour`, `day`), defaults to `DEFAULT_QUOTAS`.
+        clock : callable
+            Monotonic clock, in seconds.
+    """
+
+    def __init__(self, quotas: dict = None, clock=time.monotonic):
+        quotas = dict(DEFAULT_QUOTAS if quotas is None else quotas)
+        self.clock = clock
+        now = clock()
+        self._buckets = {
+            name: _Bucket(limit, QUOTA_WINDOWS[name][0], QUOTA_WINDOWS[name][1], now)
+            for name, limit in quotas.items()
+        }
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one request from every window, return the delay in seconds before sending it."""
+        with self._lock:
+            now = self.clock()
+            delay = 0.0
+            for bucket in self._buckets.values():
+                bucket.refill(now)
+                bucket.tokens -= 1
+                if bucket.tokens < 0:
+                    delay = max(delay, -bucket.tokens / bucket.rate)
+            return delay
+
+    def acquire(self):
+        """Block the current thread until a request may be sent."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        """Wait, without blocking the event loop, until a request may be sent."""
+        import asyncio
+
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def update(self, headers):
+        """Sync the buckets with the quota left reported by the api."""
+        if not headers:
+            return
+
+        with self._lock:
+            now = self.clock()
+            for bucket in self._buckets.values():
+                value = headers.get(bucket.header)
+                if value is None:
+                    continue
+                try:
+                    remaining = int(value)
+                except ValueError:
+                    continue
+                bucket.refill(now)
+                bucket.remaining = remaining
+                # the server is the source of truth when it saw more requests
+                # than we did (other processes sharing the same api key).
+                bucket.tokens = min(bucket.tokens, remaining)
+
+    def metrics(self) -> dict:
+        """Remaining quota per window."""
+        with self._lock:
+            now = self.clock()
+            result = {}
+            for name, bucket in self._buckets.items():
+                bucket.refill(now)
+                result[name] = {
+                    "limit": bucket.limit,
+                    "remaining": bucket.remaining,
+                    "tokens": max(bucket.tokens, 0.0),
+                }
+            return result
+
+
+def quota_of(headers) -> dict:
+    """The quota left per window reported by the headers of a response."""
+    result = {}
+    if not headers:
+        return result
+    for name, (_, header) in QUOTA_WINDOWS.items():
+        value = headers.get(header)
+        if value is not None and value.isdigit():
+            result[name] = int(value)
+    return result
+
+
+# ===============================
+# MARK: QuotaState
+# ===============================
+class QuotaState:
+    """
+    Thread safe aggregate of the quota left reported by concurrent responses.
+
+    Responses of concurrent requests arrive in any order, so the most
+    recent response is not the most recent quota. within a window the quota
+    only goes down, the state keeps the lowest value seen in the current
+    window (windows aligned on the clock) and starts over in the next one.
+
+    ...
+
+    Attributes
+    ----------
+        clock : callable
+            Wall clock, in seconds.
+    """
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        # window name -> (window number, quota left)
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def update(self, headers):
+        quota = quota_of(headers)
+        if not quota:
+            return
+
+        now = self.clock()
+        with self._lock:
+            for name, remaining in quota.items():
+                window = int(now // QUOTA_WINDOWS[name][0])
+                current = self._windows.get(name)
+                if current is None or current[0] != window or remaining < current[1]:
+                    self._windows[name] = (window, remaining)
+
+    def remaining(self) -> dict:
+        """The quota left per window, the windows already over are left out."""
+        now = self.clock()
+        with self._lock:
+            return {
+                name: remaining
+                for name, (window, remaining) in self._windows.items()
+                if window == int(now // QUOTA_WINDOWS[name][0])
+            }
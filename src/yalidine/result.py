@@ -0,0 +1,77 @@
+# core
+import weakref
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+# files
+from .ratelimit import quota_of
+
+
+# (weak reference to the client, result) of the last call made in the current thread or task
+_last_result = ContextVar("yalidine_last_result", default=(None, None))
+
+
+# ===============================
+# MARK: ApiResult
+# ===============================
+@dataclass
+class ApiResult:
+    """
+    ApiResult object
+
+    The decoded response of one call with its own metadata, unlike the
+    client attributes it is not overwritten by concurrent calls.
+
+    ...
+
+    Attributes
+    ----------
+        data : Any
+            The decoded response.
+        status : int
+            The status code, None when served from the cache.
+        headers : Mapping
+            The response headers.
+        quota : dict
+            The quota left per window reported by this response.
+        elapsed : float
+            The seconds between the request and the response headers.
+        cached : bool
+            Whether the data was served by the client cache.
+    """
+
+    data: Any
+    status: Optional[int] = None
+    headers: Any = None
+    quota: dict = field(default_factory=dict)
+    elapsed: float = 0.0
+    cached: bool = False
+
+
+def record_result(client, data, response=None) -> ApiResult:
+    """
+    Keep the result of a call for `last_result`, visible to the current
+    thread (or task) only. without a response the data came from the cache.
+    """
+    if response is None:
+        result = ApiResult(data, cached=True)
+    else:
+        result = ApiResult(
+            data,
+            response.status_code,
+            response.headers,
+            quota_of(response.headers),
+            response.elapsed.total_seconds(),
+        )
+    _last_result.set((weakref.ref(client), result))
+    return result
+
+
+def last_result(client) -> Optional[ApiResult]:
+    owner, result = _last_result.get()
+    return result if owner is not None and owner() is client else None
+
+
+def reset_result():
+    _last_result.set((None, None))
@@ -0,0 +1,168 @@
+# core
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+# lib
+import requests
+
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """The circuit breaker is open, the request was not sent."""
+
+
+# ===============================
+# MARK: RetryPolicy
+# ===============================
+@dataclass
+class RetryPolicy:
+    """
+    RetryPolicy object
+
+    ...
+
+    Attributes
+    ----------
+        max_retries : int
+            The number of retries after the first attempt.
+        backoff_factor : float
+            The delay before the n-th retry is `backoff_factor * 2 ** n` seconds.
+        max_backoff : float
+            The upper bound of a delay in seconds.
+        jitter : bool
+            Pick a random delay between 0 and the backoff (full jitter).
+        retry_statuses : tuple
+            The status codes retried.
+        retry_post : bool
+            Retry the non idempotent requests (POST, PATCH) too. a retried
+            `create_parcel` may create duplicates.
+    """
+
+    max_retries: int = 3
+    backoff_factor: float = 0.5
+    max_backoff: float = 30
+    jitter: bool = True
+    retry_statuses: tuple = (429, 500, 502, 503, 504)
+    retry_post: bool = False
+    retries: int = field(default=0, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def retry_after(self, method: str, attempt: int, response=None) -> Optional[float]:
+        """
+        The delay in seconds before retrying the failed `attempt` (0 based),
+        None when it must not be retried. `response` is None on a
+        connection error.
+        """
+        if attempt >= self.max_retries:
+            return None
+        if method.upper() not in IDEMPOTENT_METHODS and not self.retry_post:
+            return None
+        if response is not None and response.status_code not in self.retry_statuses:
+            return None
+
+        with self._lock:
+            self.retries += 1
+        return self._delay(attempt, response)
+
+    def _delay(self, attempt, response) -> float:
+        if response is not None:
+            headers = response.headers
+            retry_after = headers.get("retry-after")
+            if retry_after is not None:
+                try:
+                    return min(float(retry_after), self.max_backoff)
+                except ValueError:
+                    pass
+            if headers.get("x-second-quota-left") == "0":
+                return 1.0
+            if headers.get("x-minute-quota-left") == "0":
+                return min(60.0, self.max_backoff)
+
+        backoff = min(self.backoff_factor * 2**attempt, self.max_backoff)
+        return random.uniform(0, backoff) if self.jitter else backoff
+
+
+# ===============================
+# MARK: CircuitBreaker
+# ===============================
+class CircuitBreaker:
+    """
+    Fail fast while the api is down.
+
+    After `failure_threshold` consecutive failures (connection errors and 5xx)
+    the circuit opens and requests raise `CircuitOpenError` without being
+    sent. after `reset_timeout` seconds one probe request is let through
+    (half-open), its success closes the circuit and its failure re-opens it.
+    a probe without outcome after `reset_timeout` seconds is given up and
+    another one is let through, a cancelled probe is given up at once.
+
+    ...
+
+    Attributes
+    ----------
+        failure_threshold : int
+            The consecutive failures opening the circuit.
+        reset_timeout : float
+            Seconds before a probe request is allowed.
+        clock : callable
+            Monotonic clock, in seconds.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.probe_at = None
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            now = self.clock()
+            if self.state == self.OPEN and now - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self.probe_at = now
+                return
+            if self.state == self.HALF_OPEN and (self.probe_at is None or now - self.probe_at >= self.reset_timeout):
+                # the previous probe was abandoned or never reported back
+                self.probe_at = now
+                return
+            self.rejected += 1
+        raise CircuitOpenError("the circuit breaker is open, the api looks down")
+
+    def record(self, status_code: int = None):
+        """Record the outcome of a request, `status_code` is None on a connection error."""
+        failed = status_code is None or status_code >= 500
+        with self._lock:
+            if not failed:
+                self.state = self.CLOSED
+                self.failures = 0
+                return
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+
+    def release(self):
+        """Record a request abandoned without outcome (cancelled), it is neither a success nor a failure."""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.probe_at = None
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {"state": self.state, "failures": self.failures, "rejected": self.rejected}
@@ -1 +1,17 @@
-YALIDINE_URL = "https://api.yalidine.app/v1/"
\ No newline at end of file
+YALIDINE_URL = "https://api.yalidine.app/v1/"
+
+# (connect, read) timeout in seconds applied to every request
+YALIDINE_TIMEOUT = (5, 30)
+
+# connection pool used by the shared http session
+YALIDINE_POOL_CONNECTIONS = 10
+YALIDINE_POOL_MAXSIZE = 10
+
+# the largest `page_size` accepted by the listing endpoints
+YALIDINE_MAX_PAGE_SIZE = 1000
+
+# the number of parcels sent per `create_parcel` request by the bulk helpers
+YALIDINE_CREATE_CHUNK_SIZE = 50
+
+# the maximum length of a comma separated list of ids sent in an url
+YALIDINE_MAX_IDS_LENGTH = 1500
@@ -0,0 +1,598 @@
+# core
+import json
+import random
+import threading
+import time
+from itertools import islice
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl
+
+# files
+from .settings import YALIDINE_MAX_PAGE_SIZE
+from .ratelimit import QUOTA_WINDOWS, DEFAULT_QUOTAS
+from .entity import Parcel
+from .validation import validate_parcel
+
+
+WILAYA_NAMES = (
+    "Adrar", "Chlef", "Laghouat", "Oum El Bouaghi", "Batna", "Béjaïa", "Biskra", "Béchar",
+    "Blida", "Bouira", "Tamanrasset", "Tébessa", "Tlemcen", "Tiaret", "Tizi Ouzou", "Alger",
+    "Djelfa", "Jijel", "Sétif", "Saïda", "Skikda", "Sidi Bel Abbès", "Annaba", "Guelma",
+    "Constantine", "Médéa", "Mostaganem", "M'Sila", "Mascara", "Ouargla", "Oran", "El Bayadh",
+    "Illizi", "Bordj Bou Arreridj", "Boumerdès", "El Tarf", "Tindouf", "Tissemsilt", "El Oued",
+    "Khenchela", "Souk Ahras", "Tipaza", "Mila", "Aïn Defla", "Naâma", "Aïn Témouchent",
+    "Ghardaïa", "Relizane", "Timimoun", "Bordj Badji Mokhtar", "Ouled Djellal", "Béni Abbès",
+    "In Salah", "In Guezzam", "Touggourt", "Djanet", "El M'Ghair", "El Meniaa",
+)
+
+STATUSES = ("En préparation", "Expédié", "Centre", "Sorti en livraison", "Livré", "Retourné au vendeur")
+
+# the query parameters which are not filters
+_RESERVED = {"page", "page_size", "fields", "order_by", "desc", "asc"}
+
+
+def _flag(value) -> str:
+    """The query form of a boolean, the api stores them as 0 or 1."""
+    text = str(value).lower()
+    return {"true": "1", "false": "0"}.get(text, text)
+
+
+class SimulatorError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+# ===============================
+# MARK: Data
+# ===============================
+def _reference_data(communes_per_wilaya: int):
+    wilayas, communes, centers, fees = [], [], [], []
+    for wilaya_id, wilaya_name in enumerate(WILAYA_NAMES, start=1):
+        wilayas.append({"id": wilaya_id, "name": wilaya_name, "zone": wilaya_id % 5 + 1, "is_deliverable": 1})
+        home_fee = 400 + 50 * (wilaya_id % 10)
+        fees.append({"wilaya_id": wilaya_id, "wilaya_name": wilaya_name, "home_fee": home_fee, "desk_fee": home_fee - 150})
+
+        for k in range(1, communes_per_wilaya + 1):
+            commune_id = wilaya_id * 100 + k
+            name = wilaya_name if k == 1 else f"{wilaya_name} {k}"
+            has_stop_desk = int(k <= 2)
+            communes.append(
+                {
+                    "id": commune_id,
+                    "name": name,
+                    "wilaya_id": wilaya_id,
+                    "wilaya_name": wilaya_name,
+                    "has_stop_desk": has_stop_desk,
+                    # the last commune of every wilaya is not delivered
+                    "is_deliverable": int(k < communes_per_wilaya or k == 1),
+                    "delivery_time_parcel": 2 + wilaya_id % 3,
+                    "delivery_time_payment": 7,
+                }
+            )
+            if has_stop_desk:
+                centers.append(
+                    {
+                        "center_id": commune_id * 100 + 1,
+                        "name": f"Agence {name}",
+                        "address": f"Cité {k}, {name}",
+                        "gps": f"{36 - wilaya_id / 20:.4f},{3 + wilaya_id / 30:.4f}",
+                        "commune_id": commune_id,
+                        "commune_name": name,
+                        "wilaya_id": wilaya_id,
+                        "wilaya_name": wilaya_name,
+                    }
+                )
+    return wilayas, communes, centers, fees
+
+
+# ===============================
+# MARK: Simulator
+# ===============================
+class Simulator:
+    """
+    Local stand-in for the Yalidine api, for load tests and offline benchmarks.
+
+    It serves the `parcels`, `histories`, `centers`, `communes`, `wilayas` and
+    `deliveryfees` routes with the api's pagination, filters and errors, from
+    deterministic generated data. point a client at `url`:
+
+        with Simulator(parcels=10000, quotas=None) as simulator:
+            client = YalidineClient("id", "token", url=simulator.url)
+
+    ...
+
+    Attributes
+    ----------
+        parcels : int
+            The number of parcels (with their histories) generated at start.
+        communes_per_wilaya : int
+            The number of communes generated per wilaya.
+        quotas : dict
+            The requests allowed per window, answered with the `x-*-quota-left`
+            headers and a 429 when exhausted. None disables the quotas.
+        latency : float
+            The seconds waited before answering each request.
+        jitter : float
+            A random extra latency, between 0 and `jitter` seconds.
+        error_rate : float
+            The part of the requests answered with `error_status`.
+        error_status : int
+            The status of the injected errors.
+        strict : bool
+            Answer a 422 to the whole `create_parcel` request when one parcel is
+            invalid, instead of a per parcel failure.
+        seed : int
+            The seed of the generated data, latency and errors.
+        clock : callable
+            Wall clock of the quota windows, in seconds.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        parcels: int = 0,
+        communes_per_wilaya: int = 10,
+        quotas: dict = DEFAULT_QUOTAS,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        strict: bool = False,
+        seed: int = 0,
+        clock=time.time,
+    ):
+        self.host = host
+        self.port = port
+        self.quotas = quotas
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.strict = strict
+        self.clock = clock
+        self.requests = 0
+        self.routes = {}
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._windows = {}
+        self._server = None
+        self._thread = None
+
+        self.wilayas, self.communes, self.centers, self.deliveryfees = _reference_data(communes_per_wilaya)
+        self._communes_by_name = {(c["wilaya_name"], c["name"]): c for c in self.communes}
+        self._wilayas_by_name = {w["name"]: w for w in self.wilayas}
+        self._centers_by_id = {c["center_id"]: c for c in self.centers}
+
+        self.parcels = {}
+        self.histories = []
+        self._histories_by_tracking = {}
+        self._next_tracking = 1
+        self._next_import = 1
+        for i in range(parcels):
+            self._generate_parcel(i)
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1/"
+
+    # ===============================
+    # MARK: Lifecycle
+    # ===============================
+    def start(self):
+        handler = type("Handler", (_Handler,), {"simulator": self})
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_port
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ===============================
+    # MARK: Parcels
+    # ===============================
+    def _tracking(self) -> str:
+        tracking = f"yal-{self._next_tracking:06d}"
+        self._next_tracking += 1
+        return tracking
+
+    def _generate_parcel(self, i: int):
+        commune = self._random.choice(self.communes)
+        is_stopdesk = int(commune["has_stop_desk"] and self._random.random() < 0.3)
+        record = {
+            "order_id": f"order-{i}",
+            "firstname": "firstname",
+            "familyname": "familyname",
+            "contact_phone": f"05{self._random.randrange(10**8):08d}",
+            "address": f"{self._random.randrange(1, 200)} rue {i}",
+            "to_commune_name": commune["name"],
+            "to_wilaya_name": commune["wilaya_name"],
+            "from_wilaya_name": "Alger",
+            "product_list": "product",
+            "price": self._random.randrange(500, 20000, 100),
+            "is_stopdesk": is_stopdesk,
+            "stopdesk_id": commune["id"] * 100 + 1 if is_stopdesk else None,
+        }
+        parcel = self._create(record, date=f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d} 10:00:00")
+        for status in STATUSES[: 1 + i % len(STATUSES)]:
+            self._add_history(parcel, status)
+
+    def _create(self, item: dict, date: str = None) -> dict:
+        commune = self._communes_by_name[(item["to_wilaya_name"], item["to_commune_name"])]
+        fee = self.deliveryfees[commune["wilaya_id"] - 1]
+        tracking = self._tracking()
+        date = date or time.strftime("%Y-%m-%d %H:%M:%S")
+        parcel = {
+            "tracking": tracking,
+            "order_id": item.get("order_id"),
+            "firstname": item.get("firstname"),
+            "familyname": item.get("familyname"),
+            "contact_phone": item.get("contact_phone"),
+            "address": item.get("address"),
+            "is_stopdesk": int(bool(item.get("is_stopdesk"))),
+            "stopdesk_id": item.get("stopdesk_id"),
+            "stopdesk_name": None,
+            "from_wilaya_id": self._wilayas_by_name[item["from_wilaya_name"]]["id"],
+            "from_wilaya_name": item["from_wilaya_name"],
+            "to_commune_id": commune["id"],
+            "to_commune_name": commune["name"],
+            "to_wilaya_id": commune["wilaya_id"],
+            "to_wilaya_name": commune["wilaya_name"],
+            "product_list": item.get("product_list"),
+            "price": item.get("price") or 0,
+            "do_insurance": int(bool(item.get("do_insurance"))),
+            "declared_value": item.get("declared_value") or item.get("price") or 0,
+            "delivery_fee": fee["desk_fee"] if item.get("is_stopdesk") else fee["home_fee"],
+            "freeshipping": int(bool(item.get("freeshipping"))),
+            "import_id": self._next_import,
+            "date_creation": date,
+            "date_expedition": None,
+            "date_last_status": date,
+            "last_status": "En préparation",
+            "length": item.get("length"),
+            "width": item.get("width"),
+            "height": item.get("height"),
+            "weight": item.get("weight"),
+            "payment_status": "not-ready",
+            "payment_id": None,
+            "has_exchange": int(bool(item.get("has_exchange"))),
+            "product_to_collect": item.get("product_to_collect"),
+            "label": f"https://yalidine.app/app/bordereau.php?tracking={tracking}",
+        }
+        if parcel["stopdesk_id"] is not None:
+            parcel["stopdesk_name"] = self._centers_by_id[int(parcel["stopdesk_id"])]["name"]
+        self.parcels[tracking] = parcel
+        return parcel
+
+    def _add_history(self, parcel: dict, status: str):
+        parcel["last_status"] = status
+        event = {
+            "date_status": parcel["date_last_status"],
+            "tracking": parcel["tracking"],
+            "status": status,
+            "reason": None,
+            "center_id": None,
+            "center_name": None,
+            "wilaya_id": parcel["to_wilaya_id"],
+            "wilaya_name": parcel["to_wilaya_name"],
+            "commune_id": parcel["to_commune_id"],
+            "commune_name": parcel["to_commune_name"],
+        }
+        self.histories.append(event)
+        self._histories_by_tracking.setdefault(parcel["tracking"], []).append(event)
+
+    def _parcel_errors(self, item) -> list:
+        if not isinstance(item, dict):
+            return ["the parcel must be an object"]
+        try:
+            parcel = Parcel(**item)
+        except TypeError as e:
+            return [str(e)]
+
+        errors = validate_parcel(parcel)
+        if errors:
+            return errors
+        if parcel.from_wilaya_name not in self._wilayas_by_name:
+            errors.append(f"from_wilaya_name: unknown wilaya {parcel.from_wilaya_name!r}")
+        commune = self._communes_by_name.get((parcel.to_wilaya_name, parcel.to_commune_name))
+        if commune is None:
+            errors.append(f"to_commune_name: {parcel.to_commune_name!r} is not a commune of {parcel.to_wilaya_name!r}")
+        elif not commune["is_deliverable"]:
+            errors.append(f"to_commune_name: {parcel.to_commune_name!r} is not deliverable")
+        if parcel.is_stopdesk and not errors:
+            center = self._centers_by_id.get(int(parcel.stopdesk_id)) if str(parcel.stopdesk_id).isdigit() else None
+            if center is None or center["wilaya_id"] != commune["wilaya_id"]:
+                errors.append(f"stopdesk_id: unknown stop-desk {parcel.stopdesk_id!r} in {parcel.to_wilaya_name!r}")
+        return errors
+
+    def create_parcels(self, items) -> dict:
+        if not isinstance(items, list) or not items:
+            raise SimulatorError(422, "the body must be a non empty list of parcels")
+
+        errors = [self._parcel_errors(item) for item in items]
+        if self.strict and any(errors):
+            raise SimulatorError(422, "; ".join(next(e for e in errors if e)))
+
+        result = {}
+        with self._lock:
+            for item, item_errors in zip(items, errors):
+                order_id = item.get("order_id") if isinstance(item, dict) else None
+                if item_errors:
+                    result[order_id] = {"success": False, "order_id": order_id, "message": "; ".join(item_errors)}
+                    continue
+                parcel = self._create(item)
+                self._add_history(parcel, parcel["last_status"])
+                result[order_id] = {
+                    "success": True,
+                    "order_id": order_id,
+                    "tracking": parcel["tracking"],
+                    "import_id": parcel["import_id"],
+                    "label": parcel["label"],
+                    "labels": None,
+                    "message": "",
+                }
+            self._next_import += 1
+        return result
+
+    def update_parcel(self, tracking: str, item) -> dict:
+        if not isinstance(item, dict):
+            raise SimulatorError(422, "the body must be an object")
+        with self._lock:
+            parcel = self.parcels.get(tracking)
+            if parcel is None:
+                raise SimulatorError(404, f"the parcel {tracking} does not exist")
+            if parcel["last_status"] != "En préparation":
+                raise SimulatorError(422, f"the parcel {tracking} can not be edited anymore")
+            unknown = item.keys() - parcel.keys()
+            if unknown:
+                raise SimulatorError(422, f"unknown fields {sorted(unknown)}")
+            parcel.update(item)
+            return parcel
+
+    def delete_parcels(self, trackings: list) -> list:
+        result = []
+        with self._lock:
+            for tracking in trackings:
+                parcel = self.parcels.get(tracking)
+                deleted = parcel is not None and parcel["last_status"] == "En préparation"
+                if deleted:
+                    del self.parcels[tracking]
+                result.append({"tracking": tracking, "deleted": deleted})
+        return result
+
+    # ===============================
+    # MARK: Listings
+    # ===============================
+    def _records(self, resource: str, filters: dict):
+        """The records of `resource`, the tracking filters are answered from an index."""
+        trackings = filters.get("tracking")
+        if resource == "parcels":
+            if trackings:
+                return [self.parcels[t] for t in trackings.split(",") if t in self.parcels]
+            return self.parcels.values()
+        if resource == "histories" and trackings:
+            return [e for t in trackings.split(",") for e in self._histories_by_tracking.get(t, ())]
+        return getattr(self, resource)
+
+    def listing(self, resource: str, query: dict, base_url: str) -> dict:
+        try:
+            page = int(query.get("page", 1))
+            page_size = int(query.get("page_size", 100))
+        except ValueError:
+            raise SimulatorError(422, "page and page_size must be integers")
+        if page < 1 or not 1 <= page_size <= YALIDINE_MAX_PAGE_SIZE:
+            raise SimulatorError(422, f"page_size must be between 1 and {YALIDINE_MAX_PAGE_SIZE}")
+
+        with self._lock:
+            filters = {k: v for k, v in query.items() if k not in _RESERVED}
+            records = self._records(resource, filters)
+            if filters:
+                records = [r for r in records if self._match(r, filters)]
+            order_by = query.get("order_by")
+            if order_by:
+                records = sorted(records, key=lambda r: (r.get(order_by) is None, r.get(order_by) or 0))
+                if _flag(query.get("desc", "0")) == "1":
+                    records.reverse()
+            total = len(records)
+            # the records are not copied when unfiltered
+            data = list(islice(records, (page - 1) * page_size, page * page_size))
+
+        fields = query.get("fields")
+        if fields:
+            names = fields.split(",")
+            data = [{name: record.get(name) for name in names} for record in data]
+
+        has_more = page * page_size < total
+        return {
+            "has_more": has_more,
+            "total_data": total,
+            "data": data,
+            "links": {
+                "self": f"{base_url}?page={page}&page_size={page_size}",
+                "before": f"{base_url}?page={page - 1}&page_size={page_size}" if page > 1 else None,
+                "next": f"{base_url}?page={page + 1}&page_size={page_size}" if has_more else None,
+            },
+        }
+
+    @staticmethod
+    def _match(record: dict, filters: dict) -> bool:
+        for name, value in filters.items():
+            if name not in record:
+                continue
+            field = record[name]
+            if name.startswith("date_"):
+                start, _, end = value.partition(",")
+                day = (field or "")[:10]
+                if not (start <= day <= (end or start)):
+                    return False
+            elif _flag(field) not in {_flag(v) for v in value.split(",")}:
+                return False
+        return True
+
+    # ===============================
+    # MARK: Limits
+    # ===============================
+    def _consume_quota(self) -> dict:
+        """Count the request in every window, return the quota headers, raise a 429 when exhausted."""
+        if not self.quotas:
+            return {}
+
+        now = self.clock()
+        headers, exhausted = {}, False
+        with self._lock:
+            for name, limit in self.quotas.items():
+                period, header = QUOTA_WINDOWS[name]
+                window = int(now // period)
+                start, used = self._windows.get(name, (window, 0))
+                if start != window:
+                    used = 0
+                exhausted = exhausted or used >= limit
+                self._windows[name] = (window, used + 1)
+                headers[header] = str(max(limit - used - 1, 0))
+        if exhausted:
+            raise SimulatorError(429, "too many requests")
+        return headers
+
+    def _inject(self):
+        with self._lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+            failed = self.error_rate and self._random.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        if failed:
+            raise SimulatorError(self.error_status, "injected error")
+
+    # ===============================
+    # MARK: Routing
+    # ===============================
+    def handle(self, method: str, path: str, headers, body: bytes):
+        """Answer a request, return `(status, headers, payload)`."""
+        with self._lock:
+            self.requests += 1
+        response_headers = {}
+        try:
+            if not headers.get("X-API-ID") or not headers.get("X-API-TOKEN"):
+                raise SimulatorError(401, "missing X-API-ID or X-API-TOKEN")
+            response_headers = self._consume_quota()
+            self._inject()
+
+            parts = urlsplit(path)
+            segments = [s for s in parts.path.split("/") if s]
+            if not segments or segments[0] != "v1" or len(segments) not in (2, 3):
+                raise SimulatorError(404, "not found")
+            resource, key = segments[1], segments[2] if len(segments) == 3 else None
+            query = dict(parse_qsl(parts.query))
+            with self._lock:
+                route = f"{method} {resource}"
+                self.routes[route] = self.routes.get(route, 0) + 1
+
+            payload = self._route(method, resource, key, query, body, f"{self.url}{resource}/")
+            return 200, response_headers, payload
+        except SimulatorError as e:
+            return e.status, response_headers, {"error": {"code": e.status, "message": e.message}}
+
+    def _route(self, method, resource, key, query, body, base_url):
+        keys = {"centers": "center_id", "communes": "id", "wilayas": "id", "deliveryfees": "wilaya_id"}
+
+        if resource == "parcels":
+            if method == "GET":
+                if key is not None:
+                    query = dict(query, tracking=key)
+                return self.listing("parcels", query, base_url)
+            if method == "POST" and key is None:
+                return self.create_parcels(self._body(body))
+            if method == "PATCH" and key is not None:
+                return self.update_parcel(key, self._body(body))
+            if method == "DELETE":
+                trackings = [key] if key is not None else query.get("tracking", "").split(",")
+                return self.delete_parcels([t for t in trackings if t])
+        elif resource == "histories" and method == "GET":
+            if key is not None:
+                query = dict(query, tracking=key)
+            return self.listing("histories", query, base_url)
+        elif resource in keys and method == "GET":
+            if key is not None:
+                query = dict(query, **{keys[resource]: key})
+            return self.listing(resource, query, base_url)
+        raise SimulatorError(404 if method == "GET" else 405, f"{method} {resource} is not supported")
+
+    @staticmethod
+    def _body(body: bytes):
+        try:
+            return json.loads(body or b"null")
+        except ValueError:
+            raise SimulatorError(422, "the body is not valid json")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # answer small responses right away instead of waiting for the delayed ack
+    disable_nagle_algorithm = True
+    simulator = None
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        status, headers, payload = self.simulator.handle(self.command, self.path, self.headers, body)
+
+        content = json.dumps(payload, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PATCH = do_DELETE = _handle
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a local Yalidine api simulator.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--parcels", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--no-quotas", action="store_true")
+    args = parser.parse_args()
+
+    simulator = Simulator(
+        args.host,
+        args.port,
+        parcels=args.parcels,
+        quotas=None if args.no_quotas else DEFAULT_QUOTAS,
+        latency=args.latency,
+        error_rate=args.error_rate,
+    )
+    with simulator:
+        print(f"serving the yalidine api on {simulator.url}")
+        try:
+            simulator._thread.join()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+# core
+import json
+import sqlite3
+import threading
+import time
+
+
+# resource -> (listing method of the client, field holding the record id)
+RESOURCES = {
+    "wilayas": ("iter_wilayas", "id"),
+    "communes": ("iter_communes", "id"),
+    "centers": ("iter_centers", "center_id"),
+    "deliveryfees": ("iter_delivery_fees", "wilaya_id"),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    resource TEXT NOT NULL,
+    id TEXT NOT NULL,
+    name TEXT,
+    wilaya_id TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (resource, id)
+);
+CREATE INDEX IF NOT EXISTS records_name ON records (resource, name);
+CREATE INDEX IF NOT EXISTS records_wilaya ON records (resource, wilaya_id);
+CREATE TABLE IF NOT EXISTS refreshes (
+    resource TEXT PRIMARY KEY,
+    refreshed_at REAL NOT NULL
+);
+"""
+
+
+# ===============================
+# MARK: ReferenceStore
+# ===============================
+class ReferenceStore:
+    """
+    Local SQLite snapshot of the wilayas, communes, centers and delivery fees.
+
+    The tables are downloaded once through the listing endpoints, a new
+    process opening the same file starts warm and answers lookups offline.
+
+    ...
+
+    Attributes
+    ----------
+        path : str
+            The SQLite file, `":memory:"` keeps the snapshot in memory.
+        client : YalidineClient
+            The client used to download the data, optional for offline use.
+        max_age : float
+            Age in seconds after which `refresh` downloads a resource again.
+    """
+
+    def __init__(self, path: str, client=None, max_age: float = 24 * 3600):
+        self.path = path
+        self.client = client
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        self._refresher = None
+        self._stop = threading.Event()
+
+    def close(self):
+        self.stop_background_refresh()
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ===============================
+    # MARK: Refresh
+    # ===============================
+    def load(self, resource: str):
+        """Download every record of `resource` and replace the local copy."""
+        if self.client is None:
+            raise ValueError("ReferenceStore needs a client to download data")
+
+        method, id_field = RESOURCES[resource]
+        rows = [
+            (
+                resource,
+                str(record[id_field]),
+                record.get("name") or record.get("wilaya_name"),
+                None if record.get("wilaya_id") is None else str(record["wilaya_id"]),
+                json.dumps(record),
+            )
+            for record in getattr(self.client, method)()
+        ]
+
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM records WHERE resource = ?", (resource,))
+            self._db.executemany("INSERT INTO records VALUES (?, ?, ?, ?, ?)", rows)
+            self._db.execute(
+                "INSERT OR REPLACE INTO refreshes VALUES (?, ?)", (resource, time.time())
+            )
+
+    def refreshed_at(self, resource: str):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT refreshed_at FROM refreshes WHERE resource = ?", (resource,)
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def is_stale(self, resource: str) -> bool:
+        refreshed_at = self.refreshed_at(resource)
+        return refreshed_at is None or time.time() - refreshed_at > self.max_age
+
+    def refresh(self, force: bool = False) -> list:
+        """Download the resources older than `max_age`, return their names."""
+        refreshed = []
+        for resource in RESOURCES:
+            if force or self.is_stale(resource):
+                self.load(resource)
+                refreshed.append(resource)
+        return refreshed
+
+    def start_background_refresh(self, interval: float = 3600):
+        """Refresh the stale resources every `interval` seconds in a daemon thread."""
+        if self._refresher is not None:
+            return
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.refresh()
+                except Exception:
+                    # keep serving the last snapshot, retry on the next tick
+                    pass
+
+        self._stop.clear()
+        self._refresher = threading.Thread(target=run, daemon=True)
+        self._refresher.start()
+
+    def stop_background_refresh(self):
+        if self._refresher is None:
+            return
+        self._stop.set()
+        self._refresher.join()
+        self._refresher = None
+
+    # ===============================
+    # MARK: Lookups
+    # ===============================
+    def _one(self, query, params):
+        with self._lock:
+            row = self._db.execute(query, params).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def _all(self, query, params):
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def get(self, resource: str, id) -> dict:
+        return self._one(
+            "SELECT data FROM records WHERE resource = ? AND id = ?", (resource, str(id))
+        )
+
+    def find(self, resource: str, name: str) -> list:
+        return self._all(
+            "SELECT data FROM records WHERE resource = ? AND name = ? COLLATE NOCASE",
+            (resource, name),
+        )
+
+    def all(self, resource: str, wilaya_id=None) -> list:
+        if wilaya_id is None:
+            return self._all(
+                "SELECT data FROM records WHERE resource = ? ORDER BY rowid", (resource,)
+            )
+        return self._all(
+            "SELECT data FROM records WHERE resource = ? AND wilaya_id = ? ORDER BY rowid",
+            (resource, str(wilaya_id)),
+        )
+
+    def wilaya(self, wilaya_id) -> dict:
+        return self.get("wilayas", wilaya_id)
+
+    def wilaya_by_name(self, name: str) -> dict:
+        found = self.find("wilayas", name)
+        return found[0] if found else None
+
+    def commune(self, commune_id) -> dict:
+        return self.get("communes", commune_id)
+
+    def communes(self, wilaya_id=None) -> list:
+        return self.all("communes", wilaya_id)
+
+    def center(self, center_id) -> dict:
+        return self.get("centers", center_id)
+
+    def centers(self, wilaya_id=None) -> list:
+        return self.all("centers", wilaya_id)
+
+    def delivery_fee(self, wilaya_id) -> dict:
+        return self.get("deliveryfees", wilaya_id)
@@ -0,0 +1,139 @@
+# core
+import json
+import os
+import threading
+from dataclasses import dataclass, field, replace
+from datetime import date, timedelta
+from typing import Optional
+
+# files
+from .entity import HistoryFilter
+
+
+def event_key(event: dict) -> tuple:
+    """Identity of a history event, the api does not return an event id."""
+    return (event.get("tracking"), event.get("date_status"), event.get("status"))
+
+
+# ===============================
+# MARK: Checkpoint
+# ===============================
+@dataclass
+class Checkpoint:
+    """
+    Checkpoint object
+
+    ...
+
+    Attributes
+    ----------
+        date_status : str
+            The latest `date_status` seen (high-water mark).
+        seen : set
+            The keys of the events seen at `date_status`, to skip them when
+            the next poll starts from the same date.
+    """
+
+    date_status: Optional[str] = None
+    seen: set = field(default_factory=set)
+
+    def load(self, path: str) -> "Checkpoint":
+        if path and os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            self.date_status = data["date_status"]
+            self.seen = {tuple(key) for key in data["seen"]}
+        return self
+
+    def save(self, path: str):
+        if not path:
+            return
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"date_status": self.date_status, "seen": list(self.seen)}, f)
+        os.replace(tmp, path)
+
+    def is_new(self, event: dict) -> bool:
+        date_status = event.get("date_status")
+        if self.date_status is None or date_status > self.date_status:
+            return True
+        return date_status == self.date_status and event_key(event) not in self.seen
+
+    def advance(self, event: dict):
+        date_status = event.get("date_status")
+        if self.date_status is None or date_status > self.date_status:
+            self.date_status = date_status
+            self.seen = {event_key(event)}
+        elif date_status == self.date_status:
+            self.seen.add(event_key(event))
+
+
+# ===============================
+# MARK: HistorySync
+# ===============================
+class HistorySync:
+    """
+    Incremental sync of the histories using a high-water mark on `date_status`.
+
+    Each poll only asks for the events dated from the checkpoint's day
+    onwards (the `date_status` filter has a day granularity), ordered by
+    `date_status` ascending, and yields the events not seen yet.
+
+    ...
+
+    Attributes
+    ----------
+        client : YalidineClient
+            The client used to fetch the histories.
+        checkpoint_path : str
+            A json file where the checkpoint is persisted between polls and
+            restarts, optional.
+        filter : HistoryFilter
+            Extra filters (eg: `status`), the date and ordering are managed
+            by the sync.
+    """
+
+    def __init__(self, client, checkpoint_path: str = None, filter: HistoryFilter = None):
+        self.client = client
+        self.checkpoint_path = checkpoint_path
+        self.filter = filter or HistoryFilter()
+        self.checkpoint = Checkpoint().load(checkpoint_path)
+        self._lock = threading.Lock()
+
+    def _filter(self) -> HistoryFilter:
+        date_status = None
+        if self.checkpoint.date_status:
+            since = self.checkpoint.date_status[:10]
+            until = (date.today() + timedelta(days=1)).isoformat()
+            date_status = f"{since},{until}"
+        return replace(
+            self.filter, date_status=date_status, page=None, order_by="date_status", asc=True, desc=None
+        )
+
+    def poll(self):
+        """Yield the new events, the checkpoint advances as they are consumed."""
+        with self._lock:
+            try:
+                for event in self.client.iter_histories(self._filter()):
+                    if not self.checkpoint.is_new(event):
+                        continue
+                    yield event
+                    # only advance once the consumer took the event
+                    self.checkpoint.advance(event)
+            finally:
+                self.checkpoint.save(self.checkpoint_path)
+
+    def run(self, callback) -> int:
+        """Call `callback(event)` for every new event, return the number of events."""
+        count = 0
+        for event in self.poll():
+            callback(event)
+            count += 1
+        return count
+
+    def run_forever(self, callback, interval: float = 60, stop: threading.Event = None):
+        """Poll every `interval` seconds until `stop` is set."""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            self.run(callback)
+            stop.wait(interval)
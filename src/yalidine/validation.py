@@ -0,0 +1,250 @@
+# core
+import difflib
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+
+# files
+from .entity import Parcel
+from .index import LocationIndex, normalize
+
+
+MAX_AMOUNT = 150000
+
+REQUIRED_FIELDS = (
+    "order_id",
+    "from_wilaya_name",
+    "firstname",
+    "familyname",
+    "contact_phone",
+    "address",
+    "to_commune_name",
+    "to_wilaya_name",
+    "product_list",
+)
+
+
+# ===============================
+# MARK: Field validation
+# ===============================
+def validate_parcel(parcel: Parcel) -> list:
+    """
+    Check a parcel against the documented constraints of the api,
+    return the list of errors (empty when the parcel is valid).
+    """
+    errors = []
+
+    for name in REQUIRED_FIELDS:
+        if getattr(parcel, name) in (None, ""):
+            errors.append(f"{name} is required")
+
+    for name in ("price", "declared_value"):
+        value = getattr(parcel, name)
+        if value is not None and not 0 <= value <= MAX_AMOUNT:
+            errors.append(f"{name} must be between 0 and {MAX_AMOUNT}")
+
+    for name in ("length", "width", "height", "weight"):
+        value = getattr(parcel, name)
+        if value is not None and value < 0:
+            errors.append(f"{name} must be greater than or equal to 0")
+
+    if parcel.is_stopdesk and not parcel.stopdesk_id:
+        errors.append("stopdesk_id is required when is_stopdesk is true")
+
+    if parcel.has_exchange and not parcel.product_to_collect:
+        errors.append("product_to_collect is required when has_exchange is true")
+
+    return errors
+
+
+# ===============================
+# MARK: Address validation
+# ===============================
+@dataclass
+class AddressError:
+    """
+    AddressError object
+
+    ...
+
+    Attributes
+    ----------
+        field : str
+            The parcel field in error.
+        code : str
+            `unknown_wilaya`, `unknown_commune`, `commune_not_in_wilaya`,
+            `not_deliverable`, `no_stop_desk`, `unknown_stopdesk` or `stopdesk_not_in_wilaya`.
+        message : str
+            A readable description of the error.
+        suggestions : list
+            The names close to the wrong one.
+    """
+
+    field: str
+    code: str
+    message: str
+    suggestions: list = field(default_factory=list)
+
+    def __str__(self):
+        return self.message
+
+
+def _copy(resolved):
+    """the memoized errors are copied, every parcel gets its own"""
+    wilaya, commune, errors = resolved
+    return wilaya, commune, [replace(e, suggestions=list(e.suggestions)) for e in errors]
+
+
+class AddressValidator:
+    """
+    Check the wilayas, commune and stop-desk of parcels against a `LocationIndex`
+    before sending them, the api answers these mistakes with a 422.
+
+    The names are compared accent and case insensitively and replaced by their
+    canonical spelling, a misspelled name is corrected when it has a single
+    close match. the resolution of the last `memo_size` (wilaya, commune)
+    pairs is memoized, so a batch repeating the same destinations is
+    validated with dict lookups.
+
+    ...
+
+    Attributes
+    ----------
+        index : LocationIndex
+            The wilayas, communes and centers.
+        autocorrect : bool
+            Replace the misspelled names with an unambiguous close match.
+        memo_size : int
+            The maximum number of (wilaya, commune) pairs memoized.
+    """
+
+    def __init__(self, index: LocationIndex, autocorrect: bool = True, memo_size: int = 4096):
+        self.index = index
+        self.autocorrect = autocorrect
+        self.memo_size = memo_size
+        self._wilaya_names = [normalize(w["name"]) for w in index.wilayas_by_id.values()]
+        self._resolved = OrderedDict()
+
+    @classmethod
+    def from_store(cls, store, autocorrect: bool = True):
+        return cls(LocationIndex.from_store(store), autocorrect)
+
+    @classmethod
+    def from_client(cls, client, autocorrect: bool = True):
+        return cls(LocationIndex.from_client(client), autocorrect)
+
+    def _wilaya(self, name, field_name):
+        """return (wilaya, errors)"""
+        if name in (None, ""):
+            return None, []
+        wilaya = self.index.wilaya(name)
+        if wilaya is not None:
+            return wilaya, []
+
+        matches = difflib.get_close_matches(normalize(str(name)), self._wilaya_names, n=3, cutoff=0.75)
+        suggestions = [self.index.wilayas_by_name[m]["name"] for m in matches]
+        if self.autocorrect and len(suggestions) == 1:
+            return self.index.wilayas_by_name[matches[0]], []
+        return None, [AddressError(field_name, "unknown_wilaya", f"unknown wilaya {name!r}", suggestions)]
+
+    def _destination(self, wilaya_name, commune_name):
+        """return (wilaya, commune, errors), memoized by pair of names"""
+        key = (wilaya_name, commune_name)
+        resolved = self._resolved.get(key)
+        if resolved is not None:
+            self._resolved.move_to_end(key)
+            return _copy(resolved)
+
+        wilaya, errors = self._wilaya(wilaya_name, "to_wilaya_name")
+        commune = None
+        if wilaya is not None and commune_name not in (None, ""):
+            commune = self.index.commune(commune_name, wilaya["id"])
+            if commune is None:
+                commune, error = self._missing_commune(commune_name, wilaya)
+                if error is not None:
+                    errors.append(error)
+
+        if wilaya is not None and wilaya.get("is_deliverable") in (0, False):
+            errors.append(AddressError("to_wilaya_name", "not_deliverable", f"{wilaya['name']} is not deliverable"))
+        if commune is not None and commune.get("is_deliverable") in (0, False):
+            errors.append(AddressError("to_commune_name", "not_deliverable", f"{commune['name']} is not deliverable"))
+
+        self._resolved[key] = wilaya, commune, errors
+        while len(self._resolved) > self.memo_size:
+            self._resolved.popitem(last=False)
+        return _copy((wilaya, commune, errors))
+
+    def _missing_commune(self, name, wilaya):
+        """return (commune, error) for a commune not found in `wilaya`"""
+        elsewhere = self.index.communes_by_name.get(normalize(str(name)), ())
+        if elsewhere:
+            wilayas = [self.index.wilayas_by_id.get(str(c["wilaya_id"]), {}).get("name") for c in elsewhere]
+            return None, AddressError(
+                "to_commune_name",
+                "commune_not_in_wilaya",
+                f"{name!r} is not a commune of {wilaya['name']}, it is in {', '.join(filter(None, wilayas))}",
+                [c["name"] for c in self.index.suggest(name, wilaya["id"], limit=3)],
+            )
+
+        close = self.index.suggest(name, wilaya["id"], limit=3)
+        if self.autocorrect and len(close) == 1:
+            return close[0], None
+        return None, AddressError(
+            "to_commune_name",
+            "unknown_commune",
+            f"unknown commune {name!r} in {wilaya['name']}",
+            [c["name"] for c in close],
+        )
+
+    def _stopdesk(self, parcel, wilaya, commune) -> list:
+        if not parcel.is_stopdesk:
+            return []
+        if parcel.stopdesk_id in (None, ""):
+            if commune is not None and commune.get("has_stop_desk") in (0, False):
+                return [AddressError("to_commune_name", "no_stop_desk", f"{commune['name']} has no stop-desk")]
+            return []
+
+        center = self.index.center(parcel.stopdesk_id)
+        if center is None:
+            return [AddressError("stopdesk_id", "unknown_stopdesk", f"unknown stop-desk {parcel.stopdesk_id!r}")]
+        if wilaya is not None and str(center["wilaya_id"]) != str(wilaya["id"]):
+            return [
+                AddressError(
+                    "stopdesk_id",
+                    "stopdesk_not_in_wilaya",
+                    f"the stop-desk {parcel.stopdesk_id} is not in {wilaya['name']}",
+                    [c["name"] for c in self.index.stopdesks_of_wilaya(wilaya["id"])],
+                )
+            ]
+        return []
+
+    def check(self, parcel: Parcel):
+        """
+        Validate the address of a parcel, no network i/o.
+        return `(parcel, errors)`, the parcel is a copy with the canonical
+        names (the same object when nothing changed).
+        """
+        origin, errors = self._wilaya(parcel.from_wilaya_name, "from_wilaya_name")
+        wilaya, commune, destination_errors = self._destination(parcel.to_wilaya_name, parcel.to_commune_name)
+        errors = errors + destination_errors + self._stopdesk(parcel, wilaya, commune)
+
+        changes = {}
+        if origin is not None and origin["name"] != parcel.from_wilaya_name:
+            changes["from_wilaya_name"] = origin["name"]
+        if wilaya is not None and wilaya["name"] != parcel.to_wilaya_name:
+            changes["to_wilaya_name"] = wilaya["name"]
+        if commune is not None and commune["name"] != parcel.to_commune_name:
+            changes["to_commune_name"] = commune["name"]
+        if changes:
+            parcel = replace(parcel, **changes)
+        return parcel, errors
+
+    def check_many(self, parcels):
+        """Split `parcels` into `(valid, rejected)`, rejected holds `(parcel, errors)` pairs."""
+        valid, rejected = [], []
+        for parcel in parcels:
+            parcel, errors = self.check(parcel)
+            if errors:
+                rejected.append((parcel, errors))
+            else:
+                valid.append(parcel)
+        return valid, rejected
@@ -0,0 +1,8 @@
+class FakeClock:
+    """A clock that only moves when the test sets `now`."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
@@ -0,0 +1,95 @@
+import asyncio
+import unittest
+
+import requests
+
+from src.yalidine.aio import AsyncYalidineClient, _httpx_timeout, httpx
+from src.yalidine.entity import Parcel, ParcelFilter
+from src.yalidine.instrumentation import Hooks
+from src.yalidine.simulator import Simulator
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class TestAsyncClient(unittest.TestCase):
+    def setUp(self) -> None:
+        self.simulator = Simulator(parcels=10, quotas=None, latency=0.05).start()
+
+    def tearDown(self) -> None:
+        self.simulator.stop()
+
+    def test_httpx_timeout(self):
+        timeout = _httpx_timeout((3, 10))
+        self.assertEqual((timeout.connect, timeout.read), (3, 10))
+        timeout = _httpx_timeout(5)
+        self.assertEqual((timeout.connect, timeout.read, timeout.pool), (5, 5, 5))
+
+    def test_errors(self):
+        async def run():
+            async with AsyncYalidineClient("id", "token", url=self.simulator.url) as client:
+                with self.assertRaises(requests.exceptions.HTTPError) as missing:
+                    await client.update_parcel("yal-999999", Parcel(price=3000))
+                with self.assertRaises(requests.exceptions.HTTPError) as invalid:
+                    await client.get_parcels(ParcelFilter(page_size=5000))
+            return missing.exception, invalid.exception
+
+        missing, invalid = asyncio.run(run())
+        self.assertEqual(missing.response.status_code, 404)
+        self.assertIn("404 Error", str(missing))
+        self.assertEqual(invalid.response.status_code, 422)
+
+    def test_max_concurrency(self):
+        in_flight = []
+        peak = []
+
+        def before(event):
+            in_flight.append(event)
+            peak.append(len(in_flight))
+
+        hooks = Hooks(before=before, after=lambda event: in_flight.remove(event))
+
+        async def run():
+            async with AsyncYalidineClient("id", "token", url=self.simulator.url, max_concurrency=2, instruments=[hooks]) as client:
+                return await asyncio.gather(*(client.get_wilaya(i) for i in range(1, 7)))
+
+        self.assertEqual(len(asyncio.run(run())), 6)
+        self.assertEqual(max(peak), 2)
+
+    def test_cancel_releases_slot(self):
+        async def run():
+            async with AsyncYalidineClient("id", "token", url=self.simulator.url, max_concurrency=1) as client:
+                with self.assertRaises(asyncio.TimeoutError):
+                    await asyncio.wait_for(client.get_wilayas(), 0.01)
+                # a leaked slot would block this call until the timeout
+                return await asyncio.wait_for(client.get_wilaya(10), 2)
+
+        self.assertEqual(asyncio.run(run())["data"][0]["id"], 10)
+
+    def test_client_ownership(self):
+        async def run():
+            async with AsyncYalidineClient("id", "token", url=self.simulator.url) as client:
+                pass
+            http = httpx.AsyncClient()
+            async with AsyncYalidineClient("id", "token", url=self.simulator.url, client=http) as shared:
+                await shared.get_wilaya(10)
+            closed = http.is_closed
+            await http.aclose()
+            return client.http.is_closed, closed, "X-API-ID" in http.headers
+
+        self.assertEqual(asyncio.run(run()), (True, False, False))
+
+    def test_shared_client_credentials(self):
+        api_ids = []
+
+        async def log(request):
+            api_ids.append(request.headers.get("X-API-ID"))
+
+        async def run():
+            async with httpx.AsyncClient(event_hooks={"request": [log]}) as http:
+                first = AsyncYalidineClient("first", "token", url=self.simulator.url, client=http)
+                second = AsyncYalidineClient("second", "token", url=self.simulator.url, client=http)
+                await first.get_wilayas()
+                await second.get_wilayas()
+                await first.get_wilayas()
+
+        asyncio.run(run())
+        self.assertEqual(api_ids, ["first", "second", "first"])
@@ -0,0 +1,147 @@
+import unittest
+from types import SimpleNamespace
+
+import requests
+
+from src.yalidine.bulk import (
+    bulk_create_parcels,
+    chunk_ids,
+    delete_parcels_bulk,
+    get_histories_by_tracking,
+    get_parcels_by_tracking,
+)
+from src.yalidine.entity import Parcel
+
+
+def http_error(status):
+    response = SimpleNamespace(status_code=status, json=lambda: {"error": status}, text="")
+    return requests.exceptions.HTTPError(str(status), response=response)
+
+
+class FakeClient:
+    def __init__(self, fail_once=(), error=None):
+        self.fail_once = set(fail_once)
+        self.error = error or http_error(429)
+        self.calls = 0
+
+    def create_parcel(self, parcel_list):
+        self.calls += 1
+        if any(p.price is not None and p.price < 0 for p in parcel_list):
+            raise http_error(422)
+        for p in parcel_list:
+            if p.order_id in self.fail_once:
+                self.fail_once.discard(p.order_id)
+                raise self.error
+        return {
+            p.order_id: {"success": True, "order_id": p.order_id, "tracking": f"yal-{p.order_id}", "label": "url"}
+            for p in parcel_list
+        }
+
+
+class TestBulkCreate(unittest.TestCase):
+    def test_isolates_invalid_rows(self):
+        parcels = [Parcel(order_id=str(i), price=-1 if i == 7 else 100) for i in range(20)]
+        results = bulk_create_parcels(FakeClient(), parcels, chunk_size=8, max_workers=2)
+
+        self.assertEqual(len(results), 20)
+        self.assertFalse(results["7"].success)
+        self.assertEqual(results["6"].tracking, "yal-6")
+        self.assertEqual(sum(r.success for r in results.values()), 19)
+
+    def test_retries_transient_errors(self):
+        client = FakeClient(fail_once={"3"})
+        results = bulk_create_parcels(client, [Parcel(order_id=str(i)) for i in range(5)], backoff=0)
+        self.assertTrue(all(r.success for r in results.values()))
+        self.assertEqual(client.calls, 2)
+
+    def test_retries_connection_refused(self):
+        try:
+            requests.get("http://127.0.0.1:9/", timeout=1)
+        except requests.exceptions.ConnectionError as e:
+            refused = e
+        client = FakeClient(fail_once={"3"}, error=refused)
+        results = bulk_create_parcels(client, [Parcel(order_id=str(i)) for i in range(5)], backoff=0)
+        self.assertTrue(all(r.success for r in results.values()))
+
+    def test_lost_response_is_not_sent_again(self):
+        for error in (requests.exceptions.ReadTimeout("lost"), requests.exceptions.ChunkedEncodingError("lost"), http_error(503)):
+            client = FakeClient(fail_once={"3"}, error=error)
+            results = bulk_create_parcels(client, [Parcel(order_id=str(i)) for i in range(5)], backoff=0)
+            self.assertEqual(client.calls, 1)
+            self.assertFalse(any(r.success or r.rejected for r in results.values()))
+
+    def test_requires_order_id(self):
+        with self.assertRaises(ValueError):
+            bulk_create_parcels(FakeClient(), [Parcel(order_id="1"), Parcel(order_id="1")])
+
+
+class TestBulkByTracking(unittest.TestCase):
+    def test_chunk_ids(self):
+        ids = [f"yal-{i:06d}" for i in range(100)]
+        chunks = list(chunk_ids(ids, max_length=100))
+        self.assertEqual(sum(chunks, []), ids)
+        self.assertTrue(all(len(",".join(c)) <= 100 for c in chunks))
+
+    def test_delete_parcels_bulk(self):
+        calls = []
+
+        class Client:
+            def delete_parcels(self, ids):
+                calls.append(ids)
+                return [
+                    {"tracking": id, "deleted": id != "yal-000003"}
+                    for id in ids
+                    if id != "yal-unknown"
+                ]
+
+        ids = [f"yal-{i:06d}" for i in range(50)] + ["yal-unknown"]
+        result = delete_parcels_bulk(Client(), ids, max_length=100)
+
+        self.assertGreater(len(calls), 1)
+        self.assertFalse(result["yal-000003"])
+        self.assertTrue(result["yal-000004"])
+        self.assertFalse(result["yal-unknown"])
+
+    def test_delete_failed_chunk(self):
+        error = http_error(503)
+
+        class Client:
+            def delete_parcels(self, ids):
+                if "yal-000000" in ids:
+                    raise error
+                return [{"tracking": id, "deleted": True} for id in ids]
+
+        ids = [f"yal-{i:06d}" for i in range(50)]
+        result = delete_parcels_bulk(Client(), ids, max_length=100)
+
+        failed = next(chunk for chunk in chunk_ids(ids, 100) if "yal-000000" in chunk)
+        self.assertEqual(result.errors, dict.fromkeys(failed, error))
+        self.assertTrue(all(result[id] is None for id in failed))
+        self.assertTrue(all(result[id] for id in ids if id not in failed))
+
+    def test_get_by_tracking(self):
+        class Client:
+            def iter_parcels(self, filter, prefetch=True):
+                trackings = filter.tracking.split(",")
+                if "yal-000010" in trackings:
+                    raise http_error(503)
+                return ({"tracking": t} for t in trackings if t != "yal-000001")
+
+            def iter_histories(self, filter, prefetch=True):
+                for tracking in self.iter_parcels(filter):
+                    yield {"tracking": tracking["tracking"], "status": "Livré"}
+                    yield {"tracking": tracking["tracking"], "status": "Centre"}
+
+        ids = [f"yal-{i:06d}" for i in range(20)]
+        failed = next(chunk for chunk in chunk_ids(ids, 100) if "yal-000010" in chunk)
+
+        parcels = get_parcels_by_tracking(Client(), ids, max_length=100)
+        self.assertEqual(parcels["yal-000000"], {"tracking": "yal-000000"})
+        self.assertIsNone(parcels["yal-000001"])
+        self.assertEqual(set(parcels.errors), set(failed))
+
+        histories = get_histories_by_tracking(Client(), ids, max_length=100)
+        self.assertEqual([e["status"] for e in histories["yal-000000"]], ["Livré", "Centre"])
+        self.assertEqual(histories["yal-000001"], [])
+        self.assertTrue(all(histories[id] is None for id in failed))
+        self.assertEqual(set(histories.errors), set(failed))
@@ -0,0 +1,59 @@
+import threading
+import time
+import unittest
+
+from src.yalidine.cache import TTLCache, make_key
+from src.yalidine.entity import CommunesFilter
+from tests.helpers import FakeClock
+
+
+class TestTTLCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.cache = TTLCache(maxsize=2, ttls={"communes": 10}, clock=self.clock)
+
+    def test_hit_and_expire(self):
+        self.assertEqual(self.cache.get_or_load("communes", "a", lambda: 1), 1)
+        self.assertEqual(self.cache.get_or_load("communes", "a", lambda: 2), 1)
+
+        self.clock.now = 11
+        self.assertEqual(self.cache.get_or_load("communes", "a", lambda: 3), 3)
+        self.assertEqual(self.cache.stats(), {"hits": 1, "misses": 2, "size": 1})
+
+    def test_lru_eviction(self):
+        self.cache.get_or_load("communes", "a", lambda: 1)
+        self.cache.get_or_load("communes", "b", lambda: 2)
+        self.cache.get_or_load("communes", "a", lambda: None)
+        self.cache.get_or_load("communes", "c", lambda: 3)
+
+        self.assertEqual(self.cache.get_or_load("communes", "a", lambda: None), 1)
+        self.assertEqual(self.cache.get_or_load("communes", "b", lambda: "reloaded"), "reloaded")
+
+    def test_single_flight(self):
+        calls = []
+
+        def loader():
+            calls.append(1)
+            time.sleep(0.05)
+            return "value"
+
+        threads = [
+            threading.Thread(target=self.cache.get_or_load, args=("communes", "k", loader))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+
+    def test_filter_key(self):
+        self.assertEqual(
+            make_key("get_communes", (CommunesFilter(wilaya_id="10"),), {}),
+            make_key("get_communes", (CommunesFilter(wilaya_id="10"),), {}),
+        )
+        self.assertNotEqual(
+            make_key("get_communes", (CommunesFilter(wilaya_id="10"),), {}),
+            make_key("get_communes", (CommunesFilter(wilaya_id="11"),), {}),
+        )
@@ -0,0 +1,70 @@
+import unittest
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.yalidine.api import YalidineClient
+from src.yalidine.simulator import Simulator
+
+
+class TrackedSession(requests.Session):
+    def __init__(self):
+        super().__init__()
+        self.closed = 0
+        self.api_ids = []
+
+    def send(self, request, **kwargs):
+        self.api_ids.append(request.headers.get("X-API-ID"))
+        return super().send(request, **kwargs)
+
+    def close(self):
+        self.closed += 1
+        super().close()
+
+
+class TestClientSession(unittest.TestCase):
+    def test_owned_session_closed(self):
+        with YalidineClient("id", "token") as client:
+            session = client.session
+            session.close = lambda: setattr(session, "closed", True)
+        self.assertTrue(session.closed)
+
+    def test_shared_session_not_closed(self):
+        session = TrackedSession()
+        headers = dict(session.headers)
+        with Simulator(quotas=None) as simulator:
+            with YalidineClient("id", "token", url=simulator.url, session=session) as client:
+                client.get_wilaya(10)
+        self.assertEqual(session.closed, 0)
+        self.assertEqual(dict(session.headers), headers)
+        session.close()
+
+    def test_shared_session_credentials(self):
+        session = TrackedSession()
+        with Simulator(quotas=None) as simulator:
+            first = YalidineClient("first", "token", url=simulator.url, session=session)
+            second = YalidineClient("second", "token", url=simulator.url, session=session)
+            first.get_wilayas()
+            second.get_wilayas()
+            first.get_wilayas()
+        self.assertEqual(session.api_ids, ["first", "second", "first"])
+        session.close()
+
+    def test_default_adapter(self):
+        with YalidineClient("id", "token", pool_connections=2, pool_maxsize=7) as client:
+            adapter = client.session.get_adapter("https://api.yalidine.app/v1/")
+            self.assertIsInstance(adapter, HTTPAdapter)
+            self.assertEqual(adapter._pool_maxsize, 7)
+            self.assertEqual(adapter._pool_connections, 2)
+
+    def test_custom_adapter(self):
+        adapter = HTTPAdapter()
+        with YalidineClient("id", "token", adapter=adapter) as client:
+            self.assertIs(client.session.get_adapter("https://api.yalidine.app/v1/"), adapter)
+            self.assertIs(client.session.get_adapter("http://127.0.0.1:8000/v1/"), adapter)
+
+    def test_shared_session_keeps_its_adapters(self):
+        session = requests.Session()
+        adapter = session.get_adapter("https://api.yalidine.app/v1/")
+        YalidineClient("id", "token", session=session)
+        self.assertIs(session.get_adapter("https://api.yalidine.app/v1/"), adapter)
@@ -0,0 +1,80 @@
+import asyncio
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from src.yalidine.aio import AsyncYalidineClient, httpx
+from src.yalidine.api import YalidineClient
+from src.yalidine.coalesce import AsyncRequestCoalescer, RequestCoalescer, request_key
+from src.yalidine.entity import ParcelFilter
+from src.yalidine.simulator import Simulator
+
+
+class TestRequestKey(unittest.TestCase):
+    def test_sorted_query(self):
+        self.assertEqual(
+            request_key("http://api/v1/parcels/?page_size=10&tracking=a,b"),
+            request_key("http://api/v1/parcels/?tracking=a,b&page_size=10"),
+        )
+        self.assertNotEqual(request_key("http://api/v1/parcels/?page=1"), request_key("http://api/v1/parcels/?page=2"))
+
+
+class TestCoalescing(unittest.TestCase):
+    def setUp(self) -> None:
+        self.simulator = Simulator(parcels=5, quotas=None, latency=0.1).start()
+
+    def tearDown(self) -> None:
+        self.simulator.stop()
+
+    def test_threads(self):
+        coalescer = RequestCoalescer()
+        client = YalidineClient("id", "token", url=self.simulator.url, coalescer=coalescer)
+
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            results = list(executor.map(lambda _: client.get_parcel("yal-000001"), range(10)))
+
+        self.assertEqual(self.simulator.requests, 1)
+        self.assertEqual(coalescer.stats(), {"requests": 10, "coalesced": 9, "in_flight": 0})
+        # every caller gets its own decoded copy
+        self.assertEqual(len({id(r) for r in results}), 10)
+        self.assertEqual(results[0]["data"][0]["tracking"], "yal-000001")
+
+        # without a window, a request made after the first one is done is sent again
+        client.get_parcel("yal-000001")
+        self.assertEqual(self.simulator.requests, 2)
+        client.close()
+
+    def test_scoped_by_account(self):
+        coalescer = RequestCoalescer(window=10)
+        first = YalidineClient("first", "token", url=self.simulator.url, coalescer=coalescer)
+        second = YalidineClient("second", "token", url=self.simulator.url, coalescer=coalescer)
+        first.get_parcel("yal-000001")
+        second.get_parcel("yal-000001")
+        first.get_parcel("yal-000001")
+        self.assertEqual(self.simulator.requests, 2)
+
+    def test_window(self):
+        client = YalidineClient("id", "token", url=self.simulator.url, coalescer=RequestCoalescer(window=10))
+        client.get_parcels(ParcelFilter(page=1, page_size=2))
+        client.get_parcels(ParcelFilter(page=1, page_size=2))
+        client.get_parcels(ParcelFilter(page=2, page_size=2))
+        self.assertEqual(self.simulator.requests, 2)
+
+        # the errors are not kept
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                client.get_parcels(ParcelFilter(page_size=5000))
+        self.assertEqual(self.simulator.requests, 4)
+        client.close()
+
+    @unittest.skipIf(httpx is None, "httpx is not installed")
+    def test_async(self):
+        async def run():
+            coalescer = AsyncRequestCoalescer()
+            async with AsyncYalidineClient("id", "token", url=self.simulator.url, coalescer=coalescer) as client:
+                results = await asyncio.gather(*(client.get_parcel_history("yal-000001") for _ in range(10)))
+            return coalescer.stats(), results
+
+        stats, results = asyncio.run(run())
+        self.assertEqual(self.simulator.requests, 1)
+        self.assertEqual(stats["coalesced"], 9)
+        self.assertEqual(len({id(r) for r in results}), 10)
@@ -0,0 +1,19 @@
+import json
+import unittest
+from dataclasses import asdict
+
+from src.yalidine.codec import available_codecs, get_codec
+from src.yalidine.entity import Parcel
+
+
+class TestCodecs(unittest.TestCase):
+    def test_encode_entities(self):
+        parcels = [Parcel(order_id="1", to_commune_name="Aïn Bessem", price=3000)]
+        for name in available_codecs():
+            codec = get_codec(name)
+            self.assertEqual(json.loads(codec.dumps(parcels)), [asdict(p) for p in parcels])
+            self.assertEqual(codec.loads(b'{"data": [1, "\\u00e9"]}'), {"data": [1, "é"]})
+
+    def test_default_codec(self):
+        self.assertIn(get_codec().name, available_codecs())
+        self.assertEqual(get_codec("json").name, "json")
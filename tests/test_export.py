@@ -0,0 +1,42 @@
+import csv
+import os
+import tempfile
+import unittest
+
+from src.yalidine.export import export_records, HISTORY_SCHEMA, pyarrow
+
+
+EVENTS = [
+    {"tracking": f"yal-{i}", "status": "Centre", "date_status": "2024-01-01 10:00:00", "wilaya_id": "16"}
+    for i in range(25)
+]
+
+
+class TestExport(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dir = tempfile.mkdtemp()
+
+    def test_csv(self):
+        path = os.path.join(self.dir, "histories.csv")
+        self.assertEqual(export_records(iter(EVENTS), path, HISTORY_SCHEMA, batch_size=10), 25)
+
+        with open(path, encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 25)
+        self.assertEqual(rows[0]["tracking"], "yal-0")
+        self.assertEqual(list(rows[0]), list(HISTORY_SCHEMA))
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_parquet(self):
+        import pyarrow.parquet
+
+        path = os.path.join(self.dir, "histories.parquet")
+        export_records(iter(EVENTS), path, HISTORY_SCHEMA, batch_size=10)
+
+        table = pyarrow.parquet.read_table(path)
+        self.assertEqual(table.num_rows, 25)
+        self.assertEqual(table.column("wilaya_id")[0].as_py(), 16)
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            export_records(iter(EVENTS), os.path.join(self.dir, "histories.xml"), HISTORY_SCHEMA)
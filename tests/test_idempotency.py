@@ -0,0 +1,94 @@
+import unittest
+
+import requests
+
+from src.yalidine.entity import Parcel
+from src.yalidine.idempotency import IdempotentCreator, Ledger, PENDING
+
+
+class ThrottledClient:
+    """Answers a 429 to the first `throttled` calls of `create_parcel`."""
+
+    def __init__(self, throttled=1):
+        self.throttled = throttled
+        self.create_calls = 0
+
+    def create_parcel(self, parcel_list):
+        self.create_calls += 1
+        if self.create_calls <= self.throttled:
+            response = requests.Response()
+            response.status_code = 429
+            raise requests.exceptions.HTTPError("429", response=response)
+        return {p.order_id: {"success": True, "tracking": f"yal-{p.order_id}"} for p in parcel_list}
+
+
+class FlakyClient:
+    """Creates the parcels but loses the first response."""
+
+    def __init__(self):
+        self.created = {}
+        self.create_calls = 0
+        self.lookups = 0
+
+    def create_parcel(self, parcel_list):
+        self.create_calls += 1
+        for p in parcel_list:
+            self.created[p.order_id] = {"order_id": p.order_id, "tracking": f"yal-{p.order_id}", "label": "url"}
+        if self.create_calls == 1:
+            raise requests.exceptions.ReadTimeout("lost response")
+        return {p.order_id: dict(self.created[p.order_id], success=True) for p in parcel_list}
+
+    def iter_parcels(self, filter, prefetch=True):
+        self.lookups += 1
+        ids = filter.order_id.split(",")
+        return iter([self.created[i] for i in ids if i in self.created])
+
+
+class TestIdempotentCreator(unittest.TestCase):
+    def test_lost_response_is_not_duplicated(self):
+        client = FlakyClient()
+        creator = IdempotentCreator(client, Ledger(":memory:"))
+
+        results = creator.create([Parcel(order_id="1"), Parcel(order_id="2")])
+
+        self.assertEqual(client.create_calls, 1)
+        self.assertEqual(client.lookups, 1)
+        self.assertEqual(results["1"].tracking, "yal-1")
+        self.assertTrue(all(r.success for r in results.values()))
+
+        # already in the ledger, nothing is sent
+        results = creator.create([Parcel(order_id="1")])
+        self.assertEqual(client.create_calls, 1)
+        self.assertEqual((results["1"].tracking, results["1"].label), ("yal-1", "url"))
+
+    def test_duplicated_order_ids(self):
+        client = FlakyClient()
+        creator = IdempotentCreator(client, Ledger(":memory:"))
+        for parcels in ([Parcel(order_id="1"), Parcel(order_id="1")], [Parcel()]):
+            with self.assertRaises(ValueError):
+                creator.create(parcels)
+        self.assertEqual(client.create_calls, 0)
+
+    def test_unknown_outcome_stays_pending(self):
+        ledger = Ledger(":memory:")
+        creator = IdempotentCreator(FlakyClient(), ledger)
+        creator.create([Parcel(order_id="1")], retries=0)
+        self.assertEqual(ledger.get(["1"])["1"][0], PENDING)
+
+    def test_throttled_orders_are_sent_again(self):
+        client = ThrottledClient()
+        ledger = Ledger(":memory:")
+        results = IdempotentCreator(client, ledger, backoff=0).create([Parcel(order_id="1"), Parcel(order_id="2")])
+
+        self.assertEqual(client.create_calls, 2)
+        self.assertTrue(all(r.success for r in results.values()))
+        self.assertEqual(ledger.get(["1", "2"])["1"], ("created", "yal-1", None))
+
+    def test_not_processed_is_not_failed(self):
+        client = ThrottledClient(throttled=10)
+        ledger = Ledger(":memory:")
+        results = IdempotentCreator(client, ledger, backoff=0).create([Parcel(order_id="1")], retries=0)
+
+        self.assertTrue(results["1"].retryable)
+        self.assertFalse(results["1"].rejected)
+        self.assertEqual(ledger.get(["1"]), {})
@@ -0,0 +1,111 @@
+import csv
+import os
+import tempfile
+import unittest
+
+from src.yalidine.bulk import BulkResult
+from src.yalidine.entity import Parcel
+from src.yalidine.importer import import_orders, row_to_parcel
+from src.yalidine.validation import validate_parcel
+
+
+def valid_parcel(**kwargs):
+    values = dict(
+        order_id="1",
+        from_wilaya_name="Bouira",
+        firstname="firstname",
+        familyname="familyname",
+        contact_phone="0555885588",
+        address="address",
+        to_commune_name="Aïn Bessem",
+        to_wilaya_name="Bouira",
+        product_list="product",
+        price=3000,
+    )
+    values.update(kwargs)
+    return Parcel(**values)
+
+
+class FakeClient:
+    def __init__(self, outcomes=None):
+        self.batches = []
+        self.outcomes = outcomes or {}
+
+    def create_parcels_bulk(self, parcels, max_workers=4):
+        self.batches.append(len(parcels))
+        return {
+            p.order_id: self.outcomes.get(p.order_id) or BulkResult(p.order_id, True, tracking=f"yal-{p.order_id}")
+            for p in parcels
+        }
+
+
+class TestValidation(unittest.TestCase):
+    def test_valid(self):
+        self.assertEqual(validate_parcel(valid_parcel()), [])
+
+    def test_constraints(self):
+        errors = validate_parcel(
+            valid_parcel(price=150001, weight=-1, is_stopdesk=True, has_exchange=True)
+        )
+        self.assertEqual(len(errors), 4)
+
+    def test_row_to_parcel(self):
+        parcel, errors = row_to_parcel({"Commande": "A1", "price": "1500", "is_stopdesk": "oui"}, {"Commande": "order_id"})
+        self.assertEqual((parcel.order_id, parcel.price, parcel.is_stopdesk), ("A1", 1500, True))
+
+        parcel, errors = row_to_parcel({"price": "abc"})
+        self.assertIsNone(parcel)
+        self.assertEqual(len(errors), 1)
+
+
+class TestImportOrders(unittest.TestCase):
+    def write_orders(self, count=25):
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, "orders.csv")
+        rejects = os.path.join(directory, "rejects.csv")
+
+        base = {k: v for k, v in valid_parcel().__dict__.items() if v is not None}
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, list(base))
+            writer.writeheader()
+            for i in range(count):
+                writer.writerow(dict(base, order_id=str(i), price=-1 if i == 3 else 100))
+        return path, rejects
+
+    def test_import_csv(self):
+        path, rejects = self.write_orders()
+        client = FakeClient()
+        report = import_orders(client, path, rejects_path=rejects, batch_size=10)
+
+        self.assertEqual((report.total, report.rejected, report.created), (25, 1, 24))
+        self.assertEqual(client.batches, [9, 10, 5])
+        with open(rejects, encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(rows[0]["line"], "5")
+
+    def test_process_pool(self):
+        path, _ = self.write_orders()
+        report = import_orders(FakeClient(), path, batch_size=4, processes=2)
+        self.assertEqual((report.total, report.rejected, report.created), (25, 1, 24))
+
+    def test_dry_run(self):
+        path, _ = self.write_orders()
+        client = FakeClient()
+        report = import_orders(client, path, dry_run=True)
+        self.assertEqual((report.total, report.rejected, report.created), (25, 1, 0))
+        self.assertEqual(client.batches, [])
+
+    def test_failed_and_unknown(self):
+        path, rejects = self.write_orders()
+        client = FakeClient({
+            "1": BulkResult("1", False, error="invalid phone", rejected=True),
+            "2": BulkResult("2", False, error="429", retryable=True),
+            "4": BulkResult("4", False, error="read timeout"),
+        })
+        report = import_orders(client, path, rejects_path=rejects)
+
+        self.assertEqual((report.created, report.failed, report.unknown), (21, 2, 1))
+        with open(rejects, encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        # the local rejects, then the api ones, never the unknown outcome
+        self.assertEqual([row["order_id"] for row in rows], ["3", "1", "2"])
@@ -0,0 +1,38 @@
+import unittest
+
+from src.yalidine.index import LocationIndex, normalize
+
+
+WILAYAS = [{"id": 10, "name": "Bouira"}, {"id": 16, "name": "Alger"}, {"id": 44, "name": "Aïn Defla"}]
+COMMUNES = [
+    {"id": 1001, "name": "Bouira", "wilaya_id": 10, "has_stop_desk": 1, "is_deliverable": 1},
+    {"id": 1002, "name": "Aïn Bessem", "wilaya_id": 10, "has_stop_desk": 0, "is_deliverable": 1},
+    {"id": 1601, "name": "Alger Centre", "wilaya_id": 16, "has_stop_desk": 1, "is_deliverable": 1},
+    {"id": 4401, "name": "Aïn Defla", "wilaya_id": 44, "has_stop_desk": 1, "is_deliverable": 1},
+]
+CENTERS = [{"center_id": 100101, "name": "Agence Bouira", "commune_id": 1001, "wilaya_id": 10}]
+
+
+class TestLocationIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.index = LocationIndex(WILAYAS, COMMUNES, CENTERS)
+
+    def test_normalize(self):
+        self.assertEqual(normalize(" Aïn-Bessem "), "ain bessem")
+
+    def test_wilaya(self):
+        self.assertEqual(self.index.wilaya("ain defla")["id"], 44)
+        self.assertEqual(self.index.wilaya("10")["name"], "Bouira")
+
+    def test_commune(self):
+        self.assertEqual(self.index.commune("AIN BESSEM")["id"], 1002)
+        self.assertEqual(self.index.commune("ain bessem", wilaya="Bouira")["id"], 1002)
+        self.assertIsNone(self.index.commune("ain bessem", wilaya=16))
+
+    def test_complete_and_suggest(self):
+        self.assertEqual([c["id"] for c in self.index.complete("ain")], [1002, 4401])
+        self.assertEqual(self.index.suggest("ain besem")[0]["id"], 1002)
+
+    def test_stopdesks(self):
+        self.assertEqual(self.index.stopdesks("Bouira")[0]["center_id"], 100101)
+        self.assertEqual(len(self.index.stopdesks_of_wilaya(10)), 1)
@@ -0,0 +1,86 @@
+import asyncio
+import unittest
+
+import requests
+
+from src.yalidine.aio import AsyncYalidineClient, httpx
+from src.yalidine.api import YalidineClient
+from src.yalidine.entity import Parcel
+from src.yalidine.instrumentation import Histogram, Hooks, Metrics, endpoint_of
+from src.yalidine.simulator import Simulator
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self) -> None:
+        # frozen clock, the quota windows must not reset during the test
+        self.simulator = Simulator(parcels=10, quotas={"second": 1000, "minute": 1000}, clock=lambda: 30.0).start()
+
+    def tearDown(self) -> None:
+        self.simulator.stop()
+
+    def test_endpoint_of(self):
+        self.assertEqual(endpoint_of("parcels/?page=2"), "parcels")
+        self.assertEqual(endpoint_of("parcels/yal-000001"), "parcels/{id}")
+        self.assertEqual(endpoint_of(""), "/")
+
+    def test_histogram(self):
+        histogram = Histogram((1, 10))
+        for value in (0.5, 2, 3, 20):
+            histogram.observe(value)
+        self.assertEqual(histogram.counts, [1, 2, 1])
+        self.assertEqual(histogram.quantile(0.5), 10)
+        self.assertEqual(histogram.quantile(1), float("inf"))
+
+    def test_metrics_and_hooks(self):
+        metrics = Metrics(clock=lambda: 30.0)
+        events = []
+        hooks = Hooks(before=lambda e: events.append(("before", e.endpoint)), after=lambda e: events.append(("after", e.status)))
+        client = YalidineClient("id", "token", url=self.simulator.url, instruments=[metrics, hooks])
+
+        client.get_parcels()
+        client.get_parcel("yal-000001")
+        with self.assertRaises(requests.exceptions.HTTPError):
+            client.update_parcel("missing", Parcel(price=1))
+        client.close()
+
+        self.assertEqual(events[:2], [("before", "parcels"), ("after", 200)])
+        snapshot = metrics.snapshot()
+        self.assertEqual(
+            sorted(snapshot["endpoints"]), ["GET parcels", "GET parcels/{id}", "PATCH parcels/{id}"]
+        )
+        self.assertEqual(snapshot["endpoints"]["GET parcels"]["latency"]["count"], 1)
+        self.assertGreater(snapshot["endpoints"]["GET parcels"]["size"]["sum"], 0)
+        self.assertEqual(snapshot["endpoints"]["PATCH parcels/{id}"]["errors"], {404: 1})
+        self.assertEqual(snapshot["quota"], {"second": 997, "minute": 997})
+
+    def test_network_error(self):
+        metrics = Metrics()
+        client = YalidineClient("id", "token", url="http://127.0.0.1:9/v1/", timeout=1, instruments=[metrics])
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            client.get_wilayas()
+        self.assertEqual(metrics.snapshot()["endpoints"]["GET wilayas"]["errors"], {"network": 1})
+
+    @unittest.skipIf(httpx is None, "httpx is not installed")
+    def test_async(self):
+        metrics = Metrics()
+
+        async def run():
+            async with AsyncYalidineClient("id", "token", url=self.simulator.url, instruments=[metrics]) as client:
+                await asyncio.gather(*(client.get_wilaya(i) for i in range(1, 6)))
+
+        asyncio.run(run())
+        self.assertEqual(metrics.snapshot()["endpoints"]["GET wilayas/{id}"]["latency"]["count"], 5)
+
+    @unittest.skipIf(httpx is None, "httpx is not installed")
+    def test_cancelled_request(self):
+        events = []
+        hooks = Hooks(before=lambda e: events.append("before"), after=lambda e: events.append(type(e.error)))
+        self.simulator.latency = 1
+
+        async def run():
+            async with AsyncYalidineClient("id", "token", url=self.simulator.url, instruments=[hooks]) as client:
+                with self.assertRaises(asyncio.TimeoutError):
+                    await asyncio.wait_for(client.get_wilayas(), 0.05)
+
+        asyncio.run(run())
+        self.assertEqual(events, ["before", asyncio.CancelledError])
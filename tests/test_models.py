@@ -0,0 +1,28 @@
+import unittest
+
+from src.yalidine.models import ParcelRecord, HistoryEvent
+from src.yalidine.pagination import iter_records
+from src.yalidine.entity import HistoryFilter
+
+
+class TestModels(unittest.TestCase):
+    def test_from_dict(self):
+        record = ParcelRecord.from_dict({"tracking": "yal-1", "last_status": "Centre", "unknown": 1})
+        self.assertEqual(record.tracking, "yal-1")
+        self.assertIsNone(record.price)
+        self.assertEqual(record.extra, {"unknown": 1})
+        self.assertFalse(hasattr(record, "__dict__"))
+        self.assertEqual(record.to_dict()["unknown"], 1)
+
+    def test_interned(self):
+        a = HistoryEvent.from_dict({"status": "".join(["Sorti ", "en livraison"])})
+        b = HistoryEvent.from_dict({"status": "".join(["Sorti en ", "livraison"])})
+        self.assertIs(a.status, b.status)
+
+    def test_typed_iterator(self):
+        def fetch(filter):
+            return {"has_more": False, "data": [{"tracking": "yal-1", "status": "Livré"}]}
+
+        events = list(iter_records(fetch, HistoryFilter(), model=HistoryEvent))
+        self.assertIsInstance(events[0], HistoryEvent)
+        self.assertEqual(events[0].status, "Livré")
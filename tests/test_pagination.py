@@ -0,0 +1,86 @@
+import asyncio
+import unittest
+
+from src.yalidine.entity import ParcelFilter
+from src.yalidine.pagination import (
+    iter_records,
+    aiter_records,
+    scan_records,
+    ascan_records,
+)
+
+
+def make_pages(total, page_size):
+    records = list(range(total))
+
+    def page(filter):
+        start = (filter.page - 1) * filter.page_size
+        return {
+            "has_more": start + filter.page_size < total,
+            "total_data": total,
+            "data": records[start : start + filter.page_size],
+        }
+
+    return page
+
+
+class TestPagination(unittest.TestCase):
+    def test_iter_records(self):
+        fetch = make_pages(25, 10)
+        for prefetch in (True, False):
+            result = list(iter_records(fetch, ParcelFilter(page_size=10), prefetch))
+            self.assertEqual(result, list(range(25)))
+
+    def test_iter_records_start_page(self):
+        fetch = make_pages(25, 10)
+        result = list(iter_records(fetch, ParcelFilter(page=2, page_size=10)))
+        self.assertEqual(result, list(range(10, 25)))
+
+    def test_aiter_records(self):
+        fetch = make_pages(25, 10)
+
+        async def afetch(filter):
+            return fetch(filter)
+
+        async def collect():
+            return [r async for r in aiter_records(afetch, ParcelFilter(page_size=10))]
+
+        self.assertEqual(asyncio.run(collect()), list(range(25)))
+
+    def test_scan_records(self):
+        fetch = make_pages(95, 10)
+        result = list(scan_records(fetch, ParcelFilter(page_size=10), max_workers=3))
+        self.assertEqual(result, list(range(95)))
+
+        result = list(scan_records(fetch, ParcelFilter(page_size=10), ordered=False))
+        self.assertEqual(sorted(result), list(range(95)))
+
+    def test_ascan_records(self):
+        fetch = make_pages(95, 10)
+
+        async def afetch(filter):
+            return fetch(filter)
+
+        async def collect():
+            return [r async for r in ascan_records(afetch, ParcelFilter(page_size=10))]
+
+        self.assertEqual(asyncio.run(collect()), list(range(95)))
+
+    def test_ascan_max_workers(self):
+        fetch = make_pages(95, 10)
+        in_flight = []
+
+        async def afetch(filter):
+            in_flight.append(filter.page)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(filter.page)
+            return fetch(filter)
+
+        async def collect(ordered):
+            return [r async for r in ascan_records(afetch, ParcelFilter(page_size=10), max_workers=3, ordered=ordered)]
+
+        for ordered in (True, False):
+            peak = []
+            self.assertEqual(sorted(asyncio.run(collect(ordered))), list(range(95)))
+            self.assertEqual(max(peak), 3)
@@ -0,0 +1,115 @@
+import threading
+import unittest
+
+from src.yalidine.bulk import ChunkedResult
+from src.yalidine.poller import TrackingPoller
+from tests.helpers import FakeClock
+
+
+class FakeClient:
+    def __init__(self):
+        self.statuses = {}
+        self.failing = set()
+        self.error = None
+        self.calls = []
+
+    def get_histories_by_tracking(self, trackings, filter=None):
+        self.calls.append(list(trackings))
+        if self.error is not None:
+            raise self.error
+        result = ChunkedResult(
+            (t, [{"tracking": t, "status": self.statuses[t], "date_status": "2024-01-01 10:00:00"}])
+            for t in trackings
+            if t in self.statuses and t not in self.failing
+        )
+        result.fail({t: RuntimeError("chunk failed") for t in trackings if t in self.failing})
+        return result
+
+
+class TestTrackingPoller(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.client = FakeClient()
+        self.changes = []
+        self.poller = TrackingPoller(
+            self.client,
+            on_change=lambda tracking, event, previous: self.changes.append((tracking, event["status"])),
+            intervals={"Sorti en livraison": 10},
+            default_interval=100,
+            clock=self.clock,
+        )
+
+    def test_schedule_by_status(self):
+        self.client.statuses = {"yal-1": "Sorti en livraison", "yal-2": "Centre", "yal-3": "Livré"}
+        for tracking in self.client.statuses:
+            self.poller.add(tracking)
+
+        self.assertEqual(self.poller.poll_once(), 3)
+        self.assertEqual(self.client.calls, [["yal-1", "yal-2", "yal-3"]])
+        self.assertEqual(len(self.changes), 3)
+        # delivered parcels are not watched anymore
+        self.assertEqual(len(self.poller), 2)
+
+        self.clock.now = 10
+        self.poller.poll_once()
+        self.assertEqual(self.client.calls[-1], ["yal-1"])
+
+        self.clock.now = 100
+        self.client.statuses["yal-1"] = "Livré"
+        self.poller.poll_once()
+        self.assertEqual(sorted(self.client.calls[-1]), ["yal-1", "yal-2"])
+        self.assertEqual(self.changes[-1], ("yal-1", "Livré"))
+        self.assertEqual(len(self.poller), 1)
+
+    def test_remove(self):
+        self.poller.add("yal-1")
+        self.poller.remove("yal-1")
+        self.assertEqual(self.poller.poll_once(), 0)
+        self.assertIsNone(self.poller.next_due())
+
+    def test_failed_chunk(self):
+        self.client.statuses = {"yal-1": "Sorti en livraison", "yal-2": "Sorti en livraison"}
+        self.client.failing = {"yal-2"}
+        for tracking in self.client.statuses:
+            self.poller.add(tracking)
+
+        with self.assertLogs("src.yalidine.poller", "WARNING"):
+            self.assertEqual(self.poller.poll_once(), 1)
+        self.assertEqual(self.changes, [("yal-1", "Sorti en livraison")])
+        # still watched, with its previous status
+        self.assertEqual(len(self.poller), 2)
+        self.assertIsNone(self.poller.statuses["yal-2"])
+        self.assertEqual(self.poller.next_due(), 10)
+
+    def test_failed_batch_backoff(self):
+        self.poller = TrackingPoller(self.client, intervals={"Pas encore expédié": 6 * 3600}, retry_delay=30, clock=self.clock)
+        self.poller.add("yal-1", "Pas encore expédié")
+        self.client.statuses = {"yal-1": "Pas encore expédié"}
+        self.client.error = RuntimeError("down")
+
+        # retried after the short delay, doubled, not the status interval
+        for now, due in ((0, 30), (30, 90), (90, 210)):
+            self.clock.now = now
+            with self.assertRaises(RuntimeError):
+                self.poller.poll_once()
+            self.assertEqual(self.poller.next_due(), due)
+
+        self.client.error = None
+        self.clock.now = 210
+        self.assertEqual(self.poller.poll_once(), 1)
+        self.assertEqual(self.poller.next_due(), 210 + 6 * 3600)
+
+    def test_run_logs_errors(self):
+        self.client.error = RuntimeError("down")
+        self.poller.add("yal-1")
+        stop = threading.Event()
+        fetch = self.client.get_histories_by_tracking
+
+        def fetch_once(*args):
+            stop.set()
+            return fetch(*args)
+
+        self.client.get_histories_by_tracking = fetch_once
+        with self.assertLogs("src.yalidine.poller", "ERROR") as logs:
+            self.poller.run(stop)
+        self.assertIn("down", logs.output[0])
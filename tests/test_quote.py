@@ -0,0 +1,42 @@
+import unittest
+
+from src.yalidine.entity import Parcel
+from src.yalidine.index import LocationIndex
+from src.yalidine.quote import FeeQuoter, QuoteRules
+
+
+FEES = [
+    {"wilaya_id": 10, "wilaya_name": "Bouira", "home_fee": 600, "desk_fee": 400},
+    {"wilaya_id": 16, "wilaya_name": "Alger", "home_fee": 500, "desk_fee": 350},
+    {"wilaya_id": 16, "from_wilaya_id": 16, "wilaya_name": "Alger", "home_fee": 400, "desk_fee": 250},
+]
+
+
+class TestFeeQuoter(unittest.TestCase):
+    def setUp(self) -> None:
+        index = LocationIndex(communes=[{"id": 1002, "name": "Aïn Bessem", "wilaya_id": 10}])
+        self.quoter = FeeQuoter(FEES, QuoteRules(insurance_rate=0.01), index=index)
+
+    def test_home_and_desk(self):
+        self.assertEqual(self.quoter.quote("Bouira").total, 600)
+        self.assertEqual(self.quoter.quote(10, is_stopdesk=True).total, 400)
+
+    def test_origin(self):
+        self.assertEqual(self.quoter.quote("Alger", from_wilaya="Alger").total, 400)
+        self.assertEqual(self.quoter.quote("Alger", from_wilaya="Bouira").total, 500)
+
+    def test_weight_and_insurance(self):
+        quote = self.quoter.quote(
+            to_commune="ain bessem", weight=2, length=50, width=40, height=30,
+            do_insurance=True, declared_value=10000,
+        )
+        # volumetric weight 12kg -> 7kg above the free weight
+        self.assertEqual(quote.overweight_fee, 350)
+        self.assertEqual(quote.insurance_fee, 100)
+        self.assertEqual(quote.total, 600 + 350 + 100)
+
+    def test_quote_many(self):
+        parcels = [Parcel(to_wilaya_name="Bouira"), Parcel(to_wilaya_name="Oran")]
+        quotes = self.quoter.quote_many(parcels)
+        self.assertEqual(quotes[0].total, 600)
+        self.assertIsNone(quotes[1])
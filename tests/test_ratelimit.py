@@ -0,0 +1,29 @@
+import unittest
+
+from src.yalidine.ratelimit import QuotaScheduler
+from tests.helpers import FakeClock
+
+
+class TestQuotaScheduler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.scheduler = QuotaScheduler({"second": 5, "minute": 50}, clock=self.clock)
+
+    def test_burst_then_pace(self):
+        delays = [self.scheduler.reserve() for _ in range(6)]
+        self.assertEqual(delays[:5], [0.0] * 5)
+        self.assertAlmostEqual(delays[5], 0.2)
+
+    def test_refill(self):
+        for _ in range(5):
+            self.scheduler.reserve()
+        self.clock.now = 1.0
+        self.assertEqual(self.scheduler.reserve(), 0.0)
+
+    def test_update_from_headers(self):
+        self.scheduler.update({"x-minute-quota-left": "0"})
+        self.assertAlmostEqual(self.scheduler.reserve(), 60 / 50)
+
+        metrics = self.scheduler.metrics()
+        self.assertEqual(metrics["minute"]["remaining"], 0)
+        self.assertIsNone(metrics["second"]["remaining"])
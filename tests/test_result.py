@@ -0,0 +1,71 @@
+import asyncio
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from src.yalidine.aio import AsyncYalidineClient, httpx
+from src.yalidine.api import YalidineClient
+from src.yalidine.cache import TTLCache
+from src.yalidine.entity import ParcelFilter
+from src.yalidine.ratelimit import QuotaState
+from src.yalidine.simulator import Simulator
+
+
+class TestQuotaState(unittest.TestCase):
+    def test_lowest_in_window(self):
+        now = [120.0]
+        state = QuotaState(clock=lambda: now[0])
+        state.update({"x-second-quota-left": "3", "x-minute-quota-left": "40"})
+        state.update({"x-second-quota-left": "4", "x-minute-quota-left": "39"})
+        self.assertEqual(state.remaining(), {"second": 3, "minute": 39})
+
+        now[0] = 121.5
+        self.assertEqual(state.remaining(), {"minute": 39})
+        state.update({"x-second-quota-left": "4"})
+        self.assertEqual(state.remaining(), {"second": 4, "minute": 39})
+
+
+class TestResults(unittest.TestCase):
+    def setUp(self) -> None:
+        # frozen clocks, the quota windows must not reset during the test
+        self.simulator = Simulator(parcels=50, quotas={"second": 10000, "minute": 10000}, clock=lambda: 30.0).start()
+
+    def tearDown(self) -> None:
+        self.simulator.stop()
+
+    def test_threads(self):
+        client = YalidineClient("id", "token", url=self.simulator.url)
+        client.quota = QuotaState(clock=lambda: 30.0)
+
+        def work(size):
+            result = client.call(client.get_parcels, ParcelFilter(page_size=size))
+            # the result and the thread's last result are the ones of this call
+            return len(result.data["data"]), len(client.last_result.data["data"]), result.quota["second"]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(work, range(1, 41)))
+        client.close()
+
+        self.assertEqual([(a, b) for a, b, _ in results], [(size, size) for size in range(1, 41)])
+        self.assertEqual(len({quota for _, _, quota in results}), 40)
+        self.assertEqual(client.quota.remaining()["minute"], 10000 - 40)
+        self.assertIsNone(client.last_result)
+
+    def test_cached(self):
+        client = YalidineClient("id", "token", url=self.simulator.url, cache=TTLCache())
+        first = client.call(client.get_wilayas)
+        second = client.call(client.get_wilayas)
+        self.assertEqual((first.cached, first.status), (False, 200))
+        self.assertEqual((second.cached, second.status), (True, None))
+        self.assertIs(second.data, first.data)
+
+    @unittest.skipIf(httpx is None, "httpx is not installed")
+    def test_async_tasks(self):
+        async def run():
+            async with AsyncYalidineClient("id", "token", url=self.simulator.url) as client:
+                async def work(size):
+                    result = await client.call(client.get_parcels, ParcelFilter(page_size=size))
+                    return len(result.data["data"]), len(client.last_result.data["data"])
+
+                return await asyncio.gather(*(work(size) for size in range(1, 21)))
+
+        self.assertEqual(asyncio.run(run()), [(size, size) for size in range(1, 21)])
@@ -0,0 +1,129 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+
+import requests
+from requests.adapters import BaseAdapter
+
+from src.yalidine.aio import AsyncYalidineClient, httpx
+from src.yalidine.api import YalidineClient
+from src.yalidine.entity import ParcelFilter
+from src.yalidine.retry import RetryPolicy, CircuitBreaker, CircuitOpenError
+from src.yalidine.simulator import Simulator
+from tests.helpers import FakeClock
+
+
+def response(status, headers=None):
+    return SimpleNamespace(status_code=status, headers=headers or {})
+
+
+class BrokenAdapter(BaseAdapter):
+    def send(self, request, **kwargs):
+        raise requests.exceptions.ChunkedEncodingError("connection broken")
+
+    def close(self):
+        pass
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_retry_after(self):
+        policy = RetryPolicy(max_retries=2, backoff_factor=1, jitter=False)
+        self.assertEqual(policy.retry_after("GET", 0, response(503)), 1)
+        self.assertEqual(policy.retry_after("GET", 1), 2)
+        self.assertIsNone(policy.retry_after("GET", 2, response(503)))
+        self.assertIsNone(policy.retry_after("GET", 0, response(404)))
+        self.assertEqual(policy.retries, 2)
+
+    def test_headers(self):
+        policy = RetryPolicy(jitter=False)
+        self.assertEqual(policy.retry_after("GET", 0, response(429, {"retry-after": "7"})), 7)
+        self.assertEqual(policy.retry_after("GET", 0, response(429, {"x-second-quota-left": "0"})), 1)
+
+    def test_post_opt_in(self):
+        self.assertIsNone(RetryPolicy().retry_after("POST", 0, response(503)))
+        self.assertIsNotNone(RetryPolicy(retry_post=True).retry_after("POST", 0, response(503)))
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_open_half_open_close(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+
+        breaker.record(500)
+        breaker.record(None)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+
+        clock.now = 10
+        breaker.before_request()  # probe
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+
+        breaker.record(200)
+        breaker.before_request()
+        self.assertEqual(breaker.metrics(), {"state": "closed", "failures": 0, "rejected": 2})
+
+    def test_stale_probe(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record(None)
+
+        clock.now = 10
+        breaker.before_request()  # probe, never recorded
+        clock.now = 15
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+        clock.now = 20
+        breaker.before_request()  # new probe
+
+    def open_to_half_open(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record(None)
+        clock.now = 10
+        return breaker
+
+    def test_probe_failing_with_another_error(self):
+        breaker = self.open_to_half_open()
+        client = YalidineClient("id", "token", url="http://127.0.0.1:9/v1/", adapter=BrokenAdapter(), circuit_breaker=breaker)
+        with self.assertRaises(requests.exceptions.ChunkedEncodingError):
+            client.get_wilayas()
+        self.assertEqual(breaker.state, "open")
+
+    @unittest.skipIf(httpx is None, "httpx is not installed")
+    def test_cancelled_probe(self):
+        breaker = self.open_to_half_open()
+
+        async def run(url):
+            async with AsyncYalidineClient("id", "token", url=url, circuit_breaker=breaker) as client:
+                with self.assertRaises(asyncio.TimeoutError):
+                    await asyncio.wait_for(client.get_wilayas(), 0.05)
+
+        with Simulator(quotas=None, latency=1) as simulator:
+            asyncio.run(run(simulator.url))
+        # not a failure, but the probe slot is free again
+        self.assertEqual(breaker.metrics(), {"state": "half-open", "failures": 1, "rejected": 0})
+        breaker.before_request()
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+
+    @unittest.skipIf(httpx is None, "httpx is not installed")
+    def test_abandoned_scan(self):
+        breaker = CircuitBreaker(failure_threshold=2)
+
+        async def consume(records, count):
+            async for _ in records:
+                count -= 1
+                if not count:
+                    break
+            # cancels the pages still in flight
+            await records.aclose()
+
+        async def run(url):
+            async with AsyncYalidineClient("id", "token", url=url, circuit_breaker=breaker) as client:
+                await consume(client.scan_parcels(ParcelFilter(page_size=5), max_workers=4), 15)
+                await consume(client.iter_parcels(ParcelFilter(page_size=5)), 8)
+
+        with Simulator(parcels=100, quotas=None, latency=0.05) as simulator:
+            asyncio.run(run(simulator.url))
+        self.assertEqual(breaker.metrics(), {"state": "closed", "failures": 0, "rejected": 0})
@@ -0,0 +1,77 @@
+import unittest
+
+import requests
+
+from src.yalidine.api import YalidineClient
+from src.yalidine.bulk import bulk_create_parcels
+from src.yalidine.entity import Parcel, ParcelFilter, CommunesFilter
+from src.yalidine.simulator import Simulator
+
+
+def parcel(order_id, **kwargs):
+    values = dict(
+        order_id=order_id,
+        from_wilaya_name="Alger",
+        firstname="firstname",
+        familyname="familyname",
+        contact_phone="0555885588",
+        address="address",
+        to_commune_name="Bouira 2",
+        to_wilaya_name="Bouira",
+        product_list="product",
+        price=3000,
+    )
+    values.update(kwargs)
+    return Parcel(**values)
+
+
+class TestSimulator(unittest.TestCase):
+    def setUp(self) -> None:
+        self.simulator = Simulator(parcels=250, quotas=None).start()
+        self.client = YalidineClient("id", "token", url=self.simulator.url)
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.simulator.stop()
+
+    def test_pagination(self):
+        page = self.client.get_parcels(ParcelFilter(page=3, page_size=100))
+        self.assertEqual((page["total_data"], page["has_more"], len(page["data"])), (250, False, 50))
+        self.assertEqual(len(list(self.client.iter_parcels())), 250)
+        self.assertEqual(len(list(self.client.scan_histories())), len(self.simulator.histories))
+
+    def test_filters(self):
+        communes = self.client.get_communes(CommunesFilter(wilaya_id=10))["data"]
+        self.assertEqual(len(communes), 10)
+        self.assertEqual(self.client.get_wilaya(10)["data"][0]["name"], "Bouira")
+
+        tracking = next(iter(self.simulator.parcels))
+        self.assertEqual(self.client.get_parcel(tracking)["data"][0]["tracking"], tracking)
+
+    def test_create_and_delete(self):
+        response = self.client.create_parcel([parcel("1"), parcel("2", to_commune_name="Alger Centre")])
+        self.assertTrue(response["1"]["success"])
+        self.assertFalse(response["2"]["success"])
+
+        tracking = response["1"]["tracking"]
+        self.assertEqual(self.client.delete_parcel(tracking), [{"tracking": tracking, "deleted": True}])
+
+    def test_strict_422(self):
+        self.simulator.strict = True
+        results = bulk_create_parcels(self.client, [parcel("1"), parcel("2", price=-1), parcel("3")])
+        self.assertEqual({k: r.success for k, r in results.items()}, {"1": True, "2": False, "3": True})
+        self.assertTrue(results["2"].rejected)
+
+    def test_quota_and_errors(self):
+        self.simulator.quotas = {"second": 1000, "minute": 1}
+        self.client.get_wilayas()
+        self.assertEqual(self.client.last_response_headers["x-minute-quota-left"], "0")
+        with self.assertRaises(requests.exceptions.HTTPError) as e:
+            self.client.get_wilayas()
+        self.assertEqual(e.exception.response.status_code, 429)
+
+        self.simulator.quotas = None
+        self.simulator.error_rate = 1
+        with self.assertRaises(requests.exceptions.HTTPError) as e:
+            self.client.get_wilayas()
+        self.assertEqual(e.exception.response.status_code, 503)
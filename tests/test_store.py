@@ -0,0 +1,47 @@
+import os
+import tempfile
+import unittest
+
+from src.yalidine.store import ReferenceStore
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls = 0
+
+    def iter_wilayas(self):
+        self.calls += 1
+        return iter([{"id": 10, "name": "Bouira"}, {"id": 16, "name": "Alger"}])
+
+    def iter_communes(self):
+        return iter([
+            {"id": 1001, "name": "Bouira", "wilaya_id": 10},
+            {"id": 1002, "name": "Aïn Bessem", "wilaya_id": 10},
+            {"id": 1601, "name": "Alger Centre", "wilaya_id": 16},
+        ])
+
+    def iter_centers(self):
+        return iter([{"center_id": 100101, "name": "Agence Bouira", "commune_id": 1001, "wilaya_id": 10}])
+
+    def iter_delivery_fees(self):
+        return iter([{"wilaya_id": 10, "wilaya_name": "Bouira", "home_fee": 600, "desk_fee": 400}])
+
+
+class TestReferenceStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.path = os.path.join(tempfile.mkdtemp(), "reference.sqlite3")
+        self.client = FakeClient()
+
+    def test_load_and_warm_start(self):
+        with ReferenceStore(self.path, self.client) as store:
+            self.assertEqual(len(store.refresh()), 4)
+            self.assertEqual(store.refresh(), [])
+
+        with ReferenceStore(self.path) as store:
+            self.assertEqual(store.wilaya(10)["name"], "Bouira")
+            self.assertEqual(store.wilaya_by_name("alger")["id"], 16)
+            self.assertEqual(len(store.communes(wilaya_id=10)), 2)
+            self.assertEqual(store.center(100101)["commune_id"], 1001)
+            self.assertEqual(store.delivery_fee("10")["home_fee"], 600)
+
+        self.assertEqual(self.client.calls, 1)
@@ -0,0 +1,45 @@
+import os
+import tempfile
+import unittest
+
+from src.yalidine.sync import HistorySync
+
+
+class FakeClient:
+    def __init__(self, events):
+        self.events = events
+        self.filters = []
+
+    def iter_histories(self, filter):
+        self.filters.append(filter)
+        since = filter.date_status.split(",")[0] if filter.date_status else ""
+        return iter(sorted(
+            (e for e in self.events if e["date_status"][:10] >= since),
+            key=lambda e: e["date_status"],
+        ))
+
+
+def event(tracking, date_status, status):
+    return {"tracking": tracking, "date_status": date_status, "status": status}
+
+
+class TestHistorySync(unittest.TestCase):
+    def test_only_new_events(self):
+        path = os.path.join(tempfile.mkdtemp(), "checkpoint.json")
+        client = FakeClient([
+            event("yal-1", "2024-01-01 10:00:00", "Expédié"),
+            event("yal-2", "2024-01-02 09:00:00", "Centre"),
+        ])
+
+        self.assertEqual(HistorySync(client, path).run(lambda e: None), 2)
+
+        client.events += [
+            event("yal-3", "2024-01-02 09:00:00", "Centre"),
+            event("yal-1", "2024-01-03 08:00:00", "Livré"),
+        ]
+        received = []
+        HistorySync(client, path).run(received.append)
+
+        self.assertEqual([e["tracking"] for e in received], ["yal-3", "yal-1"])
+        self.assertTrue(client.filters[-1].date_status.startswith("2024-01-02,"))
+        self.assertEqual(client.filters[-1].order_by, "date_status")
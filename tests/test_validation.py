@@ -0,0 +1,87 @@
+import unittest
+
+from src.yalidine.entity import Parcel
+from src.yalidine.index import LocationIndex
+from src.yalidine.validation import AddressValidator
+
+
+WILAYAS = [{"id": 10, "name": "Bouira"}, {"id": 16, "name": "Alger"}, {"id": 44, "name": "Aïn Defla", "is_deliverable": 0}]
+COMMUNES = [
+    {"id": 1001, "name": "Bouira", "wilaya_id": 10, "has_stop_desk": 1, "is_deliverable": 1},
+    {"id": 1002, "name": "Aïn Bessem", "wilaya_id": 10, "has_stop_desk": 0, "is_deliverable": 1},
+    {"id": 1003, "name": "Haizer", "wilaya_id": 10, "has_stop_desk": 0, "is_deliverable": 0},
+    {"id": 1601, "name": "Alger Centre", "wilaya_id": 16, "has_stop_desk": 1, "is_deliverable": 1},
+    {"id": 4401, "name": "Aïn Defla", "wilaya_id": 44, "has_stop_desk": 1, "is_deliverable": 1},
+]
+CENTERS = [
+    {"center_id": 100101, "name": "Agence Bouira", "commune_id": 1001, "wilaya_id": 10},
+    {"center_id": 160101, "name": "Agence Alger", "commune_id": 1601, "wilaya_id": 16},
+]
+
+
+def parcel(**kwargs):
+    values = dict(from_wilaya_name="Bouira", to_wilaya_name="Bouira", to_commune_name="Aïn Bessem")
+    values.update(kwargs)
+    return Parcel(**values)
+
+
+def codes(errors):
+    return [error.code for error in errors]
+
+
+class TestAddressValidator(unittest.TestCase):
+    def setUp(self) -> None:
+        self.validator = AddressValidator(LocationIndex(WILAYAS, COMMUNES, CENTERS))
+
+    def test_valid_and_canonical_names(self):
+        checked, errors = self.validator.check(parcel(from_wilaya_name="bouira", to_commune_name="AIN-BESSEM"))
+        self.assertEqual(errors, [])
+        self.assertEqual((checked.from_wilaya_name, checked.to_commune_name), ("Bouira", "Aïn Bessem"))
+
+        same = parcel()
+        self.assertIs(self.validator.check(same)[0], same)
+
+    def test_autocorrect(self):
+        checked, errors = self.validator.check(parcel(to_wilaya_name="Bouria", to_commune_name="ain besem"))
+        self.assertEqual(errors, [])
+        self.assertEqual((checked.to_wilaya_name, checked.to_commune_name), ("Bouira", "Aïn Bessem"))
+
+        validator = AddressValidator(self.validator.index, autocorrect=False)
+        _, errors = validator.check(parcel(to_commune_name="ain besem"))
+        self.assertEqual(codes(errors), ["unknown_commune"])
+        self.assertEqual(errors[0].suggestions, ["Aïn Bessem"])
+
+    def test_commune_not_in_wilaya(self):
+        _, errors = self.validator.check(parcel(to_commune_name="Alger Centre"))
+        self.assertEqual(codes(errors), ["commune_not_in_wilaya"])
+
+    def test_not_deliverable(self):
+        self.assertEqual(codes(self.validator.check(parcel(to_commune_name="Haizer"))[1]), ["not_deliverable"])
+        _, errors = self.validator.check(parcel(to_wilaya_name="Aïn Defla", to_commune_name="Aïn Defla"))
+        self.assertEqual(codes(errors), ["not_deliverable"])
+
+    def test_stopdesk(self):
+        self.assertEqual(self.validator.check(parcel(is_stopdesk=True, stopdesk_id=100101))[1], [])
+        self.assertEqual(codes(self.validator.check(parcel(is_stopdesk=True))[1]), ["no_stop_desk"])
+        self.assertEqual(codes(self.validator.check(parcel(is_stopdesk=True, stopdesk_id=1))[1]), ["unknown_stopdesk"])
+        _, errors = self.validator.check(parcel(is_stopdesk=True, stopdesk_id=160101))
+        self.assertEqual(codes(errors), ["stopdesk_not_in_wilaya"])
+        self.assertEqual(errors[0].suggestions, ["Agence Bouira"])
+
+    def test_check_many(self):
+        valid, rejected = self.validator.check_many([parcel(), parcel(to_wilaya_name="Oran")])
+        self.assertEqual(len(valid), 1)
+        self.assertEqual(codes(rejected[0][1]), ["unknown_wilaya"])
+
+    def test_memo(self):
+        validator = AddressValidator(self.validator.index, autocorrect=False, memo_size=2)
+        for name in ("a", "b", "c", "d"):
+            validator.check(parcel(to_commune_name=name))
+        self.assertEqual(len(validator._resolved), 2)
+
+        # every parcel gets its own errors
+        _, errors = validator.check(parcel(to_commune_name="ain besem"))
+        errors[0].suggestions.clear()
+        errors.clear()
+        _, errors = validator.check(parcel(to_commune_name="ain besem"))
+        self.assertEqual(errors[0].suggestions, ["Aïn Bessem"])